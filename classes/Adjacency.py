@@ -0,0 +1,181 @@
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, Sequence
+
+try:  # Only to pack big edge lists faster, everything works without it
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Adjacency:
+    """
+    *** Adjacency Class ***
+
+    Compressed sparse row (CSR) storage of the connections of an undirected graph. Nodes are referred to by their
+    index in the graph's node list, all the neighbors of all the nodes are packed into one flat integer array.
+
+    Built once after a graph is loaded or generated, the analysis methods then walk these arrays instead of
+    the Python lists of Node objects, which are a lot bigger and slower to search through.
+
+    Attributes:
+        - offsets (array[int]): targets[offsets[i]:offsets[i + 1]] are the neighbors of node i, length is n + 1.
+        - targets (array[int]): neighbor indices of every node, sorted within each node's slice.
+
+    Methods:
+        - from_neighbor_lists: packs lists of neighbor indices into a new Adjacency.
+        - from_edges: packs the two ends of every edge into a new Adjacency.
+        - hypercube: connections of Qn, straight from the bits of the node indices.
+        - neighbors: indices of all the neighbors of a node.
+        - degree: number of neighbors of a node.
+        - has_edge: checks if two nodes are connected, binary search through the sorted neighbors.
+        - edge_slot: position of a connection in the targets array.
+        - permuted: same connections with the nodes in a different order.
+        - copy: same connections in arrays of its own, to change without touching the original.
+        - remove_edge: takes a connection out in place.
+    """
+
+    def __init__(self, offsets: array, targets: array):
+        self.offsets: array = offsets
+        self.targets: array = targets
+
+    @classmethod
+    def from_neighbor_lists(cls, neighbor_lists: Sequence[Iterable[int]]):
+        """
+        Packs neighbor indices of each node into the CSR arrays, duplicates and self loops are dropped.
+
+        Parameters:
+            - neighbor_lists (Sequence of Iterables of ints): neighbor_lists[i] holds the neighbors of node i.
+
+        Returns:
+            - Adjacency
+        """
+        offsets = array("l", [0])
+        targets = array("i")
+        for i, neighbors in enumerate(neighbor_lists):
+            row = sorted(set(neighbors))
+            if i in row:
+                row.remove(i)
+            targets.extend(row)
+            offsets.append(len(targets))
+        return cls(offsets, targets)
+
+    @classmethod
+    def from_edges(cls, n: int, first: Sequence[int], second: Sequence[int]):
+        """
+        Packs undirected edges into the CSR arrays, duplicates and self loops are dropped. With NumPy around
+        the sorting happens in a couple of vectorized passes, otherwise it goes through neighbor lists.
+
+        Parameters:
+            - n (int): number of nodes.
+            - first, second (Sequences of ints): edge k connects first[k] and second[k], either way around.
+
+        Returns:
+            - Adjacency
+        """
+        if numpy is None:
+            neighbor_lists = [[] for _ in range(n)]
+            for i, j in zip(first, second):
+                neighbor_lists[i].append(j)
+                neighbor_lists[j].append(i)
+            return cls.from_neighbor_lists(neighbor_lists)
+
+        first, second = numpy.asarray(first, dtype=numpy.int64), numpy.asarray(second, dtype=numpy.int64)
+        sources = numpy.concatenate((first, second))
+        ends = numpy.concatenate((second, first))
+        keys = numpy.sort(sources[sources != ends] * n + ends[sources != ends])  # By row, then target
+        keys = keys[numpy.concatenate((keys[:1] == keys[:1], keys[1:] != keys[:-1]))]  # Without the duplicates
+        rows, targets = numpy.divmod(keys, n)
+        offsets = numpy.zeros(n + 1, dtype=numpy.int64)
+        numpy.cumsum(numpy.bincount(rows, minlength=n), out=offsets[1:])
+        return cls(array("l", offsets.tolist()), array("i", targets.astype(numpy.int32).tobytes()))
+
+    @classmethod
+    def hypercube(cls, n: int):
+        """
+        Qn, node i connected to i XOR 2^b for every bit b, n neighbors each so row i starts at n * i. O(n * 2^n).
+        In order the neighbors are those with a bit of i cleared, highest bit first, then those with one set,
+        lowest bit first.
+
+        Parameters:
+            - n (int): dimension, 2^n nodes.
+
+        Returns:
+            - Adjacency
+        """
+        offsets = array("l", range(0, n * 2 ** n + 1, n) if n else [0, 0])
+        if numpy is not None:
+            rows = numpy.arange(2 ** n, dtype=numpy.int32)[:, None] ^ (1 << numpy.arange(n, dtype=numpy.int32))
+            return cls(offsets, array("i", numpy.sort(rows, axis=1).tobytes()))
+
+        targets = array("i")
+        bits = [1 << b for b in range(n)]
+        for i in range(2 ** n):
+            targets.extend([i ^ bit for bit in reversed(bits) if i & bit])
+            targets.extend([i ^ bit for bit in bits if not i & bit])
+        return cls(offsets, targets)
+
+    @property
+    def node_count(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets) // 2
+
+    def neighbors(self, i: int) -> array:
+        return self.targets[self.offsets[i]:self.offsets[i + 1]]
+
+    def degree(self, i: int) -> int:
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def has_edge(self, i: int, j: int) -> bool:
+        start, end = self.offsets[i], self.offsets[i + 1]
+        position = bisect_left(self.targets, j, start, end)
+        return position < end and self.targets[position] == j
+
+    def edge_slot(self, i: int, j: int) -> int:
+        """
+        Position of j in the neighbors of i within the targets array, so per edge values can be kept in a flat
+        array next to it. Returns -1 if there is no such edge.
+        """
+        start, end = self.offsets[i], self.offsets[i + 1]
+        position = bisect_left(self.targets, j, start, end)
+        if position < end and self.targets[position] == j:
+            return position
+        return -1
+
+    def permuted(self, order: List[int]):
+        """
+        Returns the same connections, with node order[i] becoming node i.
+        """
+        new_index = [0] * len(order)
+        for new, old in enumerate(order):
+            new_index[old] = new
+        return Adjacency.from_neighbor_lists([[new_index[j] for j in self.neighbors(old)] for old in order])
+
+    def copy(self):
+        return Adjacency(array("l", self.offsets), array("i", self.targets))
+
+    def remove_edge(self, i: int, j: int):
+        """
+        Takes the connection out of both rows, the rows stay sorted. Every slot after it moves down, so slots
+        (and anything kept next to them) from before are stale afterwards. O(n + m) but in C, apart from the
+        offsets of the rows in between.
+        """
+        i, j = min(i, j), max(i, j)
+        if not self.has_edge(i, j):
+            raise ValueError(f"No edge between {i} and {j}")
+        del self.targets[self.edge_slot(j, i)]  # The later one first, so the earlier slot doesn't move
+        del self.targets[self.edge_slot(i, j)]
+        offsets = self.offsets
+        for row in range(i + 1, j + 1):
+            offsets[row] -= 1
+        for row in range(j + 1, len(offsets)):
+            offsets[row] -= 2
+
+    def __len__(self):
+        return self.node_count
+
+    def __repr__(self):
+        return f"Adjacency: {self.node_count} nodes; {self.edge_count} edges"
@@ -0,0 +1,77 @@
+from array import array
+from collections import deque
+from typing import List, Optional
+
+from classes.Adjacency import Adjacency
+
+
+class BipartiteColoring:
+    """
+    *** Bipartite Coloring Class ***
+
+    Two colors every component with a breadth first search, neighbors always get the other side. The search
+    reaches the nodes layer by layer, so two neighbors with the same side are always on the same layer. Walking
+    up the search tree from both of them to where their branches meet gives the shortest odd cycle through that
+    edge. Everything is O(n + m).
+
+    The coloring keeps going after the first conflict, so every node still gets a side.
+
+    Attributes:
+        - adjacency (Adjacency): connections of the graph.
+        - side (array[int]): 0 or 1 for every node, -1 before it is colored.
+        - parent (array[int]): node the search reached each node from, -1 for the start of a component.
+        - depth (array[int]): layer of the search each node is on.
+        - odd_cycle (List[int]): node indices of the first odd cycle found, first node repeated at the end,
+                                 None if the graph is bipartite.
+
+    Methods:
+        - color: colors all the components.
+    """
+
+    def __init__(self, adjacency: Adjacency):
+        n = adjacency.node_count
+        self.adjacency: Adjacency = adjacency
+        self.side: array = array("b", [-1]) * n
+        self.parent: array = array("i", [-1]) * n
+        self.depth: array = array("i", [0]) * n
+        self.odd_cycle: Optional[List[int]] = None
+
+    def color(self, components: List[List[int]]) -> bool:
+        """
+        Parameters:
+            - components (List[List[int]]): node indices of every connected component.
+
+        Returns:
+            - bool: True if the graph is bipartite.
+        """
+        for component in components:
+            self._color_component(component[0])
+        return self.odd_cycle is None
+
+    def _color_component(self, start: int):
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+        side, parent, depth = self.side, self.parent, self.depth
+
+        side[start] = 0
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            for slot in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[slot]
+                if side[neighbor] == -1:
+                    side[neighbor] = 1 - side[current]
+                    parent[neighbor] = current
+                    depth[neighbor] = depth[current] + 1
+                    queue.append(neighbor)
+                elif side[neighbor] == side[current] and self.odd_cycle is None:
+                    self.odd_cycle = self._cycle_through(current, neighbor)
+
+    def _cycle_through(self, a: int, b: int) -> List[int]:
+        # Climb from both ends of the edge until the branches meet, a and b are on the same layer
+        up_from_a, up_from_b = [a], [b]
+        while a != b:
+            a, b = self.parent[a], self.parent[b]
+            up_from_a.append(a)
+            up_from_b.append(b)
+        # meeting point ... a, b ... meeting point
+        return up_from_a[::-1] + up_from_b
@@ -0,0 +1,98 @@
+from typing import List, Optional, Tuple
+
+from classes.Adjacency import Adjacency
+from classes.BreadthFirstSearch import BreadthFirstSearch
+
+
+class Brandes:
+    """
+    *** Brandes Class ***
+
+    Node and edge betweeness by Brandes' dependency accumulation. After a breadth first search from a source, the
+    reached nodes are walked back from the furthest one and every node passes its dependency on to its shortest
+    path predecessors. That gives the share of the shortest paths from the source that go through each node and
+    edge in O(m), without ever putting a path together. Doing it for every source is O(n * m) time and the sums
+    take O(n + m) memory.
+
+    Only pairs of nodes that are not neighbors count, same as before: a path between neighbors has nothing in
+    between and going along the single edge says nothing about how important that edge is.
+
+    Attributes:
+        - adjacency (Adjacency): connections of the graph.
+        - node_dependency (List[float]): summed dependency of every node on all the sources accumulated so far.
+        - edge_dependency (List[float]): summed dependency of every edge, indexed by the edge's adjacency slot
+                                         from the smaller to the bigger node index.
+        - bridge_count (List[int]): number of shortest paths that go through each node.
+        - pairs (int): number of ordered pairs of nodes that are connected but not neighbors.
+        - total_paths (int): number of shortest paths between those pairs.
+
+    Methods:
+        - accumulate: adds the dependencies of the source of a search that was just run.
+        - get_sums, add_sums: to add up the sums of Brandes run over different sources, in different processes.
+    """
+
+    def __init__(self, adjacency: Adjacency, edges: bool = True):
+        """
+        Parameters:
+            - adjacency (Adjacency): connections of the graph.
+            - edges (bool): keep edge sums too. Without them edge_dependency is None and accumulate can't be used,
+                            for sums that are filled in from a formula.
+        """
+        n = adjacency.node_count
+        self.adjacency: Adjacency = adjacency
+        self.node_dependency: List[float] = [0.0] * n
+        self.edge_dependency: Optional[List[float]] = [0.0] * (2 * adjacency.edge_count) if edges else None
+        self.bridge_count: List[int] = [0] * n
+        self.pairs: int = 0
+        self.total_paths: int = 0
+
+        self._delta: List[float] = [0.0] * n
+        self._paths_below: List[int] = [0] * n
+
+    def accumulate(self, bfs: BreadthFirstSearch):
+        """
+        Parameters:
+            - bfs (BreadthFirstSearch): a search that was just run from the source we are accumulating.
+        """
+        distance, sigma, predecessors = bfs.distance, bfs.sigma, bfs.predecessors
+        delta, paths_below = self._delta, self._paths_below
+        edge_slot = self.adjacency.edge_slot
+
+        for w in bfs.order:
+            delta[w] = 0.0
+            paths_below[w] = 0
+
+        for w in reversed(bfs.order):
+            far = distance[w] >= 2  # Only the pairs that are not neighbors count
+            if far:
+                self.pairs += 1
+                self.total_paths += sigma[w]
+
+            for v in predecessors[w]:
+                share = sigma[v] / sigma[w]
+                delta[v] += share * (1 + delta[w])
+                paths_below[v] += 1 + paths_below[w]
+
+                slot = edge_slot(v, w) if v < w else edge_slot(w, v)
+                self.edge_dependency[slot] += share * (far + delta[w])
+
+            if w != bfs.source:
+                self.node_dependency[w] += delta[w]
+                self.bridge_count[w] += sigma[w] * paths_below[w]
+
+    def get_sums(self) -> Tuple[List[float], List[float], List[int], int, int]:
+        # The sums without the adjacency, small enough to send back from another process
+        return self.node_dependency, self.edge_dependency, self.bridge_count, self.pairs, self.total_paths
+
+    def add_sums(self, sums: Tuple[List[float], List[float], List[int], int, int]):
+        """
+        Adds up the sums of another Brandes over the same graph, as returned by its get_sums.
+        """
+        node_dependency, edge_dependency, bridge_count, pairs, total_paths = sums
+        for i, dependency in enumerate(node_dependency):
+            self.node_dependency[i] += dependency
+            self.bridge_count[i] += bridge_count[i]
+        for slot, dependency in enumerate(edge_dependency):
+            self.edge_dependency[slot] += dependency
+        self.pairs += pairs
+        self.total_paths += total_paths
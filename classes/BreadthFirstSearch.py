@@ -0,0 +1,92 @@
+from collections import deque
+from typing import List, Optional
+
+from classes.Adjacency import Adjacency
+
+
+class BreadthFirstSearch:
+    """
+    *** Breadth First Search Class ***
+
+    Single source breadth first search over the Adjacency arrays. One search from a source node records the
+    distance, the number of shortest paths and the shortest path predecessors of every node it can reach.
+
+    The buffers are allocated once per graph and reused between searches. Instead of resetting every node before
+    each search, nodes are stamped with the id of the search that reached them, anything with an older stamp
+    simply counts as not reached.
+
+    Attributes:
+        - adjacency (Adjacency): connections of the graph we are searching.
+        - source (int): index of the node the last search started from.
+        - order (List[int]): reached nodes in the order they were reached, which is by non-decreasing distance.
+        - distance (List[int]): steps from the source, valid for reached nodes only.
+        - sigma (List[int]): number of shortest paths from the source, valid for reached nodes only.
+        - predecessors (List[List[int]]): neighbors one step closer to the source, valid for reached nodes only.
+
+    Methods:
+        - search: runs the search from a source node.
+        - reached: checks if the last search got to a node.
+        - get_distance: distance to a node or None if it was not reached.
+    """
+
+    def __init__(self, adjacency: Adjacency):
+        n = adjacency.node_count
+        self.adjacency: Adjacency = adjacency
+        self.source: Optional[int] = None
+        self.order: List[int] = []
+        self.distance: List[int] = [0] * n
+        self.sigma: List[int] = [0] * n
+        self.predecessors: List[List[int]] = [[] for _ in range(n)]
+
+        self._stamp: List[int] = [0] * n
+        self._search_id: int = 0
+
+    def search(self, source: int, max_distance: Optional[int] = None, finish: Optional[int] = None):
+        """
+        Parameters:
+            - source (int): index of the node to start from.
+            - max_distance (int) (optional): nodes further away than this are not reached.
+            - finish (int) (optional): stop as soon as this node is taken off the queue, by then all of its
+                                       shortest paths have been counted. Nodes still waiting in the queue
+                                       are reached, but not all of their paths are counted.
+        """
+        self._search_id += 1
+        search_id = self._search_id
+        stamp, distance, sigma, predecessors = self._stamp, self.distance, self.sigma, self.predecessors
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+
+        self.source = source
+        self.order = order = []
+        stamp[source] = search_id
+        distance[source] = 0
+        sigma[source] = 1
+        predecessors[source] = []
+
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            order.append(current)
+            if current == finish:
+                break
+            next_distance = distance[current] + 1
+            if max_distance is not None and next_distance > max_distance:
+                continue
+
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                if stamp[neighbor] != search_id:  # First time we see it
+                    stamp[neighbor] = search_id
+                    distance[neighbor] = next_distance
+                    sigma[neighbor] = 0
+                    predecessors[neighbor] = []
+                    queue.append(neighbor)
+
+                if distance[neighbor] == next_distance:  # Another shortest path to the neighbor
+                    sigma[neighbor] += sigma[current]
+                    predecessors[neighbor].append(current)
+
+    def reached(self, node: int) -> bool:
+        return self._stamp[node] == self._search_id
+
+    def get_distance(self, node: int) -> Optional[int]:
+        return self.distance[node] if self.reached(node) else None
@@ -0,0 +1,62 @@
+from array import array
+from typing import List, Tuple
+
+
+class Dendrogram:
+    """
+    *** Dendrogram Class ***
+
+    How a graph split apart, one cluster into two per level, without keeping the clusters of every level.
+    Level 0 has the clusters it started with, numbered 0 to roots - 1. The cluster that splits off at level k
+    gets the id roots + k - 1 and keeps it. So all it takes is the cluster of every node after the last split
+    and which cluster every new one split off from. Read backwards those are the merges that put the graph back
+    together, any level is a pass over them away.
+
+    Attributes:
+        - cluster_of (array[int]): cluster id of every node after the last split.
+        - roots (int): number of clusters at level 0.
+        - splits (List[Tuple[int, int]]): (old cluster, new cluster) of every split in order.
+        - modularity (List[float]): modularity of the clusters of every level, level 0 included.
+
+    Methods:
+        - add_split: records a split.
+        - get_clusters: cluster id of every node at a level.
+        - get_best_level: level with the highest modularity.
+    """
+
+    def __init__(self, cluster_of: List[int], modularity: float):
+        self.cluster_of: array = array("i", cluster_of)
+        self.roots: int = max(cluster_of, default=-1) + 1
+        self.splits: List[Tuple[int, int]] = []
+        self.modularity: List[float] = [modularity]
+
+    def add_split(self, old: int, nodes: List[int], modularity: float) -> int:
+        """
+        Parameters:
+            - old (int): cluster that split.
+            - nodes (List[int]): node indices of the part that split off from it.
+            - modularity (float): of the clusters after the split.
+
+        Returns:
+            - int: id of the new cluster.
+        """
+        new = self.roots + len(self.splits)
+        for i in nodes:
+            self.cluster_of[i] = new
+        self.splits.append((old, new))
+        self.modularity.append(modularity)
+        return new
+
+    def get_clusters(self, level: int) -> List[int]:
+        # Merges the splits after the level back, a new cluster always splits off from one with a smaller id
+        merged_into = list(range(self.roots + len(self.splits)))
+        for old, new in self.splits[level:]:
+            merged_into[new] = merged_into[old]
+        return [merged_into[cluster] for cluster in self.cluster_of]
+
+    def get_best_level(self) -> int:
+        return max(range(len(self.modularity)), key=lambda level: self.modularity[level])
+
+    def __len__(self):
+        # Number of levels, level 0 included
+        return len(self.modularity)
@@ -0,0 +1,71 @@
+from array import array
+from typing import List
+
+from classes.Adjacency import Adjacency
+
+
+class EulerTour:
+    """
+    *** Euler Tour Class ***
+
+    Hierholzer's algorithm over the Adjacency arrays. Walk from the start along unused edges until stuck, which
+    can only happen back at the start of the walk (or at the other odd node for a path). Then back up along
+    the walk and start side trips from any node that still has unused edges, splicing them in as we go.
+
+    Every edge is flagged as used once, for both of its directions, and every node keeps a pointer to the next
+    edge of its row worth looking at, so the whole tour is O(n + m). The stack replaces recursion, no recursion
+    limit to run into on big graphs.
+
+    Only makes sense when a tour exists: all the edges in one component and 0 or 2 nodes with odd degrees,
+    starting from one of the odd ones if there are any.
+
+    Attributes:
+        - adjacency (Adjacency): connections of the graph.
+        - edge_id (array[int]): for every adjacency slot, the slot of the same edge from the smaller to the
+                                bigger node index, so both directions share one used flag.
+
+    Methods:
+        - tour: node indices of the Euler path or circuit from a start node.
+    """
+
+    def __init__(self, adjacency: Adjacency):
+        self.adjacency: Adjacency = adjacency
+        offsets, targets = adjacency.offsets, adjacency.targets
+
+        self.edge_id: array = array("l", range(len(targets)))
+        for i in range(adjacency.node_count):
+            for slot in range(offsets[i], offsets[i + 1]):
+                if targets[slot] < i:
+                    self.edge_id[slot] = adjacency.edge_slot(targets[slot], i)
+
+    def tour(self, start: int) -> List[int]:
+        """
+        Parameters:
+            - start (int): index of the node to start from.
+
+        Returns:
+            - List[int]: node indices along the tour, one more than the number of edges. Ends where it started
+                         if it is a circuit.
+        """
+        offsets, targets, edge_id = self.adjacency.offsets, self.adjacency.targets, self.edge_id
+        used = bytearray(len(targets))
+        next_slot = array("l", offsets[:-1])
+
+        stack = [start]
+        tour = []
+        while stack:
+            current = stack[-1]
+            slot, end = next_slot[current], offsets[current + 1]
+            while slot < end and used[edge_id[slot]]:
+                slot += 1
+            next_slot[current] = slot
+
+            if slot == end:  # Stuck, the node goes to the tour and we back up
+                tour.append(stack.pop())
+            else:
+                used[edge_id[slot]] = 1
+                next_slot[current] = slot + 1
+                stack.append(targets[slot])
+
+        tour.reverse()
+        return tour
@@ -0,0 +1,160 @@
+from typing import Dict, List, Optional, Set, Tuple
+
+from classes.Adjacency import Adjacency
+from classes.Brandes import Brandes
+from classes.BreadthFirstSearch import BreadthFirstSearch
+from classes.Dendrogram import Dendrogram
+
+
+class GirvanNewman:
+    """
+    *** Girvan Newman Class ***
+
+    Snips the edge with the biggest betweeness over and over, watching the graph fall apart into communities.
+    Everything happens on one copy of the adjacency that loses an edge per snip, nothing else gets copied.
+
+    Taking an edge out only changes the shortest paths inside the component it was in, every other component
+    keeps the betweeness it had. So after a snip Brandes only runs from the nodes of that one component (or the
+    two it fell apart into), O(n_c * m_c) instead of O(n * m) for the whole graph.
+
+    When to stop:
+        - Modularity of the components (against the edges of the whole graph) goes up while the snips cut
+          communities apart and down once they cut into the communities themselves. It is worked out again
+          after every split from the sums of the component that split, O(smaller side). Once it hasn't beaten
+          its best for a few splits in a row, the best is taken to be behind us.
+        - A component whose edges (those on some path between nodes that are not neighbors) all have the same
+          betweeness has no bridge between communities to snip anymore. When no component is left that has
+          one, there is nothing to snip.
+
+    Attributes:
+        - adjacency (Adjacency): the graph's connections, minus the snipped ones.
+        - original (Adjacency): the graph's connections, modularity counts its edges.
+        - component_of (List[int]): component id of every node by its index, the dendrogram's cluster ids.
+        - members (Dict[int, List[int]]): node indices of every component by its id.
+        - edge_dependency (Dict[Tuple[int, int], float]): Brandes sum of every edge from the smaller to the
+                                                          bigger node index, edges with none are left out.
+        - uneven (Set[int]): components with edges of different betweeness.
+        - inside (Dict[int, int]): edges of the whole graph within every component, counted from both ends.
+        - degrees (Dict[int, int]): degree sum of every component in the whole graph.
+        - modularity (float): of the components as they are now.
+        - dendrogram (Dendrogram): the components after every split and their modularity.
+        - snips (List[Tuple[int, int]]): snipped edges in order.
+        - split_after (List[int]): number of snips it took to get to every split.
+
+    Methods:
+        - run: snips until there is nothing to snip or the modularity is past its best.
+        - get_term: what a component adds to the modularity.
+    """
+
+    patience = 3  # Splits without a better modularity before giving up on finding one
+    tolerance = 1e-9  # Betweeness this close (relative to the biggest) is the same, float point error aside
+
+    def __init__(self, adjacency: Adjacency, components: List[List[int]]):
+        self.adjacency: Adjacency = adjacency.copy()
+        self.original: Adjacency = adjacency
+        self.bfs: BreadthFirstSearch = BreadthFirstSearch(self.adjacency)
+        self.component_of: List[int] = [0] * adjacency.node_count
+        self.members: Dict[int, List[int]] = {}
+        self.inside: Dict[int, int] = {}
+        self.degrees: Dict[int, int] = {}
+        for component_id, component in enumerate(components):
+            self.members[component_id] = list(component)
+            for i in component:
+                self.component_of[i] = component_id
+            self.degrees[component_id] = self.inside[component_id] = sum(adjacency.degree(i) for i in component)
+
+        self.edge_dependency: Dict[Tuple[int, int], float] = {}
+        self.uneven: Set[int] = set()
+        self.modularity: float = sum(self.get_term(component_id) for component_id in self.members)
+        self.dendrogram: Dendrogram = Dendrogram(self.component_of, self.modularity)
+        self.snips: List[Tuple[int, int]] = []
+        self.split_after: List[int] = []
+
+    def run(self):
+        for component_id in self.members:
+            self._accumulate(component_id)
+
+        while self.uneven and len(self.dendrogram) - 1 - self.dendrogram.get_best_level() < self.patience:
+            a, b = self._get_edge_to_snip()
+            self.snips.append((a, b))
+            self.edge_dependency.pop((a, b))
+            self.adjacency.remove_edge(a, b)
+
+            component_id = self.component_of[a]
+            split_off = self._split(component_id, a, b)
+            self._accumulate(component_id)
+            if split_off is not None:
+                self._accumulate(split_off)
+
+    def get_term(self, component_id: int) -> float:
+        # What a component adds to the modularity
+        two_m = len(self.original.targets)
+        return self.inside[component_id] / two_m - (self.degrees[component_id] / two_m) ** 2 if two_m else 0.0
+
+    def _split(self, component_id: int, a: int, b: int) -> Optional[int]:
+        # If the snip cut the component in two, the side of a keeps the id. Returns the id of the other side
+        self.bfs.search(a, finish=b)
+        if self.bfs.reached(b):
+            return None
+
+        side_of_a = set(self.bfs.order)
+        sides = ([i for i in self.members[component_id] if i in side_of_a],
+                 [i for i in self.members[component_id] if i not in side_of_a])
+
+        # Sums of the smaller side from its rows in the whole graph, the other side gets what is left
+        smaller = 0 if len(sides[0]) <= len(sides[1]) else 1
+        in_smaller = set(sides[smaller])
+        degrees = inside = between = 0
+        for i in sides[smaller]:
+            degrees += self.original.degree(i)
+            for j in self.original.neighbors(i):
+                if j in in_smaller:
+                    inside += 1
+                elif self.component_of[j] == component_id:
+                    between += 1  # Snipped on the way here, from one side to the other
+        sums = [(0, 0), (0, 0)]
+        sums[smaller] = (inside, degrees)
+        sums[1 - smaller] = (self.inside[component_id] - inside - 2 * between, self.degrees[component_id] - degrees)
+
+        self.modularity -= self.get_term(component_id)
+        split_off = self.dendrogram.roots + len(self.dendrogram.splits)
+        for component, nodes, (inside, degrees) in zip((component_id, split_off), sides, sums):
+            self.members[component] = nodes
+            self.inside[component], self.degrees[component] = inside, degrees
+            for i in nodes:
+                self.component_of[i] = component
+            self.modularity += self.get_term(component)
+
+        self.dendrogram.add_split(component_id, sides[1], self.modularity)
+        self.split_after.append(len(self.snips))
+        return split_off
+
+    def _accumulate(self, component_id: int):
+        # Brandes from every node of the component, over the adjacency as it is now
+        brandes = Brandes(self.adjacency)
+        for source in self.members[component_id]:
+            self.bfs.search(source)
+            brandes.accumulate(self.bfs)
+
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+        smallest = biggest = None
+        for i in self.members[component_id]:
+            for slot in range(offsets[i], offsets[i + 1]):
+                j = targets[slot]
+                if i < j:
+                    dependency = brandes.edge_dependency[slot]
+                    if dependency > 0:
+                        self.edge_dependency[(i, j)] = dependency
+                        smallest = dependency if smallest is None else min(smallest, dependency)
+                        biggest = dependency if biggest is None else max(biggest, dependency)
+                    else:
+                        self.edge_dependency.pop((i, j), None)
+
+        if biggest is not None and biggest - smallest > self.tolerance * biggest:
+            self.uneven.add(component_id)
+        else:
+            self.uneven.discard(component_id)
+
+    def _get_edge_to_snip(self) -> Tuple[int, int]:
+        # Biggest betweeness, ties go to the edge that comes first by node indices
+        return min(self.edge_dependency, key=lambda edge: (-self.edge_dependency[edge], edge))
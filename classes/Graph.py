@@ -1,9 +1,28 @@
 import math
 import random
-from typing import List, Optional, Union, Tuple
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Union, Tuple
 from operator import attrgetter
 
+from classes.Adjacency import Adjacency
+from classes.BipartiteColoring import BipartiteColoring
+from classes.Brandes import Brandes
+from classes.BreadthFirstSearch import BreadthFirstSearch
+from classes.Dendrogram import Dendrogram
+from classes.EulerTour import EulerTour
+from classes.GirvanNewman import GirvanNewman
+from classes.GraphFamily import GraphFamily
+from classes.HamiltonSearch import HamiltonSearch
+from classes.LabelPropagation import LabelPropagation
+from classes.Louvain import Louvain
 from classes.Node import Node
+from classes.ParallelAnalysis import ParallelAnalysis
+from classes.SampledBetweeness import SampledBetweeness
+from classes.SampledPaths import SampledPaths
+from classes.ShortestPathDag import ShortestPathDag
+from classes.UniformEdgeBetweeness import UniformEdgeBetweeness
+from classes.UnionFind import UnionFind
+from classes.VertexOrbits import VertexOrbits
 
 
 class Graph:
@@ -15,6 +34,16 @@ class Graph:
     Attributes:
         - name (str): Each graph deserves a name.
         - nodes (List[Nodes]): Contains a list of all the nodes (of class Node) in the graph.
+        - adjacency (Adjacency): Connections packed into index arrays, built once the graph is loaded or generated.
+        - node_names (Dict[str, Node]): Node lookup by name, kept up to date with the nodes list.
+        - node_name (Callable[[int], str]): Name of a node by its index, for generated graphs whose nodes are named
+                                            by a rule. Names are then only made when asked for, the lookup the
+                                            first time a node is looked up by name.
+        - names_sorted (bool): The nodes are in order of the names node_name gives them, sorting them by name
+                               has nothing to do and doesn't need to make the names.
+        - family (GraphFamily): What kind of graph it is if it was generated as a known one, the analysis then
+                                uses formulas instead of searching.
+        - path_dags (OrderedDict[int, ShortestPathDag]): Shortest paths DAGs of the nodes last asked for.
         - am (List[List[int]]): Adjacency matrix, a square matrix where rows and columns represent nodes, and
                                 values represent if there is a connection between them: 1 for True, 0 for False.
 
@@ -24,9 +53,19 @@ class Graph:
 
     """
 
+    path_dags_kept = 64  # Enough for the UI going back and forth between a few nodes
+
     def __init__(self, name):
         self.name: str = name
-        self.nodes: List[Node] = []
+        self._nodes: List[Node] = []
+        self.node_names: Dict[str, Node] = {}
+        self.node_name: Optional[Callable[[int], str]] = None
+        self.names_sorted: bool = False
+        self.adjacency: Optional[Adjacency] = None
+        self.bfs: Optional[BreadthFirstSearch] = None
+        self.family: Optional[GraphFamily] = None
+        self.orbits: Optional[VertexOrbits] = None  # Found the first time a search for every node is needed
+        self.path_dags: OrderedDict[int, ShortestPathDag] = OrderedDict()  # Last few asked for, by node index
 
         # Analysis
         self.analyzed = False
@@ -49,8 +88,12 @@ class Graph:
         self.average_betweeness = None
         self.min_betweeness = None
         self.total_paths = None
+        # If betweeness was sampled: estimates are within epsilon with probability 1 - delta
+        self.betweeness_sampled = False
+        self.betweeness_epsilon = None
+        self.betweeness_delta = None
+        self.betweeness_samples = None
         # Edge betweeness
-        self.edge_bridges = {}
         self.edge_betweeness = {}
         self.max_edge_betweeness = 0
         self.avg_edge_betweeness = 0
@@ -66,33 +109,165 @@ class Graph:
         self.min_cluster_coefficient = None
 
         # Connectedness, partitioned, communities, subgraphs
+        self.component_of: List[int] = []  # Component id of every node by its index
+        self.components: List[List[int]] = []  # Node indices of every component
         self.connected = None
         self.connectivity = None
         self.partitions = []
 
-        self.subgraphs = []
-        self.snips = []
+        self.communities: List[List[Set[Node]]] = []  # Partitions every time Girvan-Newman made one fall apart
+        self.snips: List[List[Tuple[Node, Node]]] = []  # Edges snipped to get to each of those
+        self.community_graphs: Dict[int, Graph] = {}
+        self.modularity: List[float] = []  # Of the communities of every level
+        self.dendrogram: Optional[Dendrogram] = None  # Every split the snipping made, not only the levels kept
+
+        # Paths, summed up for every source node by its index
+        self.distance_sums: List[int] = []
+        self.reachable_counts: List[int] = []
+        self.eccentricities: List[int] = []
+        # If paths were sampled: average distances are within epsilon times the diameter with probability
+        # 1 - delta, eccentricities and the diameter are lower bounds
+        self.paths_sampled = False
+        self.paths_epsilon = None
+        self.paths_delta = None
+        self.paths_sources = None
 
-        # Paths
         self.bipartite = None
         self.diameter = None
         self.average_path_length: float = math.inf
 
         self.hamilton_circuit = None
         self.hamilton_path = None
+        self.hamilton_path_unknown = False  # Ran out of time before finding out
+        self.hamilton_circuit_unknown = False
 
-        self.euler_circuit = None
-        self.euler_path = None
+        self.euler_path_start: Optional[Node] = None  # None if there is no Euler path
+        self.euler_circuit_start: Optional[Node] = None
+        self._euler_path: Optional[List[Node]] = None
+        self._euler_circuit: Optional[List[Node]] = None
 
         self.odd_cycle = None
 
+    @property
+    def nodes(self) -> List[Node]:
+        return self._nodes
+
+    @property
+    def euler_path(self) -> Optional[List[Node]]:
+        # Only walked once someone looks at it, a tour is as long as there are edges
+        if self._euler_path is None and self.euler_path_start is not None:
+            self._euler_path = [self.nodes[i] for i in EulerTour(self.adjacency).tour(self.euler_path_start.index)]
+        return self._euler_path
+
+    @property
+    def euler_circuit(self) -> Optional[List[Node]]:
+        if self._euler_circuit is None and self.euler_circuit_start is not None:
+            self._euler_circuit = [self.nodes[i]
+                                   for i in EulerTour(self.adjacency).tour(self.euler_circuit_start.index)]
+        return self._euler_circuit
+
+    @nodes.setter
+    def nodes(self, nodes: List[Node]):
+        self._nodes = nodes
+        self.node_names = {}
+        if self.node_name is None:  # Otherwise get_node_by_name fills it in when first asked
+            self.index_node_names()
+
+    def add_node(self, node: Node):
+        self.names_sorted = False
+        self.nodes.append(node)
+        self.node_names[node.name] = node
+
+    def index_node_names(self):
+        self.node_names = {}
+        for node in self.nodes:
+            self.node_names.setdefault(node.name, node)  # First one wins, same as the old linear search
+
+    def build_adjacency(self):
+        """
+        Packs the neighbor lists of the nodes into the Adjacency arrays, the nodes get their index and from then
+        on their neighbors are read from the arrays, so the lists can be let go.
+
+        Needs to be called again after the nodes are reordered or connections change. Nothing to do if all the
+        nodes already read theirs from the arrays, e.g. when the graph was generated straight into them.
+        """
+        if (self.adjacency is not None and self.adjacency.node_count == len(self.nodes)
+                and all(node.packed and node.graph is self for node in self.nodes)):
+            return
+
+        neighbor_lists = [node.neighbors for node in self.nodes]
+        for i, node in enumerate(self.nodes):
+            node.index = i
+        self.set_adjacency(Adjacency.from_neighbor_lists(
+            [[neighbor.index for neighbor in neighbors] for neighbors in neighbor_lists]))
+
+    def set_adjacency(self, adjacency: Adjacency):
+        """
+        Takes the connections of node i from row i of the adjacency, whatever the nodes had before is let go.
+        """
+        self.adjacency = adjacency
+        self.bfs = BreadthFirstSearch(self.adjacency)
+        self.orbits = None
+        self.path_dags.clear()
+        for i, node in enumerate(self.nodes):
+            node.index = i
+            node.graph = self
+            node.neighbors = None
+
+        if self.family is not None and not self.family.fits(self):  # Not what it was generated as anymore
+            self.family = None
+        self.set_components()
+
+    def set_components(self):
+        """
+        Labels the connected components with union find, one pass over the edges. From then on two nodes can
+        reach each other only if they have the same component id, no search needed to tell.
+
+        Every graph of a family is in one piece, nothing to label there.
+        """
+        if self.family is not None:
+            self.component_of = [0] * self.adjacency.node_count
+            self.components = [list(range(self.adjacency.node_count))]
+            self.connected = True
+            self.partitions = [set(self.nodes)]
+            return
+
+        union_find = UnionFind(self.adjacency.node_count)
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+        for i in range(self.adjacency.node_count):
+            if union_find.count <= 1:  # All in one piece already, the rest of the edges can't change anything
+                break
+            for slot in range(offsets[i], offsets[i + 1]):
+                if i < targets[slot]:
+                    union_find.union(i, targets[slot])
+
+        self.component_of = union_find.labels()
+        self.components = [[] for _ in range(max(self.component_of, default=-1) + 1)]
+        for i, component in enumerate(self.component_of):
+            self.components[component].append(i)
+
+        self.connected = len(self.components) <= 1
+        self.partitions = [{self.nodes[i] for i in component} for component in self.components]
+
+    def reachable(self, start: Node, finish: Node) -> bool:
+        return self.component_of[start.index] == self.component_of[finish.index]
+
+    def get_edge_components(self) -> List[List[int]]:
+        # Components with at least one edge, lonely nodes left out
+        return [component for component in self.components if len(component) > 1]
+
+    def get_neighbor_nodes(self, index: int) -> List[Node]:
+        return [self.nodes[j] for j in self.adjacency.neighbors(index)]
+
     def set_adjacency_matrix(self):
         # make an adjacency_matrix
         self.am = []  # Reset matrix
 
         n = len(self.nodes)
         for i in range(n):
-            row = [int(self.nodes[j] in self.nodes[i].neighbors) for j in range(n)]  # I'm practicing list comprehension
+            row = [0] * n
+            for j in self.adjacency.neighbors(i):
+                row[j] = 1
             self.am.append(row)
 
     def set_node_degrees(self):
@@ -102,7 +277,7 @@ class Graph:
         self.min_degree = math.inf
 
         for node in self.nodes:
-            node.degree = len(node.neighbors)
+            node.degree = self.adjacency.degree(node.index)
             self.total_degree += node.degree
             if node.degree > self.max_degree:
                 self.max_degree = node.degree
@@ -123,142 +298,201 @@ class Graph:
             self.density = None
 
     def set_diameter_avg_path_length(self):
-        self.diameter = 0
-        self.connected = True
-        self.partitions = []
-        path_lengths = []
+        # Connected and partitions come from the components, labelled when the adjacency was built
+        self.diameter = max(self.eccentricities, default=0)
 
-        for node in self.nodes:
-            if len(self.partitions) == 0 or not any(node in part for part in self.partitions):
-                partition = {node}
-                self.partitions.append(partition)
-            else:
-                partition = [part for part in self.partitions if node in part][0]
-
-            for i in range(len(node.neighbors)):
-                partition.add(node.neighbors[i])
-                if self.diameter < 1:
-                    self.diameter = 1
-                path_lengths.append(1)
-
-            for finish in node.paths:
-                if node.paths[finish] is not None:
-                    partition = partition.union(set(path for path in node.paths[finish]))
-                    path_lengths.append(len(list(node.paths[finish])[0]) - 1)
-
-                    if self.diameter < len(list(node.paths[finish])[0]) - 1:
-                        self.diameter = len(list(node.paths[finish])[0]) - 1
-                else:
-                    self.connected = False
-
-        if len(path_lengths) > 0:
-            self.average_path_length = sum(path_lengths) / len(path_lengths)
-
-        # merge partitions
-        result = []
-        for partition in self.partitions:
-            merged = False
-            for i, merged_set in enumerate(result):
-                if merged_set.intersection(partition):
-                    result[i] = merged_set.union(partition)
-                    merged = True
-                    break
-            if not merged:
-                result.append(partition)
-        self.partitions = result
-
-    def get_path_from_final_node(self, node: Node):
-        if node is None:
-            return None
-        path = [node]
-        while node.parent:
-            node = node.parent
-            path.append(node)
-        path.reverse()
-        return path
-
-    def calculate_shortest_paths_for_all_nodes(self):
-        for i, start_node in enumerate(self.nodes):
-            for j in range(i + 1, len(self.nodes)):  # paths are reversible, so we only need to search forwards
-                finish_node = self.nodes[j]
-                if finish_node in start_node.neighbors or finish_node in start_node.paths:
-                    # Adjacent nodes or paths already found need no pathfinding
-                    continue
+        number_of_paths = sum(len(component) * (len(component) - 1) for component in self.components)
+        if number_of_paths > 0:
+            self.average_path_length = sum(self.distance_sums) / number_of_paths
 
-                final = self.dijsktra(start=start_node, finish=finish_node)  # returns our finish node or None
-                path = self.get_path_from_final_node(node=final)
+    def get_shortest_paths(self, node: Node) -> ShortestPathDag:
+        """
+        Shortest paths DAG of the node, searched for when it is needed. A DAG is O(n + m), one for every node
+        would be O(n * (n + m)), so only the last few asked for are kept.
+        """
+        dag = self.path_dags.get(node.index)
+        if dag is None:
+            self.bfs.search(node.index)
+            dag = ShortestPathDag.from_search(self.bfs)
+            self.path_dags[node.index] = dag
+            if len(self.path_dags) > self.path_dags_kept:
+                self.path_dags.popitem(last=False)
+        else:
+            self.path_dags.move_to_end(node.index)
+        return dag
 
-                if path is None:
-                    start_node.paths[finish_node] = None
-                    finish_node.paths[start_node] = None
-                    continue
+    def iter_paths(self, start: Node, finish: Node) -> Iterator[Tuple[Node, ...]]:
+        # All the shortest paths between two nodes, one by one, as tuples of Nodes
+        if not self.reachable(start, finish):
+            return
+        for path in self.get_shortest_paths(start).iter_paths(finish.index):
+            yield tuple(self.nodes[i] for i in path)
 
-                all_paths = self.depth_first_search(
-                    current=start_node,
-                    path=[start_node],
-                    search_type="a",
-                    max_depth=len(path),
-                    finish=final,
-                    paths={tuple(path)}
-                )
-                all_paths_reversed = {tuple(reversed(p)) for p in all_paths}
+    def calculate_shortest_paths_for_all_nodes(self, workers: int = 1):
+        """
+        One breadth first search per node finds the shortest paths to every other node at once, so all pairs
+        take n searches of O(n + m) each instead of a search for every pair. Only the distance summaries of the
+        nodes are kept, the DAG of a node's shortest paths is searched for again when asked, see get_shortest_paths.
 
-                start_node.paths[finish_node] = all_paths
-                finish_node.paths[start_node] = all_paths_reversed
+        Known graph families skip the searches, the summaries come from a formula. Graphs with lots of nodes
+        that look the same only search from one node per orbit.
 
-        # Sort them by path length
+        Parameters:
+            - workers (int): with more than one, the searches are split between that many processes.
+        """
+        self.paths_sampled = False
+        if self.family is not None:
+            self.set_path_summaries(self.family.get_path_summaries(self))
+            self.set_diameter_avg_path_length()
+            return
+
+        if workers > 1:
+            summaries = ParallelAnalysis(self.adjacency, workers).shortest_path_summaries()
+            self.set_path_summaries(summaries)
+            self.set_diameter_avg_path_length()
+            return
+
+        if self.get_orbits().pays_off():
+            self.set_path_summaries(self.orbits.get_path_summaries(self.bfs))
+            self.set_diameter_avg_path_length()
+            return
+
+        summaries = []
+        distance = self.bfs.distance
+        for start_node in self.nodes:
+            self.bfs.search(start_node.index)
+            order = self.bfs.order
+            summaries.append((start_node.index, sum(distance[i] for i in order), len(order), distance[order[-1]]))
+
+        self.set_path_summaries(summaries)
         self.set_diameter_avg_path_length()
-        for node in self.nodes:
-            node.paths = dict(
-                sorted(node.paths.items(), key=lambda x: len(list(x[1])[0]) if x[1] is not None else math.inf))
 
-    def analyze_betweeness_centrality(self):
+    def approximate_shortest_paths(self,
+                                   epsilon: float = 0.1,
+                                   delta: float = 0.1,
+                                   time_budget: Optional[float] = None,
+                                   seed: Optional[int] = None):
+        """
+        Distance sums, diameter and average path length estimated from searches out of a few random pivots,
+        for graphs where a search from every node takes too long. See SampledPaths.
+
+        Parameters:
+            - epsilon (float): wanted error bound of the average distances, as a share of the diameter.
+            - delta (float): wanted probability of an estimate being off by more than that.
+            - time_budget (float) (optional): seconds to search for at most, epsilon is loosened to match.
+            - seed (int) (optional): to pick the same pivots again.
+        """
+        sampler = SampledPaths(self.adjacency, self.components, seed=seed)
+        sampler.sample(epsilon=epsilon, delta=delta, time_budget=time_budget)
+
+        self.paths_sampled = True
+        self.paths_epsilon = sampler.epsilon
+        self.paths_delta = sampler.delta
+        self.paths_sources = sampler.sources
+        self.set_path_summaries(sampler.get_path_summaries())
+        self.set_diameter_avg_path_length()
+
+    def get_orbits(self) -> VertexOrbits:
+        if self.orbits is None:
+            self.orbits = VertexOrbits(self.adjacency)
+            self.orbits.find()
+        return self.orbits
+
+    def set_path_summaries(self, summaries: List[Tuple[int, int, int, int]]):
+        # (source, distance sum, reachable nodes, eccentricity) of every node
+        self.distance_sums = [0] * len(self.nodes)
+        self.reachable_counts = [0] * len(self.nodes)
+        self.eccentricities = [0] * len(self.nodes)
+        for source, distance_sum, reachable, eccentricity in summaries:
+            self.distance_sums[source] = distance_sum
+            self.reachable_counts[source] = reachable
+            self.eccentricities[source] = eccentricity
+
+    def analyze_betweeness_centrality(self, workers: int = 1):
         """
         Betweeness For Nodes and Edges
 
-        For all paths between nodes j and k, count the number of times they pass through node i and edge e.
-        Divide that number by all the paths.
+        For every pair of nodes j and k that are not neighbors, take the share of the shortest paths between them
+        that pass through node i or edge e, add it all up and divide by the number of pairs.
 
-        Since I save all the shortest paths from all nodes to all nodes that are not neighbors, I can
-        loop through all the paths in a node and look for all that are between start and finish.
+        Brandes does the adding up from one breadth first search per node, no paths need to be put together.
+        Known graph families get the same sums from a formula, graphs with few orbits from a search per orbit.
+
+        Parameters:
+            - workers (int): with more than one, the sources are split between that many processes.
+        """
+        edge_betweeness = None
+        if self.family is not None:
+            brandes = self.family.get_betweeness(self)
+            edge_betweeness = self.family.get_edge_betweeness(self, brandes.pairs)
+        elif workers > 1:
+            brandes = ParallelAnalysis(self.adjacency, workers).betweeness()[1]
+        elif self.get_orbits().pays_off():
+            brandes = self.orbits.get_betweeness(self.bfs)
+        else:
+            brandes = Brandes(self.adjacency)
+            for node in self.nodes:
+                self.bfs.search(node.index)
+                brandes.accumulate(self.bfs)
+        self.betweeness_sampled = False
+        self.set_betweeness(brandes, edge_betweeness)
+
+    def approximate_betweeness_centrality(self,
+                                          epsilon: float = 0.01,
+                                          delta: float = 0.1,
+                                          time_budget: Optional[float] = None,
+                                          seed: Optional[int] = None):
         """
-        self.total_paths = 0
+        Betweeness estimated from randomly sampled shortest paths, for graphs where Brandes takes too long.
 
-        for node in self.nodes:
-            for finish in node.paths:
-                if node.paths[finish] is None:
-                    continue
-                self.total_paths += len(node.paths[finish])
-                for path in node.paths[finish]:
-                    for bridge in path[1:-1]:
-                        bridge.bridge_paths.add(path)
-
-                    for i in range(len(path) - 1):
-                        edge = (path[i], path[i + 1])
-                        if edge not in self.edge_bridges and tuple(reversed(edge)) not in self.edge_bridges:
-                            self.edge_bridges[edge] = set()
-
-                        if edge in self.edge_bridges:
-                            self.edge_bridges[edge].add(path)
-                        else:
-                            self.edge_bridges[tuple(reversed(edge))].add(path)
-
-        if self.total_paths == 0:
-            self.max_betweeness = self.min_betweeness = self.average_betweeness = 0
-            return
+        Parameters:
+            - epsilon (float): wanted error bound of the estimates.
+            - delta (float): wanted probability of an estimate being off by more than epsilon.
+            - time_budget (float) (optional): seconds to sample for at most, epsilon is loosened to match.
+            - seed (int) (optional): seed for the random number generator, for repeatable results.
+        """
+        sampler = SampledBetweeness(self.adjacency, self.components, seed=seed)
+        sampler.sample(epsilon=epsilon, delta=delta, time_budget=time_budget)
+
+        self.betweeness_sampled = True
+        self.betweeness_epsilon = sampler.epsilon
+        self.betweeness_delta = sampler.delta
+        self.betweeness_samples = sampler.pairs
+        self.set_betweeness(sampler)
+
+    def set_betweeness(self, brandes: Union[Brandes, SampledBetweeness],
+                       edge_betweeness: Optional[Mapping[Tuple[Node, Node], float]] = None):
+        """
+        Normalizes the sums of a Brandes (or sampled estimates) and fills in the node and edge betweeness. Edge
+        betweeness that is already known (the same for every edge of a graph family) is taken as it is.
+        """
+        self.total_paths = brandes.total_paths
+        pairs = brandes.pairs if brandes.pairs > 0 else 1
 
         for node in self.nodes:
-            node.betweeness = len(node.bridge_paths) / self.total_paths
-
-        for edge in self.edge_bridges:
-            self.edge_betweeness[edge] = len(self.edge_bridges[edge]) / self.total_paths
-        self.edge_betweeness = {k: v for k, v in
-                                sorted(self.edge_betweeness.items(), key=lambda item: item[1], reverse=True)}
-        total_edge_between = [self.edge_betweeness[k] for k in self.edge_betweeness]
-        if len(total_edge_between) == 0:
-            self.avg_edge_betweeness = 0
+            node.betweeness = brandes.node_dependency[node.index] / pairs
+            node.bridge_count = brandes.bridge_count[node.index]
+
+        if edge_betweeness is not None:
+            self.edge_betweeness = edge_betweeness
         else:
-            self.max_betweeness = max(total_edge_between)
+            self.edge_betweeness = {}
+            offsets, targets = self.adjacency.offsets, self.adjacency.targets
+            for i in range(len(self.nodes)):
+                for slot in range(offsets[i], offsets[i + 1]):
+                    if i < targets[slot] and brandes.edge_dependency[slot] > 0:  # Edges on some path between far nodes
+                        edge = (self.nodes[i], self.nodes[targets[slot]])
+                        self.edge_betweeness[edge] = brandes.edge_dependency[slot] / pairs
+            self.edge_betweeness = {k: v for k, v in
+                                    sorted(self.edge_betweeness.items(), key=lambda item: item[1], reverse=True)}
+
+        if isinstance(self.edge_betweeness, UniformEdgeBetweeness):  # All the same, no need to go through them
+            self.max_edge_betweeness = self.avg_edge_betweeness = self.edge_betweeness.value
+        elif len(self.edge_betweeness) == 0:
+            self.max_edge_betweeness = self.avg_edge_betweeness = 0
+        else:
+            total_edge_between = list(self.edge_betweeness.values())
+            self.max_edge_betweeness = max(total_edge_between)
             self.avg_edge_betweeness = sum(total_edge_between) / len(total_edge_between)
 
         list_of_betweenessness = [node.betweeness for node in self.nodes if node.betweeness is not None]
@@ -269,25 +503,64 @@ class Graph:
         self.min_betweeness = min(list_of_betweenessness)
         self.average_betweeness = sum(list_of_betweenessness) / len(list_of_betweenessness)
 
+    def iter_bridge_paths(self, node: Node) -> Iterator[Tuple[Node, ...]]:
+        """
+        All the shortest paths between nodes that are not neighbors which pass through the node, put together
+        only when asked for. A path from s to t goes through the node if the distances s -> node -> t add up to
+        the distance from s to t.
+        """
+        through = self.get_shortest_paths(node)
+        for start in self.nodes:
+            if start == node or not self.reachable(start, node):
+                continue
+            dag = self.get_shortest_paths(start)
+            to_node = dag.distance[node.index]
+            for finish in dag.order:
+                if finish == node.index or dag.distance[finish] < 2:
+                    continue
+                if to_node + through.distance[finish] != dag.distance[finish]:
+                    continue
+                for first_half in dag.iter_paths(node.index):
+                    for second_half in through.iter_paths(finish):
+                        yield tuple(self.nodes[i] for i in first_half + second_half[1:])
+
+    def iter_edge_bridge_paths(self, edge: Tuple[Node, Node]) -> Iterator[Tuple[Node, ...]]:
+        # Same as iter_bridge_paths, but for the shortest paths that use an edge, in either direction
+        for a, b in (edge, edge[::-1]):
+            from_b = self.get_shortest_paths(b)
+            for start in self.nodes:
+                if not self.reachable(start, a):
+                    continue
+                dag = self.get_shortest_paths(start)
+                to_a = dag.distance[a.index]
+                for finish in dag.order:
+                    if dag.distance[finish] < 2 or to_a + 1 + from_b.distance[finish] != dag.distance[finish]:
+                        continue
+                    for first_half in dag.iter_paths(a.index):
+                        for second_half in from_b.iter_paths(finish):
+                            yield tuple(self.nodes[i] for i in first_half + second_half)
+
     def analyze_closessness(self):
+        # Closeness of a node is measured inside its own component, the rest of the graph is out of reach anyway
         for node in self.nodes:
-            node.set_closeness(num_nodes=len(self.nodes))
-            if node.closeness is None:
-                continue
-            if self.max_closeness is None or self.max_closeness < node.closeness:
-                self.max_closeness = node.closeness
-            if self.min_closeness is None or self.min_closeness < node.closeness:
-                self.min_closeness = node.closeness
+            component_size = len(self.components[self.component_of[node.index]])
+            node.set_closeness(num_nodes=component_size, total_distance=self.distance_sums[node.index])
 
         closer = [node.closeness for node in self.nodes if node.closeness is not None]
         if len(closer) == 0:
             self.min_closeness = self.max_closeness = self.average_closeness = 0
             return
+        self.max_closeness = max(closer)
+        self.min_closeness = min(closer)
         self.average_closeness = sum(closer) / len(closer)
 
     def analyze_cluster_coefficients(self):
         for node in self.nodes:
-            node.set_clustering_coefficient()
+            if self.family is not None:
+                if node.degree > 0:
+                    node.clustering_coefficient = self.family.get_clustering_coefficient()
+            else:
+                node.set_clustering_coefficient()
             if node.clustering_coefficient is None:
                 continue
             if self.max_cluster_coefficient is None or self.max_cluster_coefficient < node.clustering_coefficient:
@@ -303,97 +576,55 @@ class Graph:
 
     def analyze_bipartite(self):
         """
-        First we will do a breath-first-search with dijsktra, to find the first node we can't color with only
-        2 colors, then use that node to find the smallest odd cycle.
-
-        Unconnected graphs complicate this a bit...
+        A breath-first-search colors every component with 2 colors, the first two neighbors with the same color
+        give the shortest odd cycle through their edge. Lonely nodes can go on either side, they are yellow.
+        Known graph families know their sides already.
         """
+        if self.family is not None:
+            sides, self.odd_cycle = self.family.get_bipartite(self)
+        else:
+            coloring = BipartiteColoring(self.adjacency)
+            coloring.color(self.components)
+            sides = coloring.side
+            self.odd_cycle = None if coloring.odd_cycle is None else [self.nodes[i] for i in coloring.odd_cycle]
+        self.bipartite = self.odd_cycle is None
 
-        odd_colors_out = []
+        colors = ["magenta", "cyan"]
         for node in self.nodes:
-            if len(node.neighbors) == 0:
+            if self.adjacency.degree(node.index) == 0:
                 node.color = "yellow"
-                continue
-
-            odd_one = self.dijsktra(start=node, bipartite=True)
-            if odd_one is not None:
-                odd_colors_out.append(odd_one)
-
-            if self.connected and len(odd_colors_out) == 0:
-                # If the graph is connected and colored we have won
-                self.bipartite = True
-                return
-
-            if self.connected and len(odd_colors_out) > 0:
-                # it found an odd one, break but only if the graph is connected, I want to color all of them
-                break
-
-        if len(odd_colors_out) == 0:
-            self.bipartite = True
-            return
-
-        for odd in odd_colors_out:
-            self.odd_cycle = self.depth_first_search(current=odd, path=[odd], search_type="b")
-            if self.odd_cycle is not None:
-                self.bipartite = False
-                return
-
-    def hamilton_qn(self, path: List[str]):
-        # Hamilton Circuit Finder for hypercube graph, to solve it taking too long above Q5
-        good_path = ["0" + node for node in path[::]]  # Copy
-        evil_path = ["1" + node for node in path[::-1]]  # Reversed copy
-        return good_path + evil_path
-
-    def analyze_hamilton(self):
-        """
-        An exhaustive search for a Hamilton path and cycle, as reading about it, no surefire way to find it seems to
-        exist.
+            else:
+                node.color = colors[sides[node.index]]
 
-        However... hypercube graph Q6 or higher seem to cause trouble, so I will do them manually.
+    def analyze_hamilton(self, time_budget: Optional[float] = None):
         """
-        if not self.connected or len([node for node in self.nodes if node.degree == 1]) > 2:
-            self.hamilton_path = None
-            self.hamilton_circuit = None
-            return
-
-        # If Q graph
-        if self.name[0] == "q" and self.name[1:].isdigit():
-            n = int(self.name[1:])
-            h_path = [""]
-            for i in range(n):
-                h_path = self.hamilton_qn(h_path)
-
-            hp_nodes = [self.get_node_by_name(name) for name in h_path]
-            self.hamilton_path = hp_nodes
-            self.hamilton_circuit = hp_nodes[::] + [hp_nodes[0]]
-            return
+        As reading about it, no surefire way to find a Hamilton path or cycle exists, HamiltonSearch tries the
+        quick checks, exact search for small graphs and heuristics for big ones, in that order.
 
-        # Search for path from every node until you find one
-        for node in self.nodes:
-            self.hamilton_path = self.depth_first_search(current=node, path=[node], search_type='hp')
-            if self.hamilton_path is not None:
-                break
+        Known graph families have theirs by construction, no searching needed.
 
-        # If there is no path there is no circuit!
-        if self.hamilton_path is None:
-            self.hamilton_circuit = None
-            return
+        Parameters:
+            - time_budget (float) (optional): seconds to search for, after that the answer is unknown.
+        """
+        self.hamilton_path = None
+        self.hamilton_circuit = None
+        self.hamilton_path_unknown = False
+        self.hamilton_circuit_unknown = False
 
-        # In case the path already loops in on itself just make that the circuit and append the first node to end
-        elif self.hamilton_path[0] in self.hamilton_path[-1].neighbors:
-            self.hamilton_circuit = self.hamilton_path.copy()
-            self.hamilton_circuit.append(self.hamilton_path[0])
+        if self.family is not None:
+            self.hamilton_path, self.hamilton_circuit = self.family.get_hamilton(self)
             return
 
-        # Search for Hamilton circuit, but don't if a node has a degree of 1
-        if len([node for node in self.nodes if node.degree == 1]) > 0:
-            self.hamilton_circuit = None
-            return
+        search = HamiltonSearch(self.adjacency, time_budget=time_budget)
+        path = search.find_path()
+        self.hamilton_path_unknown = search.path_unknown
+        if path is not None:
+            self.hamilton_path = [self.nodes[i] for i in path]
 
-        for node in self.nodes:
-            self.hamilton_circuit = self.depth_first_search(current=node, path=[node], search_type='hc')
-            if self.hamilton_circuit is not None:
-                break
+        circuit = search.find_circuit(path)
+        self.hamilton_circuit_unknown = search.circuit_unknown
+        if circuit is not None:
+            self.hamilton_circuit = [self.nodes[i] for i in circuit] + [self.nodes[circuit[0]]]
 
     def analyze_euler(self):
         """
@@ -402,343 +633,231 @@ class Graph:
          2. Euler circuit is an Euler path that starts and ends in the same vertex.
 
         First we will check if the paths are possible:
-         0. If the graph is not fully connected, none of it is possible.
+         0. If the edges are spread over more than one component, none of it is possible. Lonely nodes without
+            any edges don't matter, there is nothing to walk over there.
          1. Euler's path is possible if there are exactly 2 or none odd degree vertices.
          2. Euler's circuit requires all degrees to be even.
 
-        If they are possible, we will use Depth-First-Search to find at least one way and save it.
-        """
-        if not self.connected:
-            self.euler_path = None
-            self.euler_circuit = None
-            return
-
-        odd_nodes = [node for node in self.nodes if node.degree % 2 == 1]
-
-        if len(odd_nodes) == 0:
-            ep_start = random.choice(self.nodes)
-            ec_start = random.choice(self.nodes)
-            self.euler_path = self.depth_first_search(current=ep_start, path=[ep_start], edges=[], search_type="ep")
-            self.euler_circuit = self.depth_first_search(current=ec_start, path=[ec_start], edges=[], search_type="ec")
-            return
-
-        if len(odd_nodes) == 2:
-            self.euler_circuit = None
-            start = odd_nodes[random.choice([0, 1])]
-            self.euler_path = self.depth_first_search(current=start, path=[start], edges=[], search_type="ep")
+        If they are possible, only where they start is decided here. Hierholzer's algorithm finds one in a single
+        pass over the edges when euler_path or euler_circuit is first looked at.
 
-    def depth_first_search(self,
-                           current: Node,
-                           path: List[Node],
-                           edges: Optional[List[set[Node, Node]]] = None,
-                           search_type: Optional[str] = None,
-                           max_depth: int = None,
-                           paths: Optional[set[Tuple[Node]]] = None,
-                           finish: Optional[Node] = None
-                           ):
+        Known graph families say from their degrees, no counting needed.
         """
-        *** Depth First Search ***
-
-        Recursive function to check all available possibilities, used primarily to find Euler/Hamilton paths/circuits.
-
-        Parameters:
-            - current (Node): current node we are at.
-            - path (List of Nodes): The path we are returning.
-            - edges (List of sets of Nodes) (Optional): For Euler we need to save the edges, so we don't use them again.
-            - search_type (string): letter combinations, e for Euler, h for Hamilton, p for path, c for circuit,
-                                    meaning if the search_type is ep we are looking for Euler's path,
-                                    hc Hamilton's circuit.
-            - max_depth (int) (optional): finding all shortest paths to node
-            - paths (set of paths) (optional): All paths to the finish node
-            - finish (Node) (optional): Node we are searching for
-
-        Returns:
-            - List[Nodes]: Our final path, should we find it successfully
-            - set[Tuple[Nodes]]: set of all paths to the finish
-            - None: if it fails miserably
-        """
-
-        # Win/Loose ending conditions Euler:
-        if search_type == "ep" or search_type == "ec":
-            if len(edges) == self.number_of_edges:
-                if search_type == "ec" and not path[0] == path[-1]:  # Circuit needs to circuit back.
-                    return
-                return path
-
-        # Win/Loose condition for Hamilton
-        if search_type == "hp" or search_type == "hc":
-            if len(path) == len(self.nodes):
-                if search_type == "hc":
-                    # Hamilton circuit is a bit easier to check
-                    if path[0] not in current.neighbors:
-                        return
-                    path.append(path[0])
-                return path
-
-        # Win/Loose condition for all paths
-        if search_type == "a":
-            if len(path) >= max_depth:
-                return paths
-
-            # Winning neighbor for all paths, no need to check other neighbors
-            if finish in current.neighbors:
-                path_copy = path.copy()
-                path_copy.append(finish)
-                paths.add(tuple(path_copy))
-                return paths
-
-        # Continue your search
-        for neighbor in current.neighbors:
-            # Failed neighbors for Euler
-            if search_type == "ep" or search_type == "ec":
-                if {current, neighbor} in edges:  # Edge unusable
-                    continue
-                if len(edges) - self.number_of_edges > 1:  # If we are not on the last edge
-                    # Don't use the neighbor if he should be last
-                    if neighbor.degree - sum(neighbor in edge for edge in edges) == 1:
-                        continue
+        self.euler_path_start = self.euler_circuit_start = None
+        self._euler_path = self._euler_circuit = None
 
-            # Failed neighbors for Hamilton
-            if search_type == "hp" or search_type == "hc":
-                if neighbor in path:
-                    continue
-
-            # Winning/Loosing neighbor for Bipartite
-            if search_type == "b" and neighbor in path:
-                print(len(path), path.index(neighbor))
-                if len(path) - path.index(neighbor) > 2 and (len(path) - path.index(neighbor)) % 2 == 1:
-                    # If the cycle is odd return
-                    return path[path.index(neighbor):] + [neighbor]
-                else:
-                    # Otherwise ignore the neighbor
-                    continue
-
-            # Should neighbor succeed!
-            path_copy = path.copy()
-            path_copy.append(neighbor)
-
-            edges_copy = None
-            if search_type == "ec" or search_type == "ep":
-                edges_copy = edges.copy()
-                edges_copy.append({current, neighbor})
-
-            path_success = self.depth_first_search(current=neighbor,
-                                                   path=path_copy,
-                                                   edges=edges_copy,
-                                                   search_type=search_type,
-                                                   paths=paths,
-                                                   max_depth=max_depth,
-                                                   finish=finish
-                                                   )
-            # Stop recurring if successful
-            if search_type != "a" and path_success is not None:
-                return path_success
-        return paths
-
-    def dijsktra(self, start: Node,
-                 finish: Optional[Node] = None,
-                 max_distance: Union[int, float] = math.inf,
-                 bipartite: bool = False):
-        """
-        *** Dijsktra or Breadth First Search ***
-
-        Pathfinding implementation, trying to make it as general purpose as possible, to be used for
-        finding path from A to B, finding all nodes at a max distance from start or to make a minimum spanning tree.
-
-        Parameters:
-            - start (Node): The Node from which we are finding a path.
-            - finish (Node) (Optional): Node we are trying to reach, optional in case of unknown goal.
-            - max_distance (int) (optional): Max distance to stop the search at, if not set it is infinite.
-            - bipartite (boolean): Boolean indicating if we are trying to figure out bipartisanship
-
-
-        return:
-            - Node: If path is found return the finish Node and can backtrack with parents for the path
-            - List[Node]: A list of nodes at a set distance
-            - None: If pathfinding is unsuccessful return None
-        """
-
-        self.reset_pathfinding()
-
-        open_list = [start]
-        if bipartite and start.color is None:
-            start.color = 'magenta'
-        closed_list = []
-        start.distance = 0
-        current_distance = 0
-
-        while len(open_list) > 0 and current_distance < max_distance:
-            current_node = open_list.pop(0)
-            current_distance += 1
-
-            if current_node == finish:  # We found it... or it is None
-                return current_node
-
-            if current_distance == max_distance:  # Distance reached, return neighbours that were not yet found.
-                return [node for node in current_node.neighbors if node.distance == math.inf]
-
-            for neighbour in current_node.neighbors:  # Check all the connected nodes
-                if bipartite and neighbour.color is not None and neighbour.color == current_node.color:
-                    # If searching for bipartite end it if 2 connected nodes are the same color
-                    return neighbour  # Going to return it because it is the ideal candidate to find a cycle
-
-                elif bipartite and neighbour.color is None:
-                    neighbour.color = "magenta" if current_node.color == "cyan" else "cyan"
+        if self.family is not None:
+            path_start, circuit_start = self.family.get_euler_starts()
+            self.euler_path_start = None if path_start is None else self.nodes[path_start]
+            self.euler_circuit_start = None if circuit_start is None else self.nodes[circuit_start]
+            return
 
-                if neighbour.distance > current_distance:  # If they are closer than before set parent and distance
-                    neighbour.distance = current_distance
-                    neighbour.parent = current_node
+        edge_components = self.get_edge_components()
+        if len(edge_components) > 1:
+            return
 
-                    if neighbour in closed_list:  # If they are in the closed list kick them out
-                        closed_list.remove(neighbour)
-                        open_list.append(neighbour)
-                    if neighbour not in open_list:  # If they are not in the open list add them
-                        open_list.append(neighbour)
+        odd_nodes = [node for node in self.nodes if node.degree % 2 == 1]
 
-    def reset_pathfinding(self):
-        # Reset the nodes to their default pathfinding values
-        for node in self.nodes:
-            node.parent = None
-            node.distance = math.inf
+        if len(odd_nodes) == 0:
+            starts = [self.nodes[i] for i in edge_components[0]] if edge_components else self.nodes
+            self.euler_path_start = random.choice(starts)
+            self.euler_circuit_start = random.choice(starts)
+        elif len(odd_nodes) == 2:
+            self.euler_path_start = odd_nodes[random.choice([0, 1])]
 
     def reset_color(self):
         for node in self.nodes:
             node.color = None
 
-    def get_node_by_name(self, name: str):
-        for node in self.nodes:
-            if node.name == name:
-                return node
+    def get_node_by_name(self, name: str) -> Optional[Node]:
+        if len(self.node_names) != len(self.nodes):  # Someone appended to the nodes list directly
+            self.index_node_names()
+        return self.node_names.get(name)
 
     def sort_nodes_by_name(self):
+        if self.names_sorted:
+            return
         if all([node.name.isdigit() for node in self.nodes]):
             self.nodes.sort(key=lambda node: int(node.name))
         else:
             self.nodes.sort(key=attrgetter("name"))
 
+        order = [node.index for node in self.nodes]
+        if self.adjacency is not None and order != list(range(len(order))):  # Reorder the arrays to match
+            self.adjacency = self.adjacency.permuted(order)
+            self.bfs = BreadthFirstSearch(self.adjacency)
+            self.orbits = None
+            for i, node in enumerate(self.nodes):
+                node.index = i
+            self.set_components()
+
     """
-    Methods to create subgraphs with fewer and fewer connections to find out when it falls apart.
+    Methods to snip the graph apart into communities and to find out when it falls apart.
     """
 
-    def check_if_snip(self, graph):
+    def analyze_communities(self):
         """
-        Check if all edge betweeness is the same within a partition.
-        If we have a disconnected graph, we could still have communities inside the partitions.
+        Finding communities and connectivity
+        Here we can use some network analysis to consider when we should even bother:
+            1. 'Math-Graphs' where all nodes have x degree, have no obvious communities and fall apart after x snips
+            2. Bipartite graphs, if full, have no obvious communities, fall apart after lowest degree snips.
 
-        Parameters:
-            - graph (Graph): the graph we are checking atm
+        With this in mind I will use betweeness as the main factor and consider the graph to be community-less,
+        if all edges have the same betweeness in all partitions.
 
-        Returns:
-             - True when it finds a missmatch in the particular partition
-             - False if they are all the same
+        Honestly let's just focus on the 'Girvan-Newman' algorithm and snip periodically with these rules:
+            1. Get edge with the biggest 'betweeness' i.e. is in the most bridges
+            2. Take it out
+            3. Work out the betweeness again, only in the component that edge was in
+            4. Stop when 'betweeness' is the same for all nodes within a partition, or once the modularity
+               hasn't gotten any better for a few splits
+
+        The levels up to the best modularity are the communities, with the snips that got there. The whole split
+        history is in self.dendrogram, the graph of a level is only put together when someone wants to look at
+        it, see get_community_graph.
         """
-        for partition in graph.partitions:
-            betweeness = None
-            for edge in graph.edge_betweeness:
-                if edge[0] in partition and betweeness is None:
-                    betweeness = round(graph.edge_betweeness[edge], 4)  # Afraid of float point error
-                elif edge[0] in partition and round(graph.edge_betweeness[edge], 4) != betweeness:
-                    return True
-        return False
+        self.connectivity = None if self.connected else 0
+        self.communities = []
+        self.snips = []
+        self.community_graphs = {}
+
+        girvan_newman = GirvanNewman(self.adjacency, self.components)
+        girvan_newman.run()
+        self.dendrogram = girvan_newman.dendrogram
+        best = self.dendrogram.get_best_level()
+        for level in range(1, best + 1):
+            clusters = {}
+            for node, cluster in zip(self.nodes, self.dendrogram.get_clusters(level)):
+                clusters.setdefault(cluster, set()).add(node)
+            self.communities.append(list(clusters.values()))  # Ordered by their first node, same as partitions
+
+            first = girvan_newman.split_after[level - 2] if level > 1 else 0
+            snips = girvan_newman.snips[first:girvan_newman.split_after[level - 1]]
+            self.snips.append([(self.nodes[a], self.nodes[b]) for a, b in snips])
+        self.modularity = self.dendrogram.modularity[1:best + 1]
+
+        if self.connectivity is None:
+            split_after = girvan_newman.split_after
+            self.connectivity = split_after[0] if split_after else self.min_degree
 
-    def get_node_copies(self, nodes: List[Node]):
+    def analyze_family_communities(self):
         """
-        Need to create manual copies of nodes so that the original graph is untouched.
+        Known graph families look the same from every node (Kn,m from every node on the same side), no part of
+        them is denser than the rest to be a community. Nothing to look for, no levels. They fall apart after
+        as many snips as the smallest degree.
+        """
+        self.connectivity = self.min_degree
+        self.communities = []
+        self.snips = []
+        self.community_graphs = {}
+        self.dendrogram = None
+        self.modularity = []
 
-        Parameters:
-            - nodes (list of Nodes): to avoid recursively making subgraphs of subgraphs I will just pass in the
-                                     list of nodes I want to copy
+    def analyze_modularity_communities(self, seed: Optional[int] = None):
         """
-        new_nodes = [Node(name=node.name) for node in nodes]  # Create a list of Nodes
+        Communities for graphs too big to snip apart, Louvain picks them by modularity in about O(m) per pass.
 
-        for old_node in nodes:
-            new_node = [n for n in new_nodes if n.name == old_node.name][0]
-            for neighbor in old_node.neighbors:  # Add the connections
-                new_neighbor = [n for n in new_nodes if n.name == neighbor.name][0]
-                new_node.neighbors.append(new_neighbor)
-        return new_nodes
+        The levels go from the few big communities with the best modularity to the many small ones they are
+        made of, see set_community_levels. Nothing is snipped one edge at a time, so connectivity is only what
+        the degrees say.
 
-    def delete_edge_from_copy(self, edge: Tuple[Node, Node], nodes_copy: List[Node]):
-        evil_nodes = [node for node in nodes_copy if node.name in [en.name for en in edge]]
-        evil_nodes[0].neighbors.remove(evil_nodes[1])
-        evil_nodes[1].neighbors.remove(evil_nodes[0])
+        Parameters:
+            - seed (int) (optional): for the order Louvain visits the nodes in.
+        """
+        self.connectivity = self.min_degree if self.connected else 0
+        louvain = Louvain(self.adjacency, seed=seed)
+        louvain.run()
+        self.set_community_levels(louvain.levels[::-1])
 
-    def generate_subgraph(self, nodes: List[Node], name: str):
-        subgraph = Graph(name=name)
-        subgraph.nodes = nodes
-        return subgraph
+    def analyze_label_communities(self, seed: Optional[int] = None, workers: int = 1):
+        """
+        Communities for graphs with millions of edges, label propagation finds them in a few rounds of O(m).
+        A single level, no better modularity to look for. Connectivity is only what the degrees say.
 
-    def analyze_communities(self):
+        Parameters:
+            - seed (int) (optional): for the order labels are passed around in.
+            - workers (int): with more than one, blocks of nodes are relabeled in that many processes.
         """
-        Finding communities and connectivity
-        Here we can use some network analysis to consider when we should even bother:
-            1. 'Math-Graphs' where all nodes have x degree, have no obvious communities and fall apart after x snips
-            2. Bipartite graphs, if full, have no obvious communities, fall apart after lowest degree snips.
+        self.connectivity = self.min_degree if self.connected else 0
+        label_propagation = LabelPropagation(self.adjacency, seed=seed)
+        label_propagation.run(workers=workers)
+        self.set_community_levels([label_propagation.labels])
 
-        With this in mind I will use betweeness as the main factor and consider the graph to be community-less,
-        if all edges have the same betweeness in all partitions.
+    def set_community_levels(self, levels: List[List[int]]):
+        """
+        Fills in the communities from community ids of every node, a list of them per level. Levels go from few
+        big communities to many small ones made out of them, same as the snipping finds them. The edges between
+        the communities of a level that were not between those of the level before are its snips, so the
+        levels show the same way. Levels that don't split anything more than the one before are left out.
+        """
+        self.communities = []
+        self.snips = []
+        self.community_graphs = {}
+        self.dendrogram = None
+
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+        before = self.component_of
+        for community_of in levels:
+            count = max(community_of, default=-1) + 1
+            if count <= (len(self.communities[-1]) if self.communities else len(self.components)):
+                continue
 
-        Honestly let's just focus on the 'Girvan-Newman' algorithm and snip periodically with these rules:
-            1. Get edge with the biggest 'betweeness' i.e. is in the most bridges
-            2. Make a subgraph without that edge
-            3. Repeat the process for the new subgraph
-            4. Stop when 'betweeness' is the same for all nodes within a partition
+            partitions = [set() for _ in range(count)]
+            for node in self.nodes:
+                partitions[community_of[node.index]].add(node)
+            snips = []
+            for i in range(len(self.nodes)):
+                for slot in range(offsets[i], offsets[i + 1]):
+                    j = targets[slot]
+                    if i < j and community_of[i] != community_of[j] and before[i] == before[j]:
+                        snips.append((self.nodes[i], self.nodes[j]))
+
+            self.communities.append(partitions)
+            self.snips.append(snips)
+            before = community_of
+        self.modularity = [self.get_modularity(partitions) for partitions in self.communities]
+
+    def get_modularity(self, partitions: List[Set[Node]]) -> float:
+        """
+        How much more the edges stay inside the partitions than they would in a random graph with the same
+        degrees, between -1/2 and 1. Every edge counted from both ends, 2m of them:
+            Q = sum over partitions of (edges inside / 2m - (degrees / 2m)^2)
+        """
+        two_m = len(self.adjacency.targets)
+        if two_m == 0:
+            return 0.0
+
+        partition_of = [0] * len(self.nodes)
+        for k, partition in enumerate(partitions):
+            for node in partition:
+                partition_of[node.index] = k
+        inside, degrees = [0] * len(partitions), [0] * len(partitions)
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+        for i in range(len(self.nodes)):
+            degrees[partition_of[i]] += offsets[i + 1] - offsets[i]
+            for slot in range(offsets[i], offsets[i + 1]):
+                if partition_of[targets[slot]] == partition_of[i]:
+                    inside[partition_of[i]] += 1
+        return sum(inside[k] / two_m - (degrees[k] / two_m) ** 2 for k in range(len(partitions)))
+
+    def get_community_graph(self, level: int) -> "Graph":
+        """
+        The graph without the edges snipped up to a community level, a view that only remembers those edges.
+        Not analyzed, made once per level.
 
         Parameters:
-            - GM (GraphManager): Has the analyzer method
-            - SM (StringManater): Needed by GM analyzer method
-
-        Returns:
-             - None
+            - level (int): index into self.communities.
         """
+        if level not in self.community_graphs:
+            snipped = [snip for snips in self.snips[:level + 1] for snip in snips]
+            self.community_graphs[level] = SubgraphView(self, str(len(snipped)), removed=snipped)
+        return self.community_graphs[level]
 
-        self.connectivity = None if self.connected else 0
-        current_graph = self
-        i = 1
-        current_snips = []
-        while self.check_if_snip(graph=current_graph) and len(current_graph.partitions) < 5:
-            # Generate new graph
-            new_nodes = self.get_node_copies(nodes=current_graph.nodes)
-            edge_to_delete = max(current_graph.edge_betweeness, key=current_graph.edge_betweeness.get)
-            self.delete_edge_from_copy(edge_to_delete, new_nodes)
-            current_snips.append((self.get_node_by_name(edge_to_delete[0].name),
-                                  self.get_node_by_name(edge_to_delete[1].name)))
-
-            new_graph = Graph(str(i))
-            new_graph.nodes = new_nodes
-
-            # Analyze graph and save it if it has more partitions than the last one
-            new_graph.set_node_degrees()
-            new_graph.set_adjacency_matrix()
-            new_graph.set_number_of_connections_and_density()
-            new_graph.analyze_cluster_coefficients()
-            new_graph.calculate_shortest_paths_for_all_nodes()
-            new_graph.analyze_betweeness_centrality()
-            new_graph.analyze_closessness()
-            new_graph.analyze_euler()
-            new_graph.analyze_hamilton()
-            new_graph.analyze_bipartite()
-            new_graph.analyzed = True
-
-            if len(self.subgraphs) > 0 and len(new_graph.partitions) > len(self.subgraphs[-1].partitions):
-                self.subgraphs.append(new_graph)
-                self.snips.append(current_snips)
-                current_snips = []
-
-            elif len(self.subgraphs) == 0:
-                if len(new_graph.partitions) > len(self.partitions):
-                    self.subgraphs.append(new_graph)
-                    self.snips.append(current_snips)
-                    current_snips = []
-
-            if self.connectivity is None and not new_graph.connected:
-                self.connectivity = i
-
-            current_graph = new_graph
-            i += 1
-
-        if self.connectivity is None:
-            self.connectivity = self.min_degree if self.connected else 0
+    def get_induced_subgraph(self, nodes: Iterable[Node], name: str) -> "Graph":
+        """
+        The nodes with only the edges between them, a view that only remembers which nodes. Not analyzed.
+        """
+        return SubgraphView(self, name, kept=nodes)
 
     # Overwrites for prints
     def __str__(self):
@@ -746,3 +865,6 @@ class Graph:
 
     def __repr__(self):
         return f"G: {self.name}"
+
+
+from classes.SubgraphView import SubgraphView  # Is a Graph itself, so it can only come once Graph is there
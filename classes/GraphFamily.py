@@ -0,0 +1,290 @@
+import math
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from classes.Brandes import Brandes
+from classes.Node import Node
+from classes.UniformEdgeBetweeness import UniformEdgeBetweeness
+
+
+class GraphFamily:
+    """
+    *** Graph Family Class ***
+
+    What a generated graph is, so the analysis doesn't have to find out the hard way. Complete graphs, complete
+    bipartite graphs, cycles, hypercubes and the Petersen graph look the same from every node (Kn,m from every
+    node on the same side), so the distances from one node tell the whole story. With those, paths, betweeness,
+    closeness and clustering come out of a formula in O(n) and Hamilton paths are known by construction.
+    Euler tours exist or not by the parity of the degrees, and there are no communities to find: no part of a
+    graph that looks the same from everywhere is any denser than the rest.
+
+    Betweeness the way Brandes counts it: summed over the ordered pairs of nodes that are not neighbors.
+        - A node of a graph that looks the same from everywhere is in the middle of sum(d - 1) / n of them,
+          d running over the distances of all such pairs.
+        - A left node of Kn,m with a left nodes and b right ones is one of the a middle nodes of every pair of
+          right nodes, b(b - 1) / a. Right nodes the other way around.
+        - All these graphs look the same from every edge too, an edge gets sum(d) / m.
+
+    Attributes:
+        - kind (str): "kn", "knm", "c", "q" or "petersen".
+        - parameters (Tuple[int, ...]): n for kn, c and q, (n, m) for knm, none for petersen.
+
+    Methods:
+        - fits: checks the graph still is what the family says.
+        - get_distance_profile: distances from a node, how many nodes are that far and by how many shortest paths.
+        - get_profile_sums: what the paths and betweeness need out of a profile, saved for nodes that look the same.
+        - get_path_summaries, get_betweeness, get_edge_betweeness, get_clustering_coefficient, get_hamilton,
+          get_bipartite, get_euler_starts: the results for the graph.
+    """
+
+    kinds = ("kn", "knm", "c", "q", "petersen")
+
+    def __init__(self, kind: str, parameters: Tuple[int, ...] = ()):
+        if kind not in self.kinds:
+            raise ValueError(f"Unknown graph family: {kind}")
+        self.kind: str = kind
+        self.parameters: Tuple[int, ...] = parameters
+        self._profile_sums: Dict[Optional[bool], Dict[str, int]] = {}
+
+    def get_node_count(self) -> int:
+        if self.kind == "knm":
+            return self.parameters[0] + self.parameters[1]
+        if self.kind == "q":
+            return 2 ** self.parameters[0]
+        if self.kind == "petersen":
+            return 10
+        return self.parameters[0]
+
+    def get_edge_count(self) -> int:
+        if self.kind == "kn":
+            return self.parameters[0] * (self.parameters[0] - 1) // 2
+        if self.kind == "knm":
+            return self.parameters[0] * self.parameters[1]
+        if self.kind == "c":
+            return self.parameters[0]
+        if self.kind == "q":
+            return self.parameters[0] * 2 ** (self.parameters[0] - 1)
+        return 15
+
+    def fits(self, graph) -> bool:
+        """
+        The formulas only hold for the graph as it was generated, big enough to be what it says (a "cycle" of 2
+        nodes is a single edge) and with nothing added or taken away since.
+        """
+        if self.kind == "kn" and self.parameters[0] < 1:
+            return False
+        if self.kind == "knm" and min(self.parameters) < 1:
+            return False
+        if self.kind == "c" and self.parameters[0] < 3:
+            return False
+        if self.kind == "q" and self.parameters[0] < 1:
+            return False
+        return (len(graph.nodes) == self.get_node_count()
+                and graph.adjacency is not None
+                and graph.adjacency.edge_count == self.get_edge_count())
+
+    def is_left(self, node: Node) -> bool:
+        # The first n nodes of Kn,m are the left ones
+        return node.index < self.parameters[0]
+
+    def get_distance_profile(self, node: Node) -> List[Tuple[int, int, int]]:
+        """
+        Returns:
+            - List of (distance, number of nodes that far, shortest paths to each of them) tuples.
+        """
+        if self.kind == "kn":
+            n = self.parameters[0]
+            return [(1, n - 1, 1)] if n > 1 else []
+
+        if self.kind == "knm":
+            same, other = self.parameters if self.is_left(node) else self.parameters[::-1]
+            profile = [(1, other, 1)]
+            if same > 1:
+                profile.append((2, same - 1, other))  # Through any of the other side
+            return profile
+
+        if self.kind == "c":
+            n = self.parameters[0]
+            profile = [(d, 2, 1) for d in range(1, (n - 1) // 2 + 1)]
+            if n % 2 == 0:
+                profile.append((n // 2, 1, 2))  # Straight across, both ways around are as long
+            return profile
+
+        if self.kind == "q":
+            n = self.parameters[0]
+            return [(d, math.comb(n, d), math.factorial(d)) for d in range(1, n + 1)]
+
+        return [(1, 3, 1), (2, 6, 1)]  # Petersen, any two nodes that are not neighbors have one in common
+
+    def get_profile_sums(self, node: Node) -> Dict[str, int]:
+        """
+        Sums over the distance profile of a node. Nodes that look the same have the same sums, so they are
+        worked out once per side (Kn,m) or once for the whole graph and saved.
+        """
+        key = self.is_left(node) if self.kind == "knm" else None
+        if key not in self._profile_sums:
+            profile = self.get_distance_profile(node)
+            far = [(distance, count, sigma) for distance, count, sigma in profile if distance >= 2]
+            self._profile_sums[key] = {
+                "distance_sum": sum(distance * count for distance, count, _ in profile),
+                "reachable": 1 + sum(count for _, count, _ in profile),
+                "eccentricity": max((distance for distance, _, _ in profile), default=0),
+                "far_pairs": sum(count for _, count, _ in far),
+                "far_paths": sum(count * sigma for _, count, sigma in far),
+                "far_distance": sum(distance * count for distance, count, _ in far),
+                "middles": sum((distance - 1) * count for distance, count, _ in far),
+                "paths_through": sum((distance - 1) * count * sigma for distance, count, sigma in far),
+            }
+        return self._profile_sums[key]
+
+    def get_path_summaries(self, graph) -> List[Tuple[int, int, int, int]]:
+        """
+        Returns:
+            - List of (source, distance sum, reachable nodes, eccentricity) tuples, same as the breadth first
+              searches would give.
+        """
+        summaries = []
+        for node in graph.nodes:
+            sums = self.get_profile_sums(node)
+            summaries.append((node.index, sums["distance_sum"], sums["reachable"], sums["eccentricity"]))
+        return summaries
+
+    def get_betweeness(self, graph) -> Brandes:
+        """
+        Returns:
+            - Brandes: with the same node sums as if it had been accumulated from every node, no edge sums.
+              Every edge has the same, see get_edge_betweeness.
+        """
+        brandes = Brandes(graph.adjacency, edges=False)
+        for node in graph.nodes:
+            sums = self.get_profile_sums(node)
+            brandes.pairs += sums["far_pairs"]
+            brandes.total_paths += sums["far_paths"]
+
+            if self.kind == "knm":
+                same, other = self.parameters if self.is_left(node) else self.parameters[::-1]
+                brandes.node_dependency[node.index] = other * (other - 1) / same
+                brandes.bridge_count[node.index] = other * (other - 1)
+            else:
+                brandes.node_dependency[node.index] = sums["middles"]
+                brandes.bridge_count[node.index] = sums["paths_through"]
+
+        return brandes
+
+    def get_edge_betweeness(self, graph, pairs: int) -> Mapping:
+        """
+        Each edge gets the same share of the steps between far pairs, O(n) for the sums and nothing per edge.
+
+        Parameters:
+            - pairs (int): number of far pairs, the betweeness is their share.
+
+        Returns:
+            - Edges (smaller index node first) to their betweeness, empty if no pair is further apart than 1.
+        """
+        far_distance = sum(self.get_profile_sums(node)["far_distance"] for node in graph.nodes)
+        if far_distance == 0:
+            return {}
+        return UniformEdgeBetweeness(graph, far_distance / graph.adjacency.edge_count / pairs)
+
+    def get_clustering_coefficient(self) -> float:
+        # Only complete graphs have neighbors that know each other, C3 being K3
+        if self.kind == "kn" and self.parameters[0] >= 3 or self.kind == "c" and self.parameters[0] == 3:
+            return 1.0
+        return 0.0
+
+    def get_bipartite(self, graph) -> Tuple[List[int], Optional[List[Node]]]:
+        """
+        Returns:
+            - Side (0 or 1) of every node by its index, a proper 2 coloring if the graph is bipartite.
+            - Odd cycle (first node repeated at the end), None if the graph is bipartite.
+        """
+        sides = [self.get_side(node) for node in graph.nodes]
+        order = self.get_odd_cycle_order()
+        return sides, None if order is None else [graph.nodes[i] for i in order]
+
+    def get_side(self, node: Node) -> int:
+        if self.kind == "knm":
+            return 0 if self.is_left(node) else 1
+        if self.kind == "q":
+            return bin(node.index).count("1") % 2  # Neighbors differ by a single bit
+        if self.kind == "petersen":
+            return 0 if node.index >= 5 else 1  # The star inside
+        return node.index % 2
+
+    def get_odd_cycle_order(self) -> Optional[List[int]]:
+        # Shortest odd cycle by node indices, None for the bipartite ones
+        if self.kind == "kn" and self.parameters[0] >= 3:
+            return [0, 1, 2, 0]
+        if self.kind == "c" and self.parameters[0] % 2 == 1:
+            return list(range(self.parameters[0])) + [0]
+        if self.kind == "petersen":
+            return [0, 1, 2, 3, 4, 0]
+        return None
+
+    def get_euler_starts(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        A circuit needs every degree even, a path either that or exactly 2 odd ones to start from. Kn has degree
+        n - 1, Cn 2, Qn n and Petersen 3, the n left nodes of Kn,m have degree m and the m right ones n.
+
+        Returns:
+            - Node index to start an Euler path from and one to start an Euler circuit from, None where there is
+              none. Any node for a circuit, one of the odd ones for a path.
+        """
+        if self.kind == "knm":
+            n, m = self.parameters
+            if n % 2 == 0 and m % 2 == 0:
+                return 0, 0
+            if (n == 2 and m % 2 == 1) or (n == 1 and m == 1):
+                return 0, None
+            if m == 2 and n % 2 == 1:
+                return n, None  # The right nodes are the odd ones
+            return None, None
+
+        n = self.parameters[0] if self.parameters else 10
+        if self.kind == "c" or (self.kind == "kn" and n % 2 == 1) or (self.kind == "q" and n % 2 == 0):
+            return 0, 0
+        if (self.kind == "kn" and n == 2) or (self.kind == "q" and n == 1):  # A single edge
+            return 0, None
+        return None, None
+
+    def get_hamilton(self, graph) -> Tuple[Optional[List[Node]], Optional[List[Node]]]:
+        """
+        Returns:
+            - Hamilton path and Hamilton circuit (first node repeated at the end), None where there is none.
+        """
+        order = self.get_hamilton_order()
+        if order is None:
+            return None, None
+
+        path = [graph.nodes[i] for i in order]
+        has_circuit = (len(path) >= 3
+                       and self.kind != "petersen"
+                       and (self.kind != "knm" or self.parameters[0] == self.parameters[1]))
+        return path, path + [path[0]] if has_circuit else None
+
+    def get_hamilton_order(self) -> Optional[List[int]]:
+        # Node indices along a Hamilton path, it closes into a circuit wherever there is one
+        if self.kind in ("kn", "c"):
+            return list(range(self.parameters[0]))
+
+        if self.kind == "knm":
+            n, m = self.parameters
+            if abs(n - m) > 1:
+                return None
+            left, right = list(range(n)), list(range(n, n + m))
+            first, second = (left, right) if n >= m else (right, left)
+            order = []
+            for i in range(len(first)):  # Back and forth between the sides, starting on the bigger one
+                order.append(first[i])
+                if i < len(second):
+                    order.append(second[i])
+            return order
+
+        if self.kind == "q":
+            # Reflected Gray code, Qn+1 is Qn with a 0 in front there and with a 1 in front back
+            return [i ^ (i >> 1) for i in range(2 ** self.parameters[0])]
+
+        # Around the outer cycle c0 to c4, then the star inside k4, k1, k3, k0, k2
+        return [0, 1, 2, 3, 4, 9, 6, 8, 5, 7]
+
+    def __repr__(self):
+        return f"GraphFamily({self.kind}, {self.parameters})"
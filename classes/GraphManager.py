@@ -1,9 +1,12 @@
-import random
 import time
-from typing import List, Optional, Union
+from typing import Callable, List, Optional, Sequence, Union
 
+from classes.Adjacency import Adjacency
 from classes.Graph import Graph
+from classes.GraphFamily import GraphFamily
+from classes.ImplicitAdjacency import ImplicitAdjacency
 from classes.Node import Node
+from classes.RandomEdges import RandomEdges
 
 
 class GraphManager:
@@ -11,6 +14,32 @@ class GraphManager:
         self.graphs: List[Graph] = []
         self.current_graph: Optional[Graph] = None
 
+        # Above this many nodes betweeness is sampled, within epsilon of the real thing with probability 1 - delta.
+        # Past the time budget (seconds) sampling stops and epsilon grows to match, None to sample until it's met
+        self.approximate_betweeness_above: int = 2000
+        self.betweeness_epsilon: float = 0.01
+        self.betweeness_delta: float = 0.1
+        self.betweeness_time_budget: Optional[float] = 10.0
+        # Above the same number of nodes paths are searched for from random pivots only, average distances within
+        # epsilon times the diameter with probability 1 - delta, same time budget as betweeness
+        self.paths_epsilon: float = 0.1
+        self.paths_delta: float = 0.1
+        self.paths_time_budget: Optional[float] = 10.0
+
+        # Above this many nodes the adjacency matrix is not made, n^2 of zeros is too much to keep or to print
+        self.adjacency_matrix_max_nodes: int = 1000
+
+        # Seconds the Hamilton search gets per graph, past that the answer is unknown, None to search until it knows
+        self.hamilton_time_budget: Optional[float] = 10.0
+
+        # Above this many nodes communities come from Louvain, snipping edges one by one takes too long
+        self.modularity_communities_above: int = 200
+        # Above this many nodes even Louvain takes too long, label propagation only looks for communities quickly
+        self.label_communities_above: int = 100000
+
+        # Processes to split paths and betweeness between, unless analyze_graph is told otherwise
+        self.workers: int = 1
+
     def load_from_file(self, filename: str):
         """
         *** load_from_file ***
@@ -35,7 +64,7 @@ class GraphManager:
 
         try:
             with open(filename) as f:
-                for line in f.readlines():
+                for line in f:
                     nodes = line.strip().split()
                     if len(nodes) > 2 or len(nodes) < 1 or nodes[0] == any(
                             ["", " "]):  # If file is not properly formatted, return False
@@ -44,7 +73,7 @@ class GraphManager:
                     node_1 = new_graph.get_node_by_name(nodes[0])
                     if node_1 is None:
                         node_1 = Node(name=nodes[0])
-                        new_graph.nodes.append(node_1)
+                        new_graph.add_node(node_1)
 
                     if len(nodes) == 1:  # In case it's a single node without a connection skip rest of the code
                         continue
@@ -52,13 +81,11 @@ class GraphManager:
                     node_2 = new_graph.get_node_by_name(nodes[1])
                     if node_2 is None:
                         node_2 = Node(name=nodes[1])
-                        new_graph.nodes.append(node_2)
+                        new_graph.add_node(node_2)
 
-                    # Add neighbours to both nodes
-                    if node_2 not in node_1.neighbors:
-                        node_1.neighbors.append(node_2)
-                    if node_1 not in node_2.neighbors:
-                        node_2.neighbors.append(node_1)
+                    # Add neighbours to both nodes, repeated lines get dropped when building the adjacency
+                    node_1.neighbors.append(node_2)
+                    node_2.neighbors.append(node_1)
 
         except FileNotFoundError:
             return False
@@ -72,59 +99,28 @@ class GraphManager:
         """
         Full K-Graph
 
-        All nodes connected to all nodes.
+        All nodes connected to all nodes. The connections are a rule, not n^2 list entries, see ImplicitAdjacency.
         """
-
-        nodes = []
-        for name in range(n):
-            nodes.append(Node(name=str(name + 1)))
-
-        for node in nodes:
-            node.neighbors = [n for n in nodes if n != node]
-
-        new_graph = Graph(name="k" + str(n))
-        new_graph.nodes = nodes
-        return new_graph
+        family = GraphFamily("kn", (n,))
+        return self.graph_from_adjacency(name="k" + str(n), adjacency=ImplicitAdjacency(family),
+                                         node_name=lambda i: str(i + 1), family=family, names_sorted=True)
 
     def generate_knm_graph(self, n: int, m: int):
         """
         Full bipartite graph.
-        All nodes of 'x' get connected to all nodes of 'y'.
+        All nodes of 'x' get connected to all nodes of 'y'. The first n nodes are 'x', connected by a rule.
         """
-
-        left_nodes = []
-        for name in range(n):
-            left_nodes.append(Node(name=str(name + 1)))
-
-        right_nodes = []
-        for name in range(n, m + n):
-            right_node = Node(name=str(name + 1))
-            right_node.neighbors = left_nodes.copy()
-            right_nodes.append(right_node)
-
-        for left_node in left_nodes:
-            left_node.neighbors = right_nodes.copy()
-
-        new_graph = Graph(name=f"k{n},{m}")
-        new_graph.nodes = left_nodes + right_nodes
-
-        return new_graph
+        family = GraphFamily("knm", (n, m))
+        return self.graph_from_adjacency(name=f"k{n},{m}", adjacency=ImplicitAdjacency(family),
+                                         node_name=lambda i: str(i + 1), family=family, names_sorted=True)
 
     def generate_c_graph(self, n):
         """
         Vertices connected by one in front and one in back, cyclical like.
         """
-        nodes = []
-        for name in range(n):
-            nodes.append(Node(name=str(name + 1)))
-
-        for i, node in enumerate(nodes):
-            node.neighbors = [nodes[(i + 1) % len(nodes)], nodes[i - 1]]
-
-        new_graph = Graph(name="c" + str(n))
-        new_graph.nodes = nodes
-
-        return new_graph
+        family = GraphFamily("c", (n,))
+        return self.graph_from_adjacency(name="c" + str(n), adjacency=ImplicitAdjacency(family),
+                                         node_name=lambda i: str(i + 1), family=family, names_sorted=True)
 
     def generate_q_graph(self, n) -> Graph:
         """
@@ -132,92 +128,42 @@ class GraphManager:
         The Qn graph has 2^n vertices and n * 2^(n-1) edges. Each vertex in the graph represents 
         a binary string of length n, where each digit is either 0 or 1, and two vertices are adjacent if 
         and only if their binary strings differ in exactly one position.
-        """
-        nodes = []
-        num_vertices = 2 ** n
-
-        for i in range(num_vertices):
-            name = bin(i)[2:]
-            name = "0" * (n - len(name)) + name
-            nodes.append(Node(name=str(name)))
-
-        for i in range(num_vertices):
-            for j in range(i + 1, num_vertices):
-                node_1 = nodes[i]
-                node_2 = nodes[j]
-                if node_2 in node_1.neighbors:
-                    continue
-                if self.q_has_connection(node_1, node_2):
-                    node_1.neighbors.append(node_2)
-                    node_2.neighbors.append(node_1)
-
-        new_graph = Graph(name="q" + str(n))
-        new_graph.nodes = nodes
 
-        return new_graph
-
-    def q_has_connection(self, node_1, node_2):
-        """
-        Helper function for creating Q-hypercube graph, returns true if names of both nodes only differ by 1
-        bit.
+        Vertex i is named after the bits of i, so flipping one bit is an XOR with a power of two. Neighbors are
+        worked out from that when asked for, the arrays only get built if something needs them, in O(n * 2^n).
+        Same for the names, a node gets its bit string the first time someone looks at it.
         """
-        diff_count = 0
-        for letter in range(len(node_1.name)):
-            if node_1.name[letter] != node_2.name[letter]:
-                diff_count += 1
-            if diff_count > 1:
-                return False
-        return True
+        family = GraphFamily("q", (n,))
+        return self.graph_from_adjacency(name="q" + str(n), adjacency=ImplicitAdjacency(family),
+                                         node_name=lambda i: format(i, f"0{n}b"), family=family, names_sorted=True)
 
     def generate_petersen_graph(self):
-        k5 = self.generate_kn_graph(n=5)
-        c5 = self.generate_c_graph(n=5)
-        new_graph = Graph(name="petersen")
-
+        # Outer cycle c0 to c4, inner star k0 to k4 (every second one), spokes from ci to ki
+        first, second = [], []
         for i in range(5):
-            k_node = k5.nodes[i]
-            k_node.neighbors.remove(k5.nodes[i - 1])
-            k_node.neighbors.remove(k5.nodes[(i + 1) % 5])
-            c_node = c5.nodes[i]
-            k_node.name = f"k{i}"
-            c_node.name = f"c{i}"
-            k_node.neighbors.append(c_node)
-            c_node.neighbors.append(k_node)
-
-            new_graph.nodes.append(k_node)
-            new_graph.nodes.append(c_node)
-        return new_graph
+            first += [i, 5 + i, i]
+            second += [(i + 1) % 5, 5 + (i + 2) % 5, 5 + i]
+        return self.graph_from_edges(name="petersen", n=10, first=first, second=second,
+                                     node_name=lambda i: f"{'ck'[i // 5]}{i % 5}", family=GraphFamily("petersen"),
+                                     names_sorted=True)
 
-    def generate_kmecki_random_graph(self, n: int, e: int):
+    def generate_kmecki_random_graph(self, n: int, e: int, seed: Optional[int] = None):
         """
         Generate an Erdos-Renyi random graph, take a number of nodes and edges and
-        randomly throw them in the graph. The "Kmecki"-way
+        randomly throw them in the graph. The "Kmecki"-way, G(n, m) to the mathematicians.
+        Never the same pair twice and about as long as there are nodes and edges, see RandomEdges.
 
         Parameters:
             - n (int): number of nodes
-            - e (int): number of edges
+            - e (int): number of edges, as many as there are pairs of nodes at most
+            - seed (int) (optional): to get the same graph again
 
         Returns:
              - Graph
         """
-        new_graph = Graph(name=f"random-{len([g for g in self.graphs if g.name[:6] == 'random'])}-kmecki")
-
-        for node_name in range(n):
-            new_node = Node(name=str(node_name))
-            new_graph.nodes.append(new_node)
-
-        edges = []
-        if e > (n ** 2 - n) // 2:
-            e = (n ** 2 - n) // 2
-
-        for edge in range(e):
-            new_edge = random.sample(new_graph.nodes, k=2)
-            while set(new_edge) in edges:
-                new_edge = random.sample(new_graph.nodes, k=2)
-            edges.append(set(new_edge))
-            new_edge[0].neighbors.append(new_edge[1])
-            new_edge[1].neighbors.append(new_edge[0])
-        return new_graph
+        first, second = RandomEdges(seed=seed).gnm(n, e)
+        return self.graph_from_edges(name=f"random-{len([g for g in self.graphs if g.name[:6] == 'random'])}-kmecki",
+                                     n=n, first=first, second=second)
 
     def generate_math_random_graph(self, n: int, p: int):
         """
@@ -226,126 +172,107 @@ class GraphManager:
 
         Parameters:
             - n (int): number of nodes
-            - p (int): probability of an edge, compared to a random integer between 0 and 100
+            - p (int): probability of an edge in percent
 
         Returns:
              - Graph
         """
-        new_graph = Graph(name=f"random-{len([g for g in self.graphs if g.name[:6] == 'random'])}-math")
-
-        for node_name in range(n):
-            new_node = Node(name=str(node_name))
-            new_graph.nodes.append(new_node)
-
-        for i, first_node in enumerate(new_graph.nodes):
-            for j in range(i + 1, len(new_graph.nodes)):
-                second_node = new_graph.nodes[j]
-                if random.randint(0, 100) <= p:
-                    first_node.neighbors.append(second_node)
-                    second_node.neighbors.append(first_node)
-        return new_graph
+        return self.generate_gnp_graph(n=n, p=p / 100)
 
-    def generate_small_world_graph(self, n: int, p: int):
+    def generate_gnp_graph(self, n: int, p: float, seed: Optional[int] = None):
         """
-        Generate a small-world graph, by taking a cycle of n nodes (Cn), add connections to nodes 1 step away.
-        Then using a p in 100,000 probability go through each edge and reconnect if the dice falls its way.
+        Erdos-Renyi G(n, p), every pair of nodes connected with probability p. Skips from edge to edge instead
+        of deciding on every pair, so it takes about as long as there are nodes and edges, see RandomEdges.
 
         Parameters:
             - n (int): number of nodes
-            - p (int): probability of an edge reconnection, compared to a random integer between 0 and 100.
+            - p (float): probability of an edge, between 0 and 1
+            - seed (int) (optional): to get the same graph again
 
         Returns:
              - Graph
         """
-        new_graph = self.generate_c_graph(n=n)
-        new_graph.name = f"random-{len([g for g in self.graphs if g.name[:6] == 'random'])}-smallworld"
-
-        # Create a densely packed cyclic graph
-        for i, node in enumerate(new_graph.nodes):
-            node_neighbor = new_graph.nodes[(i + 2) % n]
-            if node == node_neighbor or node_neighbor in node.neighbors:
-                continue
-            if node in node_neighbor.neighbors:
-                raise Exception("WTF!!!")
-            node.neighbors.append(node_neighbor)
-            node_neighbor.neighbors.append(node)
-
-        # Shuffling connections
-        connections = []
-        for main_node in new_graph.nodes:
-            for neighbor in main_node.neighbors:
-                if {main_node, neighbor} not in connections:
-                    connections.append({main_node, neighbor})
-
-        for connection in connections:
-            if p >= random.randint(0, 100):
-                nodes = list(connection)
-                nodes[0].neighbors.remove(nodes[1])
-                nodes[1].neighbors.remove(nodes[0])
-
-                rand_node = random.choice(new_graph.nodes)
-                while rand_node == nodes[0] or rand_node == nodes[1]:
-                    rand_node = random.choice(new_graph.nodes)
-                nodes[0].neighbors.append(rand_node)
-                rand_node.neighbors.append(nodes[0])
+        first, second = RandomEdges(seed=seed).gnp(n, p)
+        return self.graph_from_edges(name=f"random-{len([g for g in self.graphs if g.name[:6] == 'random'])}-math",
+                                     n=n, first=first, second=second)
+
+    def graph_from_edges(self, name: str, n: int, first: Sequence[int], second: Sequence[int],
+                         node_name: Callable[[int], str] = str, family: Optional[GraphFamily] = None,
+                         names_sorted: bool = False) -> Graph:
+        """
+        Nodes named by their index (0 to n - 1, unless node_name says otherwise) and the edges packed straight
+        into the Adjacency arrays, no neighbor lists.
+        """
+        return self.graph_from_adjacency(name=name, adjacency=Adjacency.from_edges(n, first, second),
+                                         node_name=node_name, family=family, names_sorted=names_sorted)
 
+    def graph_from_adjacency(self, name: str, adjacency: Adjacency, node_name: Callable[[int], str] = str,
+                             family: Optional[GraphFamily] = None, names_sorted: bool = False) -> Graph:
+        """
+        A graph around connections that are already packed, a node for every row named by node_name(row). The
+        names are made when asked for, a hypercube has a lot of nodes nobody looks at by name. If node_name
+        gives them in sorted order (names_sorted), sorting the nodes by name won't make them either.
+        """
+        new_graph = Graph(name=name)
+        new_graph.node_name = node_name
+        new_graph.nodes = [Node(name=None) for _ in range(adjacency.node_count)]
+        new_graph.names_sorted = names_sorted
+        new_graph.family = family  # Before the adjacency, that is when it gets checked
+        new_graph.set_adjacency(adjacency)
         return new_graph
 
-    def generate_scalefree_graph(self, n: int, m0: int, m: int):
+    def generate_small_world_graph(self, n: int, p: int, k: int = 2, seed: Optional[int] = None):
+        """
+        Generate a small-world graph, by taking a cycle of n nodes (Cn) and connecting every node to the ones up to
+        k steps away. Then go through each edge and reconnect one end of it if the dice falls its way.
+        Watts and Strogatz, O(nk), see RandomEdges.
+
+        Parameters:
+            - n (int): number of nodes
+            - p (int): probability of an edge reconnection in percent
+            - k (int): neighbors on either side of a node in the cycle
+            - seed (int) (optional): to get the same graph again
+
+        Returns:
+             - Graph
+        """
+        first, second = RandomEdges(seed=seed).watts_strogatz(n=n, k=k, beta=p / 100)
+        return self.graph_from_edges(
+            name=f"random-{len([g for g in self.graphs if g.name[:6] == 'random'])}-smallworld",
+            n=n, first=first, second=second, node_name=lambda i: str(i + 1))
+
+    def generate_scalefree_graph(self, n: int, m0: int, m: int, seed: Optional[int] = None):
         """
         Scale-free graph as explained by Barabasi and Albert just before Y2K ended the digital age.
 
-        Creates a "clique", or a complete graph of m0 nodes, then add new nodes until "n" nodes are reached.
+        Creates a "clique", or a complete graph of m0 nodes, then add n new nodes to it.
 
         Connect every new node to m existing nodes already present in the graph. The probability of connecting
         to a specific existing node depends on its degree with higher degree nodes having a higher probability
-        of being selected for the connection.
+        of being selected for the connection. Picked from a pool of edge ends, O(m) per node, see RandomEdges.
 
         Parameters:
-            - n (int): number of nodes needed to complete the graph
+            - n (int): number of nodes added to the starting graph
             - m0 (int): size of starting graph, Km0
             - m (int): number of connections for each new node added
+            - seed (int) (optional): to get the same graph again
 
         Returns:
             - Graph: a scale free one, at that
         """
+        first, second = RandomEdges(seed=seed).barabasi_albert(n=n, m0=m0, m=m)
+        return self.graph_from_edges(
+            name=f"random-{len([g for g in self.graphs if g.name[:6] == 'random'])}-scalefree",
+            n=m0 + n, first=first, second=second, node_name=lambda i: str(i + 1))
 
-        new_graph = self.generate_kn_graph(n=m0)
-        new_graph.name = f"random-{len([g for g in self.graphs if g.name[:6] == 'random'])}-scalefree"
-        new_graph.set_node_degrees()
-
-        for i in range(n):
-            new_node = Node(name=str(len(new_graph.nodes) + 1))
-            connections = self.scale_free_selection(graph=new_graph, m=m)
-            for conn in connections:
-                new_node.neighbors.append(conn)
-                conn.neighbors.append(new_node)
-            new_graph.nodes.append(new_node)
-            new_graph.set_node_degrees()
-
-        return new_graph
-
-    def scale_free_selection(self, graph: Graph, m: int):
-        # Pick based on the nodes degree normalized to the total degree
-        probabilities = [node.degree / graph.total_degree for node in graph.nodes]
-
-        # Commented out the weighted probabilities, it did not work as well
-        # scaled_weights = [(node.degree / graph.max_degree) ** 2 for node in graph.nodes]
-        # probabilities = [weight / sum(scaled_weights) for weight in scaled_weights]
-
-        selected_nodes = set()
-        while len(selected_nodes) < m:
-            selected_node = random.choices(graph.nodes, weights=probabilities, k=1)[0]
-            selected_nodes.add(selected_node)
-        return list(selected_nodes)
-
-    def generate_graph(self, g_type: str, numeric_args: Union[int, List[int], None] = None) -> bool:
+    def generate_graph(self, g_type: str, numeric_args: Union[int, List[Union[int, float]], None] = None) -> bool:
         """
         Saves the graph we are generating as the current graph, if successful
 
         Parameters:
             - g_type (string): the type of graph we are making (hypercube, cycle, complete, petersen, natural)
             - numeric_args (int) (List of ints): integer or list of integers, needed to successfully generate a graph
+                                                 (p of "gnp" is a float)
 
         Returns:
              - True: if successful
@@ -380,10 +307,14 @@ class GraphManager:
         if g_type == "mr":
             new_graph = self.generate_math_random_graph(n=numeric_args[0], p=numeric_args[1])
 
+        if g_type == "gnp":
+            new_graph = self.generate_gnp_graph(n=numeric_args[0], p=numeric_args[1])
+
         if g_type == "sw":
             if numeric_args[0] <= 2:
                 return False
-            new_graph = self.generate_small_world_graph(n=numeric_args[0], p=numeric_args[1])
+            new_graph = self.generate_small_world_graph(n=numeric_args[0], p=numeric_args[1],
+                                                        k=numeric_args[2] if len(numeric_args) > 2 else 2)
 
         if g_type == "sf":
             new_graph = self.generate_scalefree_graph(n=numeric_args[0], m0=numeric_args[1], m=numeric_args[2])
@@ -395,17 +326,20 @@ class GraphManager:
         self.current_graph = new_graph
         return True
 
-    def analyze_graph(self, sm, graph: Graph = None):
+    def analyze_graph(self, sm, graph: Graph = None, workers: Optional[int] = None):
         """
         After loading or generating a new graph, perform all analysis possible on it.
 
         Parameter:
             - sm (StringManager): passed in to help with the printing to terminal
             - graph (Graph) (optional): if passed in use it instead of the current graph
+            - workers (int) (optional): number of processes for paths and betweeness, self.workers if not set
 
         Returns:
             - None
         """
+        if workers is None:
+            workers = self.workers
 
         analyze_recursively = False
         if graph is None:
@@ -429,6 +363,7 @@ class GraphManager:
         total = len(what_to_do)
 
         graph.sort_nodes_by_name()
+        graph.build_adjacency()
         for i, analysis in enumerate(what_to_do):
             if i == 0:
                 sm.print_progress(current=i, total=total, flavour_text=analysis)
@@ -436,7 +371,8 @@ class GraphManager:
 
             if i == 1:
                 sm.print_progress(current=i, total=total, flavour_text=analysis)
-                graph.set_adjacency_matrix()
+                if len(graph.nodes) <= self.adjacency_matrix_max_nodes:
+                    graph.set_adjacency_matrix()
 
             elif i == 2:
                 sm.print_progress(current=i, total=total, flavour_text=analysis)
@@ -448,11 +384,21 @@ class GraphManager:
 
             elif i == 4:
                 sm.print_progress(current=i, total=total, flavour_text=analysis)
-                graph.calculate_shortest_paths_for_all_nodes()
+                if graph.family is None and len(graph.nodes) > self.approximate_betweeness_above:
+                    graph.approximate_shortest_paths(epsilon=self.paths_epsilon,
+                                                     delta=self.paths_delta,
+                                                     time_budget=self.paths_time_budget)
+                else:
+                    graph.calculate_shortest_paths_for_all_nodes(workers=workers)
 
             elif i == 5:
                 sm.print_progress(current=i, total=total, flavour_text=analysis)
-                graph.analyze_betweeness_centrality()
+                if graph.family is None and len(graph.nodes) > self.approximate_betweeness_above:
+                    graph.approximate_betweeness_centrality(epsilon=self.betweeness_epsilon,
+                                                            delta=self.betweeness_delta,
+                                                            time_budget=self.betweeness_time_budget)
+                else:
+                    graph.analyze_betweeness_centrality(workers=workers)
 
             elif i == 6:
                 sm.print_progress(current=i, total=total, flavour_text=analysis)
@@ -464,9 +410,7 @@ class GraphManager:
 
             elif i == 8:
                 sm.print_progress(current=i, total=total, flavour_text=analysis)
-                if len(graph.nodes) > 50:
-                    continue
-                graph.analyze_hamilton()
+                graph.analyze_hamilton(time_budget=self.hamilton_time_budget)
 
             elif i == 9:
                 sm.print_progress(current=i, total=total, flavour_text=analysis)
@@ -474,7 +418,14 @@ class GraphManager:
 
             elif i == 10:
                 sm.print_progress(current=i, total=total, flavour_text=analysis)
-                graph.analyze_communities()
+                if graph.family is not None:
+                    graph.analyze_family_communities()
+                elif len(graph.nodes) > self.label_communities_above:
+                    graph.analyze_label_communities(workers=workers)
+                elif len(graph.nodes) > self.modularity_communities_above:
+                    graph.analyze_modularity_communities()
+                else:
+                    graph.analyze_communities()
 
         graph.analyzed = True
 
@@ -0,0 +1,417 @@
+import random
+import time
+from typing import List, Optional, Set
+
+from classes.Adjacency import Adjacency
+from classes.BipartiteColoring import BipartiteColoring
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class HamiltonSearch:
+    """
+    *** Hamilton Search Class ***
+
+    No surefire quick way to find a Hamilton path or circuit exists, so this throws a few tricks at it, cheapest
+    first:
+
+        1. Checks that rule it out straight away: more than 2 nodes of degree 1 (0 for a circuit) and cut vertices.
+           A Hamilton path through a node can only leave 2 pieces behind once the node is gone, a circuit only 1.
+           A path in a bipartite graph takes turns between the sides, so they can't differ by more than 1 node,
+           for a circuit they have to be equal. All of them are passes over the Adjacency arrays.
+        2. Small graphs get Held-Karp: for every set of nodes, as a bitmask, the nodes a path over exactly that
+           set can end in. O(2^n * n), but it always has the answer.
+        3. Bigger graphs first get a few rounds of Posa rotations. Grow a path greedily and when it gets stuck,
+           use an edge from its end back into the path to flip the tail around and get a new end. Quick to find
+           one in graphs that have lots of them, useless at proving there are none.
+        4. Backtracking over bitmask visited sets. Nodes of degree 2 force both of their edges into a circuit,
+           every step checks that the unvisited nodes can still be reached from the end of the path and that none
+           of them is left with too few free neighbors to get in and out. Only up to backtrack_limit nodes, the
+           bitmasks take n^2 / 8 bytes and past that backtracking would not get anywhere in time anyway.
+
+    All of it runs on a clock, half of the time budget for the path and whatever it left over (half at least) for
+    the circuit. Should the time run out before we know, the answer is unknown rather than no, instead of the
+    search hanging forever.
+
+    Attributes:
+        - adjacency (Adjacency): connections of the graph.
+        - time_budget (float): seconds for the path and the circuit together, None for no limit.
+        - neighbor_masks (List[int]): neighbors of every node as a bitmask, only built for Held-Karp and backtracking.
+        - path_unknown (bool): find_path ran out of time.
+        - circuit_unknown (bool): find_circuit ran out of time.
+
+    Methods:
+        - find_path: node indices of a Hamilton path or None.
+        - find_circuit: node indices of a Hamilton circuit, without the first node repeated at the end, or None.
+    """
+
+    held_karp_limit = 14  # Up to this many nodes the exact bitmask DP is quicker than anything clever
+    rotation_rounds = 8  # Posa restarts before giving up and backtracking
+    rotation_steps = 20  # Posa steps per node, per round
+    backtrack_limit = 2000  # Nodes at most for the bitmasks, 500 kB of them
+
+    def __init__(self, adjacency: Adjacency, time_budget: Optional[float] = None, seed: Optional[int] = None):
+        """
+        Parameters:
+            - adjacency (Adjacency): connections of the graph.
+            - time_budget (float) (optional): seconds for the path and the circuit together, no limit if not set.
+            - seed (int) (optional): seed for the random starts of the rotations.
+        """
+        self.adjacency: Adjacency = adjacency
+        self.random: random.Random = random.Random(seed)
+        self.time_budget: Optional[float] = time_budget
+        self.path_unknown: bool = False
+        self.circuit_unknown: bool = False
+
+        self.neighbor_masks: Optional[List[int]] = None
+        self._full = (1 << adjacency.node_count) - 1
+        self._deadline: Optional[float] = None
+        self._path_time: float = 0.0
+        self._ticks = 0
+        self._pieces: Optional[List[int]] = None
+        self._side_difference: Optional[int] = None
+
+    def find_path(self) -> Optional[List[int]]:
+        n = self.adjacency.node_count
+        if n == 0:
+            return None
+        if not self._connected() or sum(self.adjacency.degree(i) == 1 for i in range(n)) > 2:
+            return None
+        if max(self._get_pieces()) > 2 or self._get_side_difference() > 1:
+            return None
+
+        started = self._start_clock(None if self.time_budget is None else self.time_budget / 2)
+        try:
+            if n <= self.held_karp_limit:
+                return self._held_karp(circuit=False)
+            ends = [i for i in range(n) if self.adjacency.degree(i) == 1]
+            path = self._rotate(circuit=False, starts=ends)
+            if path is not None:
+                return path
+            if n > self.backtrack_limit:
+                self.path_unknown = True
+                return None
+            # With a node of degree 1 the path has to start or end there, otherwise try them all
+            starts = ends[:1] if ends else sorted(range(n), key=self.adjacency.degree)
+            for start in starts:
+                path = self._backtrack(start, circuit=False)
+                if path is not None:
+                    return path
+        except _OutOfTime:
+            self.path_unknown = True
+        finally:
+            self._path_time = time.perf_counter() - started
+        return None
+
+    def find_circuit(self, path: Optional[List[int]] = None) -> Optional[List[int]]:
+        """
+        Parameters:
+            - path (List[int]) (optional): Hamilton path found before, if its ends are neighbors it closes.
+        """
+        n = self.adjacency.node_count
+        if n < 3 or (path is None and not self.path_unknown):  # No path, no circuit
+            return None
+        if path is not None and self.adjacency.has_edge(path[-1], path[0]):
+            return path
+        if min(self.adjacency.degree(i) for i in range(n)) < 2 or max(self._get_pieces()) > 1:
+            return None
+        if self._get_side_difference() > 0:
+            return None
+
+        forced = self._get_forced_edges()
+        if forced is None:
+            return None
+
+        # Whatever the path search left of the budget, but never less than half
+        self._start_clock(None if self.time_budget is None else max(self.time_budget - self._path_time,
+                                                                    self.time_budget / 2))
+        try:
+            if n <= self.held_karp_limit:
+                return self._held_karp(circuit=True)
+            circuit = self._rotate(circuit=True, starts=[])
+            if circuit is not None:
+                return circuit
+            if n > self.backtrack_limit:
+                self.circuit_unknown = True
+                return None
+            # Every node is on a circuit, the one with the fewest choices is the best place to start
+            forced_masks = [sum(1 << j for j in neighbors) for neighbors in forced]
+            return self._backtrack(min(range(n), key=self.adjacency.degree), circuit=True, forced=forced_masks)
+        except _OutOfTime:
+            self.circuit_unknown = True
+        return None
+
+    def _start_clock(self, seconds: Optional[float]) -> float:
+        now = time.perf_counter()
+        self._deadline = None if seconds is None else now + seconds
+        return now
+
+    def _check_time(self):
+        self._ticks += 1
+        if self._deadline is not None and self._ticks % 256 == 0 and time.perf_counter() > self._deadline:
+            raise _OutOfTime
+
+    def _get_masks(self) -> List[int]:
+        # Neighbors of every node as a bitmask, for the searches that go through sets of nodes
+        if self.neighbor_masks is None:
+            self.neighbor_masks = []
+            for i in range(self.adjacency.node_count):
+                mask = 0
+                for j in self.adjacency.neighbors(i):
+                    mask |= 1 << j
+                self.neighbor_masks.append(mask)
+        return self.neighbor_masks
+
+    def _connected(self) -> bool:
+        # Breadth first over the arrays from node 0
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+        seen = bytearray(self.adjacency.node_count)
+        seen[0] = 1
+        queue = [0]
+        for i in queue:
+            for slot in range(offsets[i], offsets[i + 1]):
+                if not seen[targets[slot]]:
+                    seen[targets[slot]] = 1
+                    queue.append(targets[slot])
+        return len(queue) == self.adjacency.node_count
+
+    def _reach(self, start_mask: int, allowed: int) -> int:
+        # Bitmask of the allowed nodes that can be reached from the start ones
+        reached = frontier = start_mask
+        while frontier:
+            grown = 0
+            while frontier:
+                low = frontier & -frontier
+                grown |= self.neighbor_masks[low.bit_length() - 1]
+                frontier ^= low
+            frontier = grown & allowed & ~reached
+            reached |= frontier
+        return reached
+
+    def _get_side_difference(self) -> int:
+        # How many more nodes one side of a connected bipartite graph has than the other, 0 if not bipartite
+        if self._side_difference is None:
+            coloring = BipartiteColoring(self.adjacency)
+            if coloring.color([[0]]):
+                ones = sum(coloring.side)
+                self._side_difference = abs(self.adjacency.node_count - 2 * ones)
+            else:
+                self._side_difference = 0
+        return self._side_difference
+
+    def _get_pieces(self) -> List[int]:
+        """
+        Number of pieces the graph falls apart into without each node, Tarjan's low links on an iterative
+        depth first search. 1 for nodes that are not cut vertices.
+        """
+        if self._pieces is not None:
+            return self._pieces
+
+        n = self.adjacency.node_count
+        discovered, low = [-1] * n, [0] * n
+        pieces = [1] * n
+        counter = 0
+        for root in range(n):
+            if discovered[root] != -1:
+                continue
+            discovered[root] = low[root] = counter
+            counter += 1
+            root_children = 0
+            stack = [(root, -1, iter(self.adjacency.neighbors(root)))]
+            while stack:
+                node, parent, neighbors = stack[-1]
+                for neighbor in neighbors:
+                    if discovered[neighbor] == -1:
+                        discovered[neighbor] = low[neighbor] = counter
+                        counter += 1
+                        stack.append((neighbor, node, iter(self.adjacency.neighbors(neighbor))))
+                        break
+                    if neighbor != parent:
+                        low[node] = min(low[node], discovered[neighbor])
+                else:
+                    stack.pop()
+                    if parent == -1:
+                        continue
+                    low[parent] = min(low[parent], low[node])
+                    if parent == root:
+                        root_children += 1
+                    elif low[node] >= discovered[parent]:
+                        pieces[parent] += 1
+            pieces[root] = max(root_children, 1)
+
+        self._pieces = pieces
+        return pieces
+
+    def _get_forced_edges(self) -> Optional[List[Set[int]]]:
+        """
+        A node of degree 2 has to use both of its edges in a circuit. Returns the forced neighbors of every node,
+        or None if some node ends up with more than 2 of them.
+        """
+        n = self.adjacency.node_count
+        forced = [set() for _ in range(n)]
+        for i in range(n):
+            if self.adjacency.degree(i) == 2:
+                for j in self.adjacency.neighbors(i):
+                    forced[i].add(j)
+                    forced[j].add(i)
+        if any(len(neighbors) > 2 for neighbors in forced):
+            return None
+        return forced
+
+    def _held_karp(self, circuit: bool) -> Optional[List[int]]:
+        """
+        ends[mask] has a bit for every node that a path over exactly the nodes of mask can end in. Circuits all
+        start from node 0 and need an end next to it.
+        """
+        n = self.adjacency.node_count
+        masks = self._get_masks()
+        ends = [0] * (1 << n)
+        if circuit:
+            ends[1] = 1
+        else:
+            for i in range(n):
+                ends[1 << i] = 1 << i
+
+        for mask in range(1, 1 << n):
+            mask_ends = ends[mask]
+            if mask_ends == 0:
+                continue
+            self._check_time()
+            for i in range(n):
+                bit = 1 << i
+                if not mask & bit and masks[i] & mask_ends:
+                    ends[mask | bit] |= bit
+
+        last_ends = ends[self._full] & (masks[0] if circuit else self._full)
+        if last_ends == 0:
+            return None
+
+        # Walk back through the table, any end that fits will do
+        current = (last_ends & -last_ends).bit_length() - 1
+        mask = self._full
+        path = [current]
+        while mask != 1 << current:
+            mask ^= 1 << current
+            previous = ends[mask] & masks[current]
+            current = (previous & -previous).bit_length() - 1
+            path.append(current)
+        return path[::-1]
+
+    def _rotate(self, circuit: bool, starts: List[int]) -> Optional[List[int]]:
+        """
+        Posa rotations. A path that can't grow any more from its end v, but v has a neighbor w inside the path,
+        turns into a new path by reversing everything after w, v's neighbor is now the end. Random choices and a
+        few restarts keep it from going around in circles.
+
+        Parameters:
+            - circuit (bool): the ends of the full path have to be neighbors.
+            - starts (List[int]): nodes the path has to start from, any if empty.
+        """
+        n = self.adjacency.node_count
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+        for _ in range(self.rotation_rounds):
+            start = self.random.choice(starts) if starts else self.random.randrange(n)
+            path = [start]
+            position = [-1] * n
+            position[start] = 0
+
+            for _ in range(self.rotation_steps * n):
+                self._check_time()
+                end = path[-1]
+                neighbors = targets[offsets[end]:offsets[end + 1]]
+                free = [j for j in neighbors if position[j] == -1]
+                if free:
+                    # Warnsdorff's rule, the neighbor with the fewest ways out goes first
+                    ways_out = [sum(position[targets[slot]] == -1 for slot in range(offsets[j], offsets[j + 1]))
+                                for j in free]
+                    fewest = min(ways_out)
+                    picked = self.random.choice([j for j, ways in zip(free, ways_out) if ways == fewest])
+                    position[picked] = len(path)
+                    path.append(picked)
+                    continue
+
+                if len(path) == n and (not circuit or self.adjacency.has_edge(end, path[0])):
+                    return path
+
+                pivots = [position[j] for j in neighbors if position[j] < len(path) - 2]
+                if not pivots:
+                    break
+                pivot = self.random.choice(pivots)
+                path[pivot + 1:] = path[:pivot:-1]
+                for i in range(pivot + 1, len(path)):
+                    position[path[i]] = i
+        return None
+
+    def _backtrack(self, start: int, circuit: bool, forced: Optional[List[int]] = None) -> Optional[List[int]]:
+        n = self.adjacency.node_count
+        masks = self._get_masks()
+        path = [start]
+        visited = 1 << start
+        stack = [self._next_steps(path, visited, circuit, forced)]
+        while stack:
+            if not stack[-1]:
+                stack.pop()
+                visited &= ~(1 << path.pop())
+                continue
+            self._check_time()
+            step = stack[-1].pop()
+            path.append(step)
+            visited |= 1 << step
+
+            if len(path) == n:
+                if not circuit or masks[step] >> start & 1:
+                    return path
+            elif self._feasible(path, visited, circuit):
+                stack.append(self._next_steps(path, visited, circuit, forced))
+                continue
+            path.pop()
+            visited &= ~(1 << step)
+        return None
+
+    def _next_steps(self, path: List[int], visited: int, circuit: bool, forced: Optional[List[int]]) -> List[int]:
+        # Unvisited neighbors of the end, the one with the fewest free neighbors last so it is popped first
+        end = path[-1]
+        free = self.neighbor_masks[end] & ~visited
+        if forced is not None:
+            must = forced[end] & ~(1 << path[-2] if len(path) > 1 else 0)
+            if must & visited:  # A forced edge back into the path, the circuit can't be closed there yet
+                return []
+            if must:
+                free &= must
+
+        steps = []
+        while free:
+            low = free & -free
+            steps.append(low.bit_length() - 1)
+            free ^= low
+        steps.sort(key=lambda j: bin(self.neighbor_masks[j] & ~visited).count("1"), reverse=True)
+        return steps
+
+    def _feasible(self, path: List[int], visited: int, circuit: bool) -> bool:
+        """
+        Can the unvisited nodes still make it on the path? Each needs 2 free neighbors to get in and out of, the
+        end and for a circuit the start count too. A path may have a single node with only 1, its last node, but
+        not if that 1 is the current end and there is more to visit. And they all have to be reachable from the end.
+        """
+        end_bit = 1 << path[-1]
+        remaining = self._full & ~visited
+        allowed = remaining | end_bit | (1 << path[0] if circuit else 0)
+        more_than_one = remaining & (remaining - 1) != 0
+
+        last_nodes = 0
+        left = remaining
+        while left:
+            low = left & -left
+            left ^= low
+            free = self.neighbor_masks[low.bit_length() - 1] & allowed
+            if free & (free - 1):  # 2 or more
+                continue
+            if free == 0 or circuit:
+                return False
+            last_nodes += 1
+            if last_nodes > 1 or (free == end_bit and more_than_one):
+                return False
+
+        return self._reach(end_bit, remaining | end_bit) == remaining | end_bit
@@ -0,0 +1,139 @@
+from array import array
+from typing import Optional
+
+from classes.Adjacency import Adjacency
+from classes.GraphFamily import GraphFamily
+
+
+class ImplicitAdjacency(Adjacency):
+    """
+    *** Implicit Adjacency Class ***
+
+    Connections of a complete graph, complete bipartite graph, cycle or hypercube, worked out from a rule instead
+    of stored. Kn has n(n - 1) neighbors to list, K10000 alone would be 10^8 slots before any analysis starts,
+    while the rule takes a couple of numbers. Node indices are the ones the generators give:
+        - Kn: everyone but i.
+        - Kn,m: left nodes 0 to n - 1 see all of n to n + m - 1, right nodes see all of 0 to n - 1.
+        - Cn: i - 1 and i + 1 around the cycle.
+        - Qn: i XOR 2^b for every bit b.
+
+    Rows are as long as the degree and in order of the index, so a row starts at a multiple of the degree
+    (Kn,m: of m, then of n past the left nodes). Slots are the same as in the packed arrays, anything kept
+    next to them lines up either way.
+
+    Same methods as Adjacency. Neighbors, degrees, has_edge and edge_slot come from the rule. Whatever walks the
+    offsets and targets arrays themselves, or changes them, gets them built on first touch by materialize, and
+    from then on everything is read from those.
+
+    Attributes:
+        - family (GraphFamily): which rule, "kn", "knm", "c" or "q", and its parameters.
+
+    Methods:
+        - materialize: the Adjacency arrays, built once.
+    """
+
+    kinds = ("kn", "knm", "c", "q")
+
+    def __init__(self, family: GraphFamily):
+        if family.kind not in self.kinds:
+            raise ValueError(f"No rule for the connections of: {family.kind}")
+        self.family: GraphFamily = family
+        self._adjacency: Optional[Adjacency] = None
+
+    @property
+    def offsets(self) -> array:
+        return self.materialize().offsets
+
+    @property
+    def targets(self) -> array:
+        return self.materialize().targets
+
+    @property
+    def node_count(self) -> int:
+        if self.family.kind == "knm":
+            return self.family.parameters[0] + self.family.parameters[1]
+        if self.family.kind == "q":
+            return 2 ** self.family.parameters[0]
+        return self.family.parameters[0]
+
+    @property
+    def edge_count(self) -> int:
+        if self._adjacency is not None:
+            return self._adjacency.edge_count
+        return self._row_start(self.node_count) // 2
+
+    def materialize(self) -> Adjacency:
+        if self._adjacency is None:
+            if self.family.kind == "q":
+                self._adjacency = Adjacency.hypercube(self.family.parameters[0])
+            else:
+                n = self.node_count
+                offsets = array("l", [self._row_start(i) for i in range(n + 1)])
+                targets = array("i")
+                for i in range(n):
+                    targets.extend(self.neighbors(i))
+                self._adjacency = Adjacency(offsets, targets)
+        return self._adjacency
+
+    def neighbors(self, i: int) -> array:
+        if self._adjacency is not None:
+            return self._adjacency.neighbors(i)
+        kind, n = self.family.kind, self.family.parameters[0]
+        if kind == "kn":
+            row = array("i", range(i))
+            row.extend(range(i + 1, n))
+            return row
+        if kind == "knm":
+            return array("i", range(n, n + self.family.parameters[1]) if i < n else range(n))
+        if kind == "c":
+            return array("i", sorted({(i - 1) % n, (i + 1) % n} - {i}))  # C1 and C2 have less of a cycle
+        return array("i", sorted(i ^ (1 << b) for b in range(n)))
+
+    def degree(self, i: int) -> int:
+        if self._adjacency is not None:
+            return self._adjacency.degree(i)
+        return self._row_start(i + 1) - self._row_start(i)
+
+    def has_edge(self, i: int, j: int) -> bool:
+        if self._adjacency is not None:
+            return self._adjacency.has_edge(i, j)
+        kind, n = self.family.kind, self.family.parameters[0]
+        if kind == "kn":
+            return i != j
+        if kind == "knm":
+            return (i < n) != (j < n)
+        if kind == "c":
+            return i != j and (j - i) % n in (1, n - 1)
+        bits = i ^ j
+        return bits != 0 and bits & (bits - 1) == 0  # A single bit apart
+
+    def edge_slot(self, i: int, j: int) -> int:
+        if self._adjacency is not None:
+            return self._adjacency.edge_slot(i, j)
+        if not self.has_edge(i, j):
+            return -1
+        kind, n = self.family.kind, self.family.parameters[0]
+        if kind == "kn":
+            return self._row_start(i) + j - (j > i)
+        if kind == "knm":
+            return self._row_start(i) + (j - n if i < n else j)
+        return self._row_start(i) + self.neighbors(i).index(j)
+
+    def copy(self) -> Adjacency:
+        # Nothing stored to copy until it is materialized
+        return ImplicitAdjacency(self.family) if self._adjacency is None else self._adjacency.copy()
+
+    def remove_edge(self, i: int, j: int):
+        self.materialize().remove_edge(i, j)
+
+    def _row_start(self, i: int) -> int:
+        # Where row i starts, the sum of the degrees before it
+        kind, n = self.family.kind, self.family.parameters[0]
+        if kind == "knm":
+            m = self.family.parameters[1]
+            return i * m if i <= n else n * m + (i - n) * n
+        if kind == "kn":
+            return i * max(n - 1, 0)
+        if kind == "c":
+            return i * min(n - 1, 2)
+        return i * n
@@ -0,0 +1,150 @@
+import random
+from typing import Dict, List, Optional, Sequence, Union
+
+from classes.Adjacency import Adjacency
+from classes.WorkerPool import WorkerPool, get_worker_adjacency
+
+
+def _relabel(adjacency: Adjacency, labels: Union[List[int], Dict[int, int]], classes: Sequence[Sequence[int]],
+             rng: random.Random) -> int:
+    """
+    One round over the nodes, a color class at a time. Nodes of a class are never neighbors, so relabeling them
+    one after the other is the same as all at once. Every node takes the label most of its neighbors have,
+    keeping its own if that is one of them, otherwise a random one of them.
+
+    Returns:
+        - int: number of nodes that changed their label.
+    """
+    offsets, targets = adjacency.offsets, adjacency.targets
+    changes = 0
+    for color_class in classes:
+        for i in color_class:
+            if offsets[i] == offsets[i + 1]:
+                continue
+            counts = {}
+            for slot in range(offsets[i], offsets[i + 1]):
+                label = labels[targets[slot]]
+                counts[label] = counts.get(label, 0) + 1
+
+            most = max(counts.values())
+            if counts.get(labels[i], 0) == most:
+                continue
+            labels[i] = rng.choice([label for label, count in counts.items() if count == most])
+            changes += 1
+    return changes
+
+
+def _relabel_block(labels: Dict[int, int], classes: List[List[int]], seed: int):
+    # Runs in a worker: a round over a block of nodes, with the labels of its neighbors outside as they were
+    changes = _relabel(get_worker_adjacency(), labels, classes, random.Random(seed))
+    return [(i, labels[i]) for color_class in classes for i in color_class], changes
+
+
+class LabelPropagation:
+    """
+    *** Label Propagation Class ***
+
+    Communities in about O(m) per round, after Raghavan, Albert and Kumara. Every node starts with a label of
+    its own and takes on the label most of its neighbors have, over and over. Labels spread through the dense
+    parts of the graph and get stuck at the sparse edges between them, nodes with the same label in the end are
+    a community. No modularity to optimize, just fast.
+
+    Semi-synchronous, after Cordasco and Gargano: the graph is colored first so that neighbors never share a
+    color, then a round relabels one color class after the other. A class relabels as if all at once, but two
+    neighbors never do, so labels can't keep flipping back and forth between them like they can when every node
+    relabels at once. Classes and the ties between labels are taken in a random (seeded) order.
+
+    With more than one worker the nodes are split into blocks of consecutive indices. Each round every worker
+    gets the labels of its block and of the neighbors just outside of it, relabels its block against those and
+    sends the block back, so the labels on the boundaries are swapped between rounds. Neighbors in different
+    blocks can flip back and forth again, so the rounds are capped.
+
+    Attributes:
+        - adjacency (Adjacency): connections of the graph.
+        - random (random.Random): order of the classes and ties, seeded to get the same communities every time.
+        - labels (List[int]): community id of every node by its index, numbered in order of their first node.
+        - rounds (int): rounds it took.
+
+    Methods:
+        - run: rounds until no label changes.
+    """
+
+    max_rounds = 100  # Rounds settle in a handful on most graphs, the cap is for blocks fighting over a boundary
+
+    def __init__(self, adjacency: Adjacency, seed: Optional[int] = None):
+        self.adjacency: Adjacency = adjacency
+        self.random: random.Random = random.Random(seed)
+        self.labels: List[int] = list(range(adjacency.node_count))
+        self.rounds: int = 0
+
+    def run(self, workers: int = 1):
+        """
+        Parameters:
+            - workers (int): with more than one, blocks of nodes are relabeled in that many processes.
+        """
+        classes = self.get_color_classes()
+        labels = list(range(self.adjacency.node_count))
+        if workers > 1 and self.adjacency.node_count > workers:
+            self._run_blocks(labels, classes, workers)
+        else:
+            for _ in range(self.max_rounds):
+                self.rounds += 1
+                self.random.shuffle(classes)
+                if _relabel(self.adjacency, labels, classes, self.random) == 0:
+                    break
+
+        ids = {}
+        self.labels = [ids.setdefault(label, len(ids)) for label in labels]
+
+    def get_color_classes(self) -> List[List[int]]:
+        # Greedy coloring, biggest degrees first. Takes at most one color more than the biggest degree
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+        n = self.adjacency.node_count
+        color = [-1] * n
+        classes = []
+        for i in sorted(range(n), key=lambda node: offsets[node] - offsets[node + 1]):
+            taken = {color[targets[slot]] for slot in range(offsets[i], offsets[i + 1])}
+            c = 0
+            while c in taken:
+                c += 1
+            color[i] = c
+            if c == len(classes):
+                classes.append([])
+            classes[c].append(i)
+        return classes
+
+    def _run_blocks(self, labels: List[int], classes: List[List[int]], workers: int):
+        n = self.adjacency.node_count
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+        block_of = [i * workers // n for i in range(n)]  # Blocks of consecutive nodes, neighbors tend to be close
+        boundaries = [set() for _ in range(workers)]
+        for i in range(n):
+            for slot in range(offsets[i], offsets[i + 1]):
+                if block_of[targets[slot]] != block_of[i]:
+                    boundaries[block_of[i]].add(targets[slot])
+        block_members = [[[] for _ in classes] for _ in range(workers)]  # By block, then color
+        for c, color_class in enumerate(classes):
+            for i in color_class:
+                block_members[block_of[i]][c].append(i)
+
+        with WorkerPool(self.adjacency, workers) as pool:
+            for _ in range(self.max_rounds):
+                self.rounds += 1
+                order = list(range(len(classes)))
+                self.random.shuffle(order)
+                futures = []
+                for block in range(workers):
+                    block_classes = [block_members[block][c] for c in order]
+                    block_labels = {i: labels[i] for color_class in block_classes for i in color_class}
+                    block_labels.update((i, labels[i]) for i in boundaries[block])
+                    futures.append(pool.submit(_relabel_block, block_labels, block_classes,
+                                               self.random.getrandbits(32)))
+
+                changes = 0
+                for future in futures:  # Swapping the boundaries is just writing the blocks back
+                    block_labels, block_changes = future.result()
+                    for i, label in block_labels:
+                        labels[i] = label
+                    changes += block_changes
+                if changes == 0:
+                    break
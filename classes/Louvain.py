@@ -0,0 +1,113 @@
+import random
+from typing import Dict, List, Optional
+
+from classes.Adjacency import Adjacency
+
+
+class Louvain:
+    """
+    *** Louvain Class ***
+
+    Communities by modularity, Blondel et al.'s Louvain method. Modularity compares the edges inside the
+    communities with what a random graph with the same degrees would have there:
+        Q = sum over communities of (inside / 2m - (degrees / 2m)^2)
+    inside counting every edge within the community from both ends, degrees summing the degrees of its nodes.
+
+    Every pass has two steps:
+        1. Moving: every node starts in a community of its own. Nodes are visited in random order and moved to
+           the neighboring community that raises Q the most, until a round over all of them moves nothing.
+           What a move does to Q only depends on the edges from the node to the communities and their degree
+           sums, so a round is O(m).
+        2. Folding: every community becomes a single node, edges between communities add up into weights and
+           edges inside them into a self loop. The next pass starts from that smaller graph.
+
+    Stops when a pass moves nothing. Each pass makes fewer and bigger communities, which are whole communities
+    of the one before, so the levels nest. The last one has the highest Q.
+
+    Attributes:
+        - adjacency (Adjacency): connections of the graph.
+        - random (random.Random): shuffles the order the nodes are visited in, seeded to get the same
+                                  communities every time.
+        - levels (List[List[int]]): community id of every node by its index after every pass, ids numbered in
+                                    order of their first node.
+
+    Methods:
+        - run: passes until nothing moves.
+    """
+
+    min_gain = 1e-12  # Moves that gain less are float point noise, not worth flipping back and forth over
+
+    def __init__(self, adjacency: Adjacency, seed: Optional[int] = None):
+        self.adjacency: Adjacency = adjacency
+        self.random: random.Random = random.Random(seed)
+        self.levels: List[List[int]] = []
+
+    def run(self):
+        n = self.adjacency.node_count
+        two_m = len(self.adjacency.targets)
+        if two_m == 0:
+            return
+
+        # Weighted graph of the pass, no self loops in the neighbors, those are in inside (counted from both ends)
+        neighbors: List[Dict[int, int]] = [dict.fromkeys(self.adjacency.neighbors(i), 1) for i in range(n)]
+        inside: List[int] = [0] * n
+        community_of = list(range(n))
+        while True:
+            community = self._move_nodes(neighbors, inside, two_m)
+            if community is None:
+                return
+
+            ids = {}
+            community = [ids.setdefault(c, len(ids)) for c in community]
+            community_of = [community[c] for c in community_of]
+            self.levels.append(community_of)
+            neighbors, inside = self._fold(neighbors, inside, community, len(ids))
+
+    def _move_nodes(self, neighbors: List[Dict[int, int]], inside: List[int], two_m: int) -> Optional[List[int]]:
+        # Community of every node once nothing moves anymore, None if nothing moved at all
+        n = len(neighbors)
+        strength = [sum(weights.values()) + inside[i] for i, weights in enumerate(neighbors)]
+        community = list(range(n))
+        total = strength.copy()  # Degree sum of every community
+
+        order = list(range(n))
+        self.random.shuffle(order)
+        moved = False
+        while True:
+            moves = 0
+            for i in order:
+                current, k_i = community[i], strength[i]
+                links = {}
+                for j, weight in neighbors[i].items():
+                    links[community[j]] = links.get(community[j], 0) + weight
+
+                total[current] -= k_i  # Take it out, then put it back wherever it does the most good
+                best, best_gain = current, links.get(current, 0) - total[current] * k_i / two_m
+                for other, weight in links.items():
+                    gain = weight - total[other] * k_i / two_m
+                    if gain > best_gain + self.min_gain:
+                        best, best_gain = other, gain
+                total[best] += k_i
+
+                if best != current:
+                    community[i] = best
+                    moves += 1
+            if moves == 0:
+                break
+            moved = True
+        return community if moved else None
+
+    def _fold(self, neighbors: List[Dict[int, int]], inside: List[int], community: List[int], count: int):
+        # Every community becomes a node, weights of the edges between them add up
+        new_neighbors: List[Dict[int, int]] = [{} for _ in range(count)]
+        new_inside = [0] * count
+        for i, weights in enumerate(neighbors):
+            c = community[i]
+            new_inside[c] += inside[i]
+            for j, weight in weights.items():
+                d = community[j]
+                if c == d:
+                    new_inside[c] += weight  # Seen from both ends, same as the degrees count it
+                else:
+                    new_neighbors[c][d] = new_neighbors[c].get(d, 0) + weight
+        return new_neighbors, new_inside
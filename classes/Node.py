@@ -1,5 +1,4 @@
-import math
-from typing import Set, Optional, List, Dict
+from typing import Optional, List
 
 
 class Node:
@@ -9,62 +8,92 @@ class Node:
     Represents vertices of a graph, named "Node" because it is shorter and hopefully also correct.
 
     Attributes:
-        - name (str): name of the node.
-        - neighbors (set[Node]): a set of nodes that are connected to this node.
+        - name (str): name of the node. Nodes of a graph that names them by a rule, see Graph.node_name, get
+                      theirs the first time it is asked for.
+        - neighbors (List[Node]): nodes that are connected to this node. Once the graph packs its connections
+                                  into the Adjacency arrays, this becomes a view built from them.
+        - index (int): position of the node in its graph, used by the Adjacency arrays.
+        - graph (Graph): graph the node belongs to, set when the graph builds its Adjacency.
+        - component (int): id of the connected component the node is in.
         - degree (int): Number of connections to other nodes.
-        - parent (Node): temporary attribute to remember the previous Node Dijsktra used to get to this node.
 
     Methods:
         - set_degree: calculate the degree of the node once it's we are done changing connections.
 
     """
 
-    def __init__(self, name: str):
+    __slots__ = ("_name", "_neighbors", "index", "graph", "degree", "clustering_coefficient", "betweeness",
+                 "bridge_count", "closeness", "color")
+
+    def __init__(self, name: Optional[str]):
         # Elementary stats
-        self.name: str = name
-        self.neighbors: List[Node] = []
+        self._name: Optional[str] = name
+        self._neighbors: Optional[List[Node]] = []
+        self.index: Optional[int] = None
+        self.graph = None
 
         # Centrality
         self.degree: int = 0
         self.clustering_coefficient: int = 0
         self.betweeness: int = 0
-        self.bridge_paths = set()
+        self.bridge_count: int = 0  # Number of shortest paths going through the node
         self.closeness: int = 0
 
         # If bipartite graph, it should have color:
         self.color = None
 
-        # Pathfinding
-        self.parent: Optional[Node] = None
-        self.distance = math.inf
+    @property
+    def name(self) -> str:
+        if self._name is None:  # Named by a rule of the graph, kept once made so reordering can't change it
+            self._name = self.graph.node_name(self.index)
+        return self._name
+
+    @name.setter
+    def name(self, name: str):
+        self._name = name
+
+    @property
+    def neighbors(self) -> List["Node"]:
+        if self._neighbors is None:  # Connections were packed into the graphs Adjacency
+            return self.graph.get_neighbor_nodes(self.index)
+        return self._neighbors
+
+    @neighbors.setter
+    def neighbors(self, neighbors: List["Node"]):
+        self._neighbors = neighbors
 
-        self.paths = {}  # Dictionary containing all paths to nonadjacent nodes
+    @property
+    def packed(self) -> bool:
+        # Connections are read from the graph's Adjacency, changes only go through the graph
+        return self._neighbors is None
+
+    @property
+    def component(self) -> int:
+        # Id of the connected component the node is in
+        return self.graph.component_of[self.index]
 
     def set_degree(self):
         self.degree = len(self.neighbors)
 
-    def set_closeness(self, num_nodes):
+    def set_closeness(self, num_nodes: int, total_distance: int):
         """
         Average amount of steps needed to other nodes
         Should be easy to calculate now that I have all the other graph analysis done.
 
         Should the graph not be connected, I will ignore unreachable nodes.
         Should the Node be completely disconnected, closeness is 0.
+
+        Parameters:
+            - num_nodes (int): number of nodes in the node's component.
+            - total_distance (int): sum of the distances to all the nodes this one can reach.
         """
 
-        total_length = len(self.neighbors)
         # If no neighbors, Node is done
-        if total_length == 0:
+        if self.degree == 0:
             self.closeness = 0
             return
 
-        for node in self.paths:
-            if self.paths[node] is None:
-                continue
-            for path in self.paths[node]:
-                total_length += len(path) - 1
-                break  # Only one path is needed
-
+        total_length = total_distance
         average_length = total_length / (num_nodes - 1)
         self.closeness = 1 / average_length
 
@@ -79,11 +108,14 @@ class Node:
         if self.degree == 0:
             return None
 
+        adjacency = self.graph.adjacency
+        neighbors = adjacency.neighbors(self.index)
+        neighbor_set = set(neighbors)
         connections_between_neighbours = 0
 
-        for n in self.neighbors:
-            for n_of_n in n.neighbors:  # XD
-                if n_of_n in self.neighbors:
+        for n in neighbors:
+            for n_of_n in adjacency.neighbors(n):  # XD
+                if n_of_n in neighbor_set:
                     connections_between_neighbours += 1
 
         connections_between_neighbours /= 2
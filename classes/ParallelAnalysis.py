@@ -0,0 +1,84 @@
+from typing import List, Optional, Tuple
+
+from classes.Adjacency import Adjacency
+from classes.Brandes import Brandes
+from classes.BreadthFirstSearch import BreadthFirstSearch
+from classes.WorkerPool import WorkerPool, get_worker_adjacency
+
+# Search of the worker process, made once when it starts
+_bfs: Optional[BreadthFirstSearch] = None
+
+
+def _make_search():
+    global _bfs
+    _bfs = BreadthFirstSearch(get_worker_adjacency())
+
+
+def _search_sources(sources: List[int], betweeness: bool):
+    """
+    Runs in a worker: a breadth first search from each source, returns the distance summaries of the sources
+    and, if asked for, the Brandes sums of all of them together.
+    """
+    brandes = Brandes(get_worker_adjacency()) if betweeness else None
+    summaries = []
+    for source in sources:
+        _bfs.search(source)
+        order = _bfs.order
+        total_distance = sum(_bfs.distance[node] for node in order)
+        summaries.append((source, total_distance, len(order), _bfs.distance[order[-1]]))
+        if brandes is not None:
+            brandes.accumulate(_bfs)
+    return summaries, None if brandes is None else brandes.get_sums()
+
+
+class ParallelAnalysis:
+    """
+    *** Parallel Analysis Class ***
+
+    The breadth first search from every source node and the betweeness accumulated from it don't depend on each
+    other, so the sources are split up between a pool of processes and the sums are added back together.
+
+    The workers share the adjacency through a WorkerPool, nothing is pickled for the tasks but the source indices.
+
+    Attributes:
+        - adjacency (Adjacency): connections of the graph.
+        - workers (int): number of processes.
+
+    Methods:
+        - shortest_path_summaries: distance sum, number of reachable nodes and eccentricity of every source.
+        - betweeness: Brandes sums over all the sources, with the distance summaries on the side.
+    """
+
+    chunks_per_worker = 4  # More chunks than workers, so a slow chunk doesn't keep the rest waiting
+
+    def __init__(self, adjacency: Adjacency, workers: int):
+        self.adjacency: Adjacency = adjacency
+        self.workers: int = workers
+
+    def _run(self, betweeness: bool) -> Tuple[List[Tuple[int, int, int, int]], Optional[Brandes]]:
+        n = self.adjacency.node_count
+        chunk_count = min(n, self.workers * self.chunks_per_worker)
+        chunks = [list(range(i, n, chunk_count)) for i in range(chunk_count)]  # Every k-th source, evens out the load
+
+        summaries = []
+        brandes = Brandes(self.adjacency) if betweeness else None
+        with WorkerPool(self.adjacency, self.workers, setup=_make_search) as pool:
+            futures = [pool.submit(_search_sources, chunk, betweeness) for chunk in chunks if chunk]
+            for future in futures:
+                chunk_summaries, sums = future.result()
+                summaries.extend(chunk_summaries)
+                if brandes is not None:
+                    brandes.add_sums(sums)
+
+        summaries.sort()
+        return summaries, brandes
+
+    def shortest_path_summaries(self) -> List[Tuple[int, int, int, int]]:
+        """
+        Returns:
+            - List of (source, distance sum, reachable nodes, eccentricity) tuples sorted by source.
+        """
+        return self._run(betweeness=False)[0]
+
+    def betweeness(self) -> Tuple[List[Tuple[int, int, int, int]], Brandes]:
+        return self._run(betweeness=True)
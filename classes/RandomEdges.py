@@ -0,0 +1,198 @@
+import math
+import random
+from array import array
+from typing import Optional, Tuple
+
+try:  # Draws in big vectorized batches if it is there, one at a time otherwise
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class RandomEdges:
+    """
+    *** Random Edges Class ***
+
+    Edges of random graphs, as two arrays of node indices (edge k goes from first[k] to second[k]) ready for
+    Adjacency.from_edges. No Node objects, no neighbor lists, nothing that grows with the pairs of nodes that
+    don't get an edge.
+
+    G(n, p), after Batagelj and Brandes: instead of a coin flip for every one of the n(n - 1) / 2 pairs, draw
+    how many pairs to skip until the next edge. With q = 1 - p, the skip is geometric, P(skip = s) = q^s * p, so
+    floor(log(1 - r) / log(q)) for a uniform r. One draw per edge, O(n + m).
+
+    G(n, m): pairs are numbered 0 to n(n - 1) / 2 - 1, (v, w) with w < v is number v(v - 1) / 2 + w, and m of the
+    numbers are drawn without repeats. While at most half of the pairs get an edge, drawing and throwing away
+    the numbers already in a set of them takes less than two draws per edge. Past that it only gets worse, up to
+    n log n draws for a complete graph, so the numbers are sampled straight from all of them, O(n(n - 1) / 2) but
+    that is less than 2m there.
+
+    Barabasi-Albert: every edge puts both of its ends in a pool, so a node is in it as many times as its degree
+    and a uniform pick from the pool is a pick weighted by degree. A new node draws m distinct nodes from the
+    pool, then adds the ends of its edges. O(m) per node, no weights to add up over the whole graph.
+
+    Watts-Strogatz: a ring of n nodes, each connected to the k nearest on either side, edge (v, v + j) for every
+    v and j up to k. Then every edge, with probability beta, keeps v and swaps the other end for a random node
+    v isn't connected to yet. A set of the edges (as v * n + w, the smaller index first) says which those are,
+    so it is O(nk) with no self loops and no edge twice.
+
+    Attributes:
+        - seed (int): seed of the random generators, None for a different graph every time.
+        - random (random.Random): draws one at a time.
+        - use_numpy (bool): draw in batches with NumPy. Seeded graphs differ between the two ways.
+
+    Methods:
+        - gnp: Erdos-Renyi G(n, p), every pair connected with probability p.
+        - gnm: Erdos-Renyi G(n, m), m edges between random pairs.
+        - barabasi_albert: scale-free, new nodes connect to nodes with a high degree more likely.
+        - watts_strogatz: small-world, a ring lattice with some of its edges rewired.
+    """
+
+    batch_size = 1 << 16  # Draws per NumPy batch
+
+    def __init__(self, seed: Optional[int] = None, use_numpy: Optional[bool] = None):
+        self.seed: Optional[int] = seed
+        self.random: random.Random = random.Random(seed)
+        self.use_numpy: bool = numpy is not None if use_numpy is None else use_numpy and numpy is not None
+
+    def gnp(self, n: int, p: float) -> Tuple[array, array]:
+        """
+        Parameters:
+            - n (int): number of nodes.
+            - p (float): probability of an edge between any two nodes.
+
+        Returns:
+            - first, second (arrays of ints): the ends of every edge, the bigger index first.
+        """
+        first, second = array("i"), array("i")
+        if n < 2 or p <= 0:
+            return first, second
+        if p >= 1:  # Nothing to skip
+            for v in range(1, n):
+                first.extend([v] * v)
+                second.extend(range(v))
+            return first, second
+        if self.use_numpy:
+            return self._gnp_batches(n, p)
+
+        log_q = math.log(1 - p)
+        v, w = 1, -1
+        while v < n:
+            w += 1 + int(math.log(1 - self.random.random()) / log_q)
+            while w >= v and v < n:  # Skipped past the end of the row, on to the next ones
+                w -= v
+                v += 1
+            if v < n:
+                first.append(v)
+                second.append(w)
+        return first, second
+
+    def _gnp_batches(self, n: int, p: float) -> Tuple[array, array]:
+        # The same skips, drawn a batch at a time. Pair (v, w), w < v, is number v(v - 1) / 2 + w in the order
+        # the skipping goes through them, the running sum of the skips gives the numbers of the pairs with edges
+        generator = numpy.random.default_rng(self.seed)
+        pairs = n * (n - 1) // 2
+        first, second = array("i"), array("i")
+        last = -1
+        while last < pairs:
+            indices = last + numpy.cumsum(generator.geometric(p, size=self.batch_size), dtype=numpy.int64)
+            last = int(indices[-1])
+            indices = indices[indices < pairs]
+
+            self._extend_pairs(first, second, indices)
+        return first, second
+
+    def gnm(self, n: int, m: int) -> Tuple[array, array]:
+        """
+        Parameters:
+            - n (int): number of nodes.
+            - m (int): number of edges, no more than there are pairs of nodes.
+
+        Returns:
+            - first, second (arrays of ints): the ends of every edge, the bigger index first.
+        """
+        first, second = array("i"), array("i")
+        pairs = n * (n - 1) // 2 if n > 1 else 0
+        m = max(0, min(m, pairs))
+        if self.use_numpy:
+            generator = numpy.random.default_rng(self.seed)
+            self._extend_pairs(first, second, generator.choice(pairs, size=m, replace=False).astype(numpy.int64))
+            return first, second
+
+        if 2 * m <= pairs:
+            chosen = set()
+            while len(chosen) < m:
+                chosen.add(self.random.randrange(pairs))
+        else:
+            chosen = self.random.sample(range(pairs), m)
+        for k in chosen:
+            v = (1 + math.isqrt(1 + 8 * k)) // 2
+            first.append(v)
+            second.append(k - v * (v - 1) // 2)
+        return first, second
+
+    def barabasi_albert(self, n: int, m0: int, m: int) -> Tuple[array, array]:
+        """
+        Parameters:
+            - n (int): number of nodes added to the starting clique, the graph gets m0 + n.
+            - m0 (int): nodes of the starting clique, Km0.
+            - m (int): edges of every added node, fewer while there aren't m nodes to connect to.
+
+        Returns:
+            - first, second (arrays of ints): the ends of every edge, the bigger index first.
+        """
+        first, second = self.gnp(m0, 1)
+        pool = first + second  # Both ends of every edge, a node as many times as its degree
+        for v in range(m0, m0 + n):
+            wanted = min(m, v)
+            targets = set()
+            while len(targets) < wanted:
+                # Nothing to weigh by while no node has an edge yet (m0 < 2), every node is as good as any
+                targets.add(pool[self.random.randrange(len(pool))] if pool else self.random.randrange(v))
+            for w in targets:
+                first.append(v)
+                second.append(w)
+            pool.extend(targets)
+            pool.extend([v] * wanted)
+        return first, second
+
+    def watts_strogatz(self, n: int, k: int, beta: float) -> Tuple[array, array]:
+        """
+        Parameters:
+            - n (int): number of nodes.
+            - k (int): neighbors on either side in the ring, (n - 1) // 2 at most.
+            - beta (float): probability of rewiring an edge, between 0 and 1.
+
+        Returns:
+            - first, second (arrays of ints): the ends of every edge, the bigger index first.
+        """
+        k = max(0, min(k, (n - 1) // 2))
+        ends = [(v, (v + j) % n) for j in range(1, k + 1) for v in range(n)]  # Ring by ring, like Watts-Strogatz
+        edges = {min(v, w) * n + max(v, w) for v, w in ends}
+        degree = [2 * k] * n
+        for e, (v, w) in enumerate(ends):
+            if degree[v] == n - 1 or self.random.random() >= beta:
+                continue  # Left alone, or nowhere to rewire to
+            new = self.random.randrange(n)
+            while new == v or min(v, new) * n + max(v, new) in edges:
+                new = self.random.randrange(n)
+            edges.remove(min(v, w) * n + max(v, w))
+            edges.add(min(v, new) * n + max(v, new))
+            degree[w] -= 1
+            degree[new] += 1
+            ends[e] = (v, new)
+
+        first, second = array("i"), array("i")
+        for v, w in ends:
+            first.append(max(v, w))
+            second.append(min(v, w))
+        return first, second
+
+    @staticmethod
+    def _extend_pairs(first: array, second: array, indices):
+        # Pair numbers back to (v, w), a NumPy array of them at a time
+        v = ((1 + numpy.sqrt(1 + 8 * indices.astype(numpy.float64))) / 2).astype(numpy.int64)
+        v -= v * (v - 1) // 2 > indices  # Square roots of big numbers can be a bit off either way
+        v += (v + 1) * v // 2 <= indices
+        first.frombytes(v.astype(numpy.int32).tobytes())
+        second.frombytes((indices - v * (v - 1) // 2).astype(numpy.int32).tobytes())
@@ -0,0 +1,141 @@
+import math
+import random
+import time
+from typing import List, Optional
+
+from classes.Adjacency import Adjacency
+from classes.BreadthFirstSearch import BreadthFirstSearch
+
+
+class SampledBetweeness:
+    """
+    *** Sampled Betweeness Class ***
+
+    Approximate node and edge betweeness for graphs too big for Brandes, after Riondato and Kornaropoulos.
+    Pairs of nodes that are connected but not neighbors are picked at random, for each one a single shortest path
+    is picked at random out of all of them and every node and edge along it gets a point. Points divided by the
+    number of samples estimate the same betweeness Brandes computes.
+
+    With r = (c / epsilon^2) * (floor(log2(VD - 2)) + 1 + ln(1 / delta)) samples, VD being the vertex diameter,
+    all node estimates are within epsilon of the real values with probability at least 1 - delta. The same paths
+    are used for the edges.
+
+    Has the same sums as Brandes, so Graph.set_betweeness can fill in the results from either one.
+
+    Attributes:
+        - adjacency (Adjacency): connections of the graph.
+        - components (List[List[int]]): node indices of every connected component.
+        - node_dependency (List[float]): points of every node.
+        - edge_dependency (List[float]): points of every edge, by adjacency slot from the smaller to the bigger index.
+        - bridge_count (List[None]): shortest paths through the nodes are not counted when sampling.
+        - pairs (int): number of samples taken.
+        - total_paths (None): not counted either.
+        - epsilon (float): error bound reached with the samples taken.
+        - delta (float): probability that the error is bigger than epsilon.
+        - vertex_diameter (int): upper bound on the number of nodes on a shortest path.
+
+    Methods:
+        - sample_size: number of samples needed for an epsilon and delta.
+        - sample: takes samples until there is enough of them or the time runs out.
+    """
+
+    c = 0.5  # Universal constant of the sample size bound
+
+    def __init__(self, adjacency: Adjacency, components: List[List[int]], seed: Optional[int] = None):
+        n = adjacency.node_count
+        self.adjacency: Adjacency = adjacency
+        self.bfs: BreadthFirstSearch = BreadthFirstSearch(adjacency)
+        self.random: random.Random = random.Random(seed)
+
+        self.node_dependency: List[float] = [0.0] * n
+        self.edge_dependency: List[float] = [0.0] * len(adjacency.targets)
+        self.bridge_count: List[None] = [None] * n
+        self.pairs: int = 0
+        self.total_paths = None
+
+        self.epsilon: Optional[float] = None
+        self.delta: Optional[float] = None
+        self.vertex_diameter: int = 0
+
+        self._components: List[List[int]] = []
+        self._cumulative_weights: List[int] = []
+        self._far_pairs: int = 0
+        self._set_components(components)
+
+    def _set_components(self, components: List[List[int]]):
+        """
+        Keeps the components with pairs that are connected but not neighbors and finds a bound on the vertex
+        diameter. Twice the eccentricity of any node bounds the diameter of its component.
+        """
+        for component in components:
+            size = len(component)
+            edges = sum(self.adjacency.degree(node) for node in component) // 2
+            far_pairs = size * (size - 1) - 2 * edges
+            if far_pairs == 0:  # Full graph, nothing to sample in here
+                continue
+
+            self._components.append(component)
+            previous = self._cumulative_weights[-1] if self._cumulative_weights else 0
+            self._cumulative_weights.append(previous + size * (size - 1))  # Each component by its number of pairs
+            self._far_pairs += far_pairs
+
+            self.bfs.search(component[0])
+            eccentricity = self.bfs.distance[self.bfs.order[-1]]
+            self.vertex_diameter = max(self.vertex_diameter, 2 * eccentricity + 1)
+
+    def _vc_term(self) -> int:
+        if self.vertex_diameter <= 3:
+            return 1
+        return math.floor(math.log2(self.vertex_diameter - 2)) + 1
+
+    def sample_size(self, epsilon: float, delta: float) -> int:
+        return math.ceil(self.c / epsilon ** 2 * (self._vc_term() + math.log(1 / delta)))
+
+    def sample(self, epsilon: float = 0.01, delta: float = 0.1, time_budget: Optional[float] = None):
+        """
+        Parameters:
+            - epsilon (float): wanted error bound.
+            - delta (float): wanted probability of being outside of the bound.
+            - time_budget (float) (optional): seconds to stop after, even if there are not enough samples yet.
+                                              The epsilon then gets worse to match the samples taken.
+        """
+        self.delta = delta
+        if self._far_pairs == 0:  # Only full graphs, no node is ever in between
+            self.epsilon = 0
+            return
+
+        wanted = self.sample_size(epsilon, delta)
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        while self.pairs < wanted:
+            if deadline is not None and self.pairs > 0 and time.perf_counter() > deadline:
+                break
+            start, finish = self._pick_pair()
+            self.bfs.search(start, finish=finish)
+            self._add_random_path(finish)
+            self.pairs += 1
+
+        self.epsilon = math.sqrt(self.c / self.pairs * (self._vc_term() + math.log(1 / delta)))
+
+    def _pick_pair(self):
+        # Uniformly random ordered pair that is connected but not neighbors
+        while True:
+            component = self.random.choices(self._components, cum_weights=self._cumulative_weights, k=1)[0]
+            start, finish = self.random.sample(component, k=2)
+            if not self.adjacency.has_edge(start, finish):
+                return start, finish
+
+    def _add_random_path(self, finish: int):
+        # Walk back from the finish, picking each predecessor by the share of the paths that go through it
+        sigma, predecessors = self.bfs.sigma, self.bfs.predecessors
+        current = finish
+        while current != self.bfs.source:
+            pick = self.random.random() * sigma[current]
+            for predecessor in predecessors[current]:
+                pick -= sigma[predecessor]
+                if pick < 0:
+                    break
+            if predecessor != self.bfs.source:
+                self.node_dependency[predecessor] += 1
+            low, high = min(current, predecessor), max(current, predecessor)
+            self.edge_dependency[self.adjacency.edge_slot(low, high)] += 1
+            current = predecessor
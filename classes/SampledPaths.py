@@ -0,0 +1,107 @@
+import math
+import random
+import time
+from typing import List, Optional, Tuple
+
+from classes.Adjacency import Adjacency
+from classes.BreadthFirstSearch import BreadthFirstSearch
+
+
+class SampledPaths:
+    """
+    *** Sampled Paths Class ***
+
+    Approximate distance sums, eccentricities, diameter and average path length for graphs too big for a search
+    from every node, after Eppstein and Wang. Only a few random pivot nodes of every component are searched from.
+    Distances go both ways, so the search from a pivot gives the distance to it from every node of its
+    component, and a node's distance sum is estimated by its average distance to the pivots times the size of
+    the component.
+
+    With k = ln(2n / delta) / (2 * epsilon^2) pivots in a component, the average distance of all its nodes is
+    within epsilon * D of the real one with probability at least 1 - delta, D being the diameter of the
+    component. Components with no more than k nodes are searched from every node and come out exact.
+
+    Eccentricities are the largest distance to a pivot, never more than the real ones, and neither is the
+    diameter that comes out of them. The real diameter is at most twice that, any eccentricity bounds it.
+
+    Attributes:
+        - adjacency (Adjacency): connections of the graph.
+        - components (List[List[int]]): node indices of every connected component.
+        - sources (int): number of pivots searched from.
+        - epsilon (float): error bound reached with the pivots searched from, as a share of the diameter.
+        - delta (float): probability that the error is bigger than epsilon.
+
+    Methods:
+        - pivot_count: number of pivots needed per component for an epsilon and delta.
+        - sample: searches from the pivots until there is enough of them or the time runs out.
+        - get_path_summaries: the same summaries a search from every node gives, estimated.
+    """
+
+    def __init__(self, adjacency: Adjacency, components: List[List[int]], seed: Optional[int] = None):
+        n = adjacency.node_count
+        self.adjacency: Adjacency = adjacency
+        self.components: List[List[int]] = components
+        self.bfs: BreadthFirstSearch = BreadthFirstSearch(adjacency)
+        self.random: random.Random = random.Random(seed)
+
+        self.sources: int = 0
+        self.epsilon: Optional[float] = None
+        self.delta: Optional[float] = None
+
+        self._distance_totals: List[int] = [0] * n  # To the pivots searched from so far
+        self._farthest: List[int] = [0] * n
+        self._pivots_searched: List[int] = [0] * len(components)  # By component
+
+    def pivot_count(self, epsilon: float, delta: float) -> int:
+        return math.ceil(math.log(2 * self.adjacency.node_count / delta) / (2 * epsilon ** 2))
+
+    def sample(self, epsilon: float = 0.1, delta: float = 0.1, time_budget: Optional[float] = None):
+        """
+        Parameters:
+            - epsilon (float): wanted error bound, as a share of the diameter.
+            - delta (float): wanted probability of being outside of the bound.
+            - time_budget (float) (optional): seconds to stop after, even if there are not enough pivots yet.
+                                              Every component still gets 2. The epsilon then gets worse to match.
+        """
+        self.delta = delta
+        wanted = self.pivot_count(epsilon, delta)
+        pivots = [self.random.sample(component, k=min(len(component), wanted)) for component in self.components]
+
+        # A round at a time over the components, so running out of time leaves them with about as many pivots each
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        for round_number in range(max((len(chosen) for chosen in pivots), default=0)):
+            if deadline is not None and round_number >= 2 and time.perf_counter() > deadline:
+                break
+            for c, chosen in enumerate(pivots):
+                if round_number < len(chosen):
+                    self._search_from(chosen[round_number])
+                    self._pivots_searched[c] += 1
+
+        fewest = min((searched for component, searched in zip(self.components, self._pivots_searched)
+                      if searched < len(component)), default=None)
+        self.epsilon = 0 if fewest is None else math.sqrt(math.log(2 * self.adjacency.node_count / delta)
+                                                          / (2 * fewest))
+
+    def _search_from(self, pivot: int):
+        self.bfs.search(pivot)
+        distance = self.bfs.distance
+        for node in self.bfs.order:
+            self._distance_totals[node] += distance[node]
+            if distance[node] > self._farthest[node]:
+                self._farthest[node] = distance[node]
+        self.sources += 1
+
+    def get_path_summaries(self) -> List[Tuple[int, float, int, int]]:
+        """
+        Returns:
+            - List of (node, estimated distance sum, reachable nodes, eccentricity at least) tuples sorted by node.
+        """
+        summaries = []
+        for component, searched in zip(self.components, self._pivots_searched):
+            size = len(component)
+            for node in component:
+                total = self._distance_totals[node]
+                summaries.append((node, total if searched == size else total * size / searched, size,
+                                  self._farthest[node]))
+        summaries.sort()
+        return summaries
@@ -0,0 +1,107 @@
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+from classes.BreadthFirstSearch import BreadthFirstSearch
+
+
+class ShortestPathDag:
+    """
+    *** Shortest Path DAG Class ***
+
+    Every shortest path from one source node, stored as the directed acyclic graph of shortest path predecessors
+    together with the distance and the number of shortest paths to each node. Graphs with lots of equally long
+    routes (grids, hypercubes) have exponentially many paths, but the DAG never holds more than one entry per node
+    and edge. Full paths are only put together when they are asked for.
+
+    Attributes:
+        - source (int): index of the node all the paths start from.
+        - order (array[int]): reachable nodes sorted by distance, starting with the source.
+        - distance (array[int]): steps from the source to each node, -1 if it can not be reached.
+        - sigma (List[int]): number of shortest paths from the source to each node, 0 if it can not be reached.
+        - predecessor_offsets (array[int]): predecessors[predecessor_offsets[i]:predecessor_offsets[i + 1]]
+                                             are the predecessors of node i.
+        - predecessors (array[int]): neighbors one step closer to the source, for every node.
+        - total_distance (int): sum of the distances to all reachable nodes.
+        - eccentricity (int): distance to the furthest reachable node.
+
+    Methods:
+        - from_search: copies the result of a breadth first search.
+        - reached, get_distance, count_paths, get_predecessors: lookups for a single target.
+        - iter_paths: generator of all the shortest paths to a target.
+    """
+
+    def __init__(self, source: int, node_count: int):
+        self.source: int = source
+        self.order: array = array("i")
+        self.distance: array = array("i", [-1]) * node_count
+        self.sigma: List[int] = [0] * node_count
+        self.predecessor_offsets: array = array("l", [0]) * (node_count + 1)
+        self.predecessors: array = array("i")
+        self.total_distance: int = 0
+        self.eccentricity: int = 0
+
+    @classmethod
+    def from_search(cls, bfs: BreadthFirstSearch):
+        """
+        Parameters:
+            - bfs (BreadthFirstSearch): a search that was just run from the source we want the DAG of.
+
+        Returns:
+            - ShortestPathDag
+        """
+        dag = cls(source=bfs.source, node_count=bfs.adjacency.node_count)
+        dag.order = array("i", bfs.order)
+
+        counts = [0] * bfs.adjacency.node_count
+        for node in bfs.order:
+            distance = bfs.distance[node]
+            dag.distance[node] = distance
+            dag.sigma[node] = bfs.sigma[node]
+            counts[node] = len(bfs.predecessors[node])
+            dag.total_distance += distance
+            if distance > dag.eccentricity:
+                dag.eccentricity = distance
+
+        for i, count in enumerate(counts):
+            dag.predecessor_offsets[i + 1] = dag.predecessor_offsets[i] + count
+        for node in range(bfs.adjacency.node_count):
+            if counts[node]:
+                dag.predecessors.extend(bfs.predecessors[node])
+        return dag
+
+    def reached(self, node: int) -> bool:
+        return self.distance[node] != -1
+
+    def get_distance(self, node: int) -> Optional[int]:
+        return self.distance[node] if self.distance[node] != -1 else None
+
+    def count_paths(self, node: int) -> int:
+        return self.sigma[node]
+
+    def get_predecessors(self, node: int) -> array:
+        return self.predecessors[self.predecessor_offsets[node]:self.predecessor_offsets[node + 1]]
+
+    def iter_paths(self, finish: int) -> Iterator[Tuple[int, ...]]:
+        """
+        Lazily walks the predecessors back from the finish to the source, one path at a time.
+
+        Parameters:
+            - finish (int): index of the node the paths end in.
+
+        Returns:
+            - Iterator of tuples of node indices, each one a shortest path from the source to the finish.
+        """
+        if not self.reached(finish):
+            return
+
+        stack = [(finish, (finish,))]
+        while stack:
+            current, path = stack.pop()
+            if current == self.source:
+                yield path
+                continue
+            for predecessor in self.get_predecessors(current):
+                stack.append((predecessor, (predecessor,) + path))
+
+    def __repr__(self):
+        return f"Shortest paths from {self.source}: {len(self.order)} reachable nodes"
@@ -117,18 +117,19 @@ class StringManager:
     def print_euler_string(self):
         odd_nodes = [node for node in self.GM.current_graph.nodes if node.degree % 2 == 1]
 
-        if self.GM.current_graph.euler_path is None:
-            if not self.GM.current_graph.connected:
+        if self.GM.current_graph.euler_path_start is None:
+            unconnected = len(self.GM.current_graph.get_edge_components()) > 1
+            if unconnected:
                 string_to_print = f"    Euler Path and Circuit impossible because the graph is unconnected!"
             else:
                 string_to_print = f"    Euler Path and Circuit impossible because {len(odd_nodes)} have odd degrees!"
             string_to_print = self.color("red", string_to_print)
 
-            if self.GM.current_graph.connected:
+            if not unconnected:
                 blah = f"\n\n    Nodes to blame!\n{self.get_nodes_list_string(odd_nodes, 'red')}"
                 string_to_print += self.color("red", blah)
 
-        elif self.GM.current_graph.euler_circuit is None:
+        elif self.GM.current_graph.euler_circuit_start is None:
             string_to_print = f"\n            {self.color('cyan', '*** Euler Path ***')}\n\n"
             string_to_print += self.get_path_string(path=self.GM.current_graph.euler_path) + "\n\n"
             string_to_print += self.color("red",
@@ -147,6 +148,8 @@ class StringManager:
         if self.GM.current_graph.hamilton_path is None:
             if not self.GM.current_graph.connected:
                 string_to_print = f"  Hamilton Path and Circuit impossible because the graph is unconnected!"
+            elif self.GM.current_graph.hamilton_path_unknown:
+                string_to_print = f"       Hamilton Path and Circuit unknown, ran out of time looking for them!"
             else:
                 string_to_print = f"           Hamilton Path and Circuit impossible because reasons!"
             string_to_print = self.color("red", string_to_print)
@@ -154,7 +157,10 @@ class StringManager:
         elif self.GM.current_graph.hamilton_circuit is None:
             string_to_print = f"\n         {self.color('cyan', '*** Hamilton Path ***')}\n\n"
             string_to_print += self.get_path_string(path=self.GM.current_graph.hamilton_path) + "\n\n"
-            string_to_print += self.color("red", f"          Hamilton Circuit impossible because I can't find it...")
+            if self.GM.current_graph.hamilton_circuit_unknown:
+                string_to_print += self.color("red", f"          Hamilton Circuit unknown, ran out of time looking for it...")
+            else:
+                string_to_print += self.color("red", f"          Hamilton Circuit impossible because I can't find it...")
         else:
             string_to_print = f"\n             {self.color('cyan', '************* Hamilton Path *************')}\n\n"
             string_to_print += self.get_path_string(path=self.GM.current_graph.hamilton_path) + "\n\n"
@@ -187,18 +193,18 @@ class StringManager:
         string_to_print = self.get_partition_string()
         self.print(sentence=string_to_print)
 
-    def get_partition_string(self, communities: bool = False, graph=None):
-        if graph is None:
-            graph = self.GM.current_graph
+    def get_partition_string(self, communities: bool = False, partitions=None):
+        if partitions is None:
+            partitions = self.GM.current_graph.partitions
 
         x = "partitions" if not communities else "communities"
         y = "Partition" if not communities else "Community"
         colors = ['cyan', 'magenta']
         if not communities:
-            string_to_print = f"\n         {self.color('blue', f'************* Graph has {len(graph.partitions)} {x} *************')}\n"
+            string_to_print = f"\n         {self.color('blue', f'************* Graph has {len(partitions)} {x} *************')}\n"
         else:
             string_to_print = "\n"
-        for i, partition in enumerate(graph.partitions):
+        for i, partition in enumerate(partitions):
             nodes = self.get_nodes_list_string(list(partition), colors[i % 2])
             string_to_print += f"\n     {self.color(color=colors[i % 2], text=f'{y} {i + 1}:')}"
             string_to_print += nodes + "\n"
@@ -206,7 +212,7 @@ class StringManager:
         return string_to_print
 
     def get_community_string(self):
-        subs = self.GM.current_graph.subgraphs
+        subs = self.GM.current_graph.communities
         snips = self.GM.current_graph.snips
 
         total_subs = len(subs)
@@ -226,38 +232,27 @@ class StringManager:
                 a_snip = self.get_edge_string(new_snips[j])
                 snips_string += "    " + a_snip
 
-            sub_graph = subs[i]
             main_string += f"\n         {self.color('blue', f'************* SUBGRAPH {i + 1} *************')}\n"
             main_string += snips_string
-            main_string += self.get_partition_string(communities=True, graph=sub_graph) + "\n"
+            main_string += f"\n\n    Modularity: {self.GM.current_graph.modularity[i]:.4f}\n"
+            main_string += self.get_partition_string(communities=True, partitions=subs[i]) + "\n"
         return main_string
 
     def print_social_distances(self, node: Node):
         colors = ['cyan', 'magenta']
         string_to_print = f"\n         {self.color('blue', f'***** Nodes {node.name} Social Distances *****')}\n"
 
-        all_paths = []
-        unavailables = set()
-        max_steps = 0 if len(node.neighbors) == 0 else 1
-
-        for n in node.paths:
-            if node.paths[n] is None:
-                unavailables.add(n)
-                continue
-            for path in node.paths[n]:
-                all_paths.append(path)
-                if len(path) > max_steps:
-                    max_steps = len(path)
-
-        for i in range(1, max_steps):
-            nodes = set()
-            if i == 1:
-                nodes = set(node.neighbors)
-            else:
-                for path in all_paths:
-                    if len(path) > i:
-                        nodes.add(path[i])
+        graph = self.GM.current_graph
+        dag = graph.get_shortest_paths(node)
+        unavailables = [n for n in graph.nodes if not graph.reachable(node, n)]
 
+        # Reachable nodes are sorted by distance, group them up
+        distances = {}
+        for i in dag.order[1:]:
+            distances.setdefault(dag.distance[i], []).append(graph.nodes[i])
+
+        for i in distances:
+            nodes = distances[i]
             nodes_string = self.get_nodes_list_string(list(nodes), colors[i % 2])
             string_to_print += f"\n     {self.color(color=colors[i % 2], text=f'Social Distance: {i}:')}"
             string_to_print += nodes_string + "\n"
@@ -283,6 +278,11 @@ class StringManager:
 
         return self.color(color, top + mid + bot)
 
+    def get_hamilton_answer(self, path: Optional[List[Node]], unknown: bool) -> str:
+        if path is not None:
+            return "YES"
+        return "UNKNOWN" if unknown else "NO"
+
     def get_graph_details(self):
         if self.GM.current_graph is None or not self.GM.current_graph.analyzed:
             return ""
@@ -302,20 +302,23 @@ class StringManager:
         data["-----------*"] = "*------------"
         data["-------------*"] = "*------------"
 
+        # Sampled betweeness comes with its error bound
+        plus_minus = f" ±{graph.betweeness_epsilon:.2f}" if graph.betweeness_sampled else ""
+
         data["Max Cluster Coef: "] = f'{graph.max_cluster_coefficient:.2f}'
-        data["Max Betweeness: "] = f'{graph.max_betweeness:.2f}'
+        data["Max Betweeness: "] = f'{graph.max_betweeness:.2f}' + plus_minus
 
         data["Min Cluster Coef: "] = f"{graph.min_cluster_coefficient:.2f}"
-        data["Min Betweeness: "] = f'{graph.min_betweeness:.2f}'
+        data["Min Betweeness: "] = f'{graph.min_betweeness:.2f}' + plus_minus
 
         data["Avg Cluster Doef: "] = f"{graph.average_cluster_coefficient:.2f}"
-        data["Avg Betweeness: "] = f'{graph.average_betweeness:.2f}'
+        data["Avg Betweeness: "] = f'{graph.average_betweeness:.2f}' + plus_minus
 
         data["-----------"] = "------------"
         data["-------------"] = "------------"
 
         data["Partitions: "] = str(len(self.GM.current_graph.partitions))
-        data["Max Communities: "] = "0" if len(graph.subgraphs) == 0 else f'{len(graph.subgraphs[-1].partitions)}'
+        data["Max Communities: "] = "0" if len(graph.communities) == 0 else f'{len(graph.communities[-1])}'
 
         data["Connected: "] = "YES" if graph.connected else "NO"
         data["Avg Edge Betweeness: "] = f"{graph.avg_edge_betweeness:.2f}"
@@ -323,14 +326,19 @@ class StringManager:
         data["Connectivity: "] = f"{graph.connectivity}"
         data["Bipartite: "] = "YES" if graph.bipartite else "NO"
 
-        data["Diameter: "] = str(graph.diameter)
-        data["Avg Path Length: "] = f"{graph.average_path_length:.2f}"
+        if graph.paths_sampled:  # The diameter is a lower bound, the real one at most twice that
+            data["Diameter: "] = f"≥{graph.diameter}"
+            data["Avg Path Length: "] = (f"{graph.average_path_length:.2f}"
+                                         f" ±{graph.paths_epsilon * 2 * graph.diameter:.2f}")
+        else:
+            data["Diameter: "] = str(graph.diameter)
+            data["Avg Path Length: "] = f"{graph.average_path_length:.2f}"
 
-        data["Euler Path: "] = "NO" if graph.euler_path is None else "YES"
-        data["Hamilton Path: "] = "NO" if graph.hamilton_path is None else "YES"
+        data["Euler Path: "] = "NO" if graph.euler_path_start is None else "YES"
+        data["Hamilton Path: "] = self.get_hamilton_answer(graph.hamilton_path, graph.hamilton_path_unknown)
 
-        data["Euler Circuit: "] = "NO" if graph.euler_circuit is None else "YES"
-        data["Hamilton Circuit: "] = "NO" if graph.hamilton_circuit is None else "YES"
+        data["Euler Circuit: "] = "NO" if graph.euler_circuit_start is None else "YES"
+        data["Hamilton Circuit: "] = self.get_hamilton_answer(graph.hamilton_circuit, graph.hamilton_circuit_unknown)
 
         lines = []
         line = ""
@@ -412,20 +420,26 @@ class StringManager:
                     main_string += self.get_path_string(path=[node, neighbor]) + "\n"
 
         if bridges:
-            for path in node.bridge_paths:
+            for path in self.GM.current_graph.iter_bridge_paths(node):
                 main_string += self.get_path_string(path) + "\n"
 
         else:
-            for n in node.paths:
-                if finish is not None and n != finish:
-                    continue
-                if node.paths[n] is not None and not empties_only:
-                    for path in node.paths[n]:
+            graph = self.GM.current_graph
+            dag = graph.get_shortest_paths(node)
+            if not empties_only:
+                for i in dag.order:
+                    n = graph.nodes[i]
+                    if dag.distance[i] < 2 or (finish is not None and n != finish):
+                        continue
+                    for path in graph.iter_paths(node, n):  # Put together one by one, only now that we print them
                         main_string += self.get_path_string(path) + "\n"
-                else:
-                    start_name = "        " + self.color("green", node.name)
-                    goal_name = self.color("blue", n.name)
-                    main_string += start_name + self.color("red", " - no path to - ") + goal_name + "\n"
+
+            for n in graph.nodes:
+                if graph.reachable(node, n) or (finish is not None and n != finish):
+                    continue
+                start_name = "        " + self.color("green", node.name)
+                goal_name = self.color("blue", n.name)
+                main_string += start_name + self.color("red", " - no path to - ") + goal_name + "\n"
 
         return main_string
 
@@ -461,14 +475,14 @@ class StringManager:
 
     def print_edge_bridges(self, bridges=False):
         main_string = "    "
-        for edge in self.GM.current_graph.edge_bridges:
+        for edge in self.GM.current_graph.edge_betweeness:
             main_string += "\n" + self.color("blue", "EDGE: ")
             for i, node in enumerate(edge):
                 main_string += self.color("green", node.name)
                 if i == 0:
                     main_string += self.color("blue", " <<====>> ")
             main_string += "\n"
-            for path in self.GM.current_graph.edge_bridges[edge]:
+            for path in self.GM.current_graph.iter_edge_bridge_paths(edge):
                 main_string += "\n" + self.get_path_string(path)
             main_string += "\n"
         self.print(sentence=main_string)
@@ -502,8 +516,8 @@ class StringManager:
         betw = "NONE" if node.betweeness is None else f"{node.betweeness:.2f}"
         between_string = " " * (8 - len(betw)) + self.color(betw_col, betw)
 
-        bridge_col = col[0] if node.bridge_paths is None else col[1]
-        bridge = "NONE" if node.bridge_paths is None else f"{len(node.bridge_paths)}"
+        bridge_col = col[0] if node.bridge_count is None else col[1]
+        bridge = "NONE" if node.bridge_count is None else f"{node.bridge_count}"
         bridge_string = " " * (8 - len(bridge)) + self.color(bridge_col, bridge)
 
         close_col = col[0] if node.closeness is None else col[1]
@@ -534,7 +548,7 @@ class StringManager:
         data = {"Degree: ": str(node.degree),
                 "Betweeness: ": f"{node.betweeness:.2f}",
                 "Closeness: ": f"{node.closeness:.2f}",
-                "Parts of a Bridge: ": f"{len(node.bridge_paths)} times",
+                "Parts of a Bridge: ": "NONE" if node.bridge_count is None else f"{node.bridge_count} times",
                 "Clustering Coefficient: ": f"{node.clustering_coefficient:.2f}",
                 }
 
@@ -903,8 +917,10 @@ class StringManager:
         wrong_command = False
         comm_string = self.get_community_string()
         option = ["b-back"]
-        if len(self.GM.current_graph.subgraphs) + len(self.GM.current_graph.partitions) > 0:
+        if len(self.GM.current_graph.communities) + len(self.GM.current_graph.partitions) > 0:
             option.insert(0, "n-to load a specific n-subgraph for analysis")
+        if len(self.GM.current_graph.communities) > 0:
+            option.insert(1, "n.k-to load community k of the n-subgraph for analysis")
 
         while True:
             self.print(sentence=comm_string,
@@ -915,11 +931,27 @@ class StringManager:
             if command == "b":
                 return
 
-            elif command.isdigit() and len(self.GM.current_graph.subgraphs) > 0:
-                if len(self.GM.current_graph.subgraphs) >= int(command) > 0:
+            elif command.isdigit() and len(self.GM.current_graph.communities) > 0:
+                if len(self.GM.current_graph.communities) >= int(command) > 0:
+                    wrong_command = False
+                    main_graph = self.GM.current_graph
+                    self.GM.current_graph = main_graph.get_community_graph(int(command) - 1)
+                    if not self.GM.current_graph.analyzed:
+                        self.GM.analyze_graph(self, graph=self.GM.current_graph)
+                    self.graph_analysis()
+                    self.GM.current_graph = main_graph
+                else:
+                    wrong_command = True
+
+            elif command.count(".") == 1 and command.replace(".", "").isdigit():
+                level, community = (int(x) for x in command.split("."))
+                communities = self.GM.current_graph.communities
+                if len(communities) >= level > 0 and len(communities[level - 1]) >= community > 0:
                     wrong_command = False
                     main_graph = self.GM.current_graph
-                    self.GM.current_graph = main_graph.subgraphs[int(command) - 1]
+                    self.GM.current_graph = main_graph.get_induced_subgraph(communities[level - 1][community - 1],
+                                                                            name=f"{level}.{community}")
+                    self.GM.analyze_graph(self, graph=self.GM.current_graph)
                     self.graph_analysis()
                     self.GM.current_graph = main_graph
                 else:
@@ -1007,8 +1039,8 @@ class StringManager:
                 input("Enter for back")
 
             else:
-                if command in [node.name for node in self.GM.current_graph.nodes]:
-                    node = self.GM.current_graph.get_node_by_name(command)
+                node = self.GM.current_graph.get_node_by_name(command)
+                if node is not None:
                     self.node_ui(node)
 
                 else:
@@ -1046,11 +1078,11 @@ class StringManager:
                                wrong_command=wrong_command
                                )
                     command = input("Enter other node name or b for back: ")
+                    finish = self.GM.current_graph.get_node_by_name(command)
                     if command == "b":
                         wrong_command = False
                         break
-                    elif command in [n.name for n in self.GM.current_graph.nodes]:
-                        finish = self.GM.current_graph.get_node_by_name(command)
+                    elif finish is not None:
                         paths_strings = self.get_all_paths_of_node_string(node=node, finish=finish)
                         self.print(sentence=paths_strings)
                         input("Press Enter for back")
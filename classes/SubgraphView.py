@@ -0,0 +1,70 @@
+from typing import Iterable, List, Optional, Set, Tuple
+
+from classes.Adjacency import Adjacency
+from classes.Graph import Graph
+from classes.Node import Node
+
+
+class SubgraphView(Graph):
+    """
+    *** Subgraph View Class ***
+
+    Part of another graph: some of its nodes (or all of them), without some of its edges. Making one only takes
+    note of which nodes and edges, O(changed edges), nothing is copied. Community levels and induced subgraphs
+    come and go a lot more than they get looked at.
+
+    Once something looks at the nodes, the view gets Node shells of its own with the parent's names, the
+    analysis results go on those and the parent's nodes stay untouched. Its connections are cut out of the
+    parent's Adjacency arrays at the same time. From then on it is a Graph like any other, every analysis works
+    on it the same way.
+
+    Attributes:
+        - parent (Graph): graph it is a part of, analyzed or at least with its Adjacency built.
+        - kept (List[int]): parent indices of the nodes in the view, in the parent's order. None for all of them.
+        - removed (Set[Tuple[int, int]]): parent indices of the edges left out, the smaller one first.
+
+    Methods:
+        - get_adjacency: the parent's arrays without the nodes and edges left out.
+    """
+
+    def __init__(self, parent: Graph, name: str, kept: Optional[Iterable[Node]] = None,
+                 removed: Iterable[Tuple[Node, Node]] = ()):
+        super().__init__(name)
+        self._nodes = None
+        self.parent: Graph = parent
+        self.kept: Optional[List[int]] = None if kept is None else sorted(node.index for node in kept)
+        self.removed: Set[Tuple[int, int]] = {(min(a.index, b.index), max(a.index, b.index)) for a, b in removed}
+
+    @property
+    def nodes(self) -> List[Node]:
+        if self._nodes is None:  # First look, time to make the shells and cut out the connections
+            kept = range(len(self.parent.nodes)) if self.kept is None else self.kept
+            self._nodes = [Node(name=self.parent.nodes[i].name) for i in kept]
+            self.index_node_names()
+            self.set_adjacency(self.get_adjacency())
+        return self._nodes
+
+    @nodes.setter
+    def nodes(self, nodes: List[Node]):
+        self._nodes = nodes
+        self.index_node_names()
+
+    def build_adjacency(self):
+        # Connections of a view never change, they were cut out when the nodes were made
+        if self.adjacency is None:
+            self.set_adjacency(self.get_adjacency())
+
+    def get_adjacency(self) -> Adjacency:
+        parent = self.parent.adjacency
+        if self.kept is None:  # Same nodes, one pass over the rows skipping the edges left out
+            return Adjacency.from_neighbor_lists([
+                [j for j in parent.neighbors(i) if (min(i, j), max(i, j)) not in self.removed]
+                for i in range(parent.node_count)])
+
+        new_index = [-1] * parent.node_count
+        for new, old in enumerate(self.kept):
+            new_index[old] = new
+        return Adjacency.from_neighbor_lists([
+            [new_index[j] for j in parent.neighbors(i)
+             if new_index[j] >= 0 and (min(i, j), max(i, j)) not in self.removed]
+            for i in self.kept])
@@ -0,0 +1,40 @@
+from collections.abc import Mapping
+from typing import Iterator, Tuple
+
+from classes.Node import Node
+
+
+class UniformEdgeBetweeness(Mapping):
+    """
+    *** Uniform Edge Betweeness Class ***
+
+    Edge betweeness of a graph where every edge has the same, as in the graph families that look the same from
+    every edge. Reads like the dict of edges to their betweeness any other graph gets, (smaller index node,
+    bigger index node) in the order of the adjacency rows, but nothing is stored per edge: the edges are only
+    listed when someone goes through them and every one of them gets the same value.
+
+    Attributes:
+        - graph (Graph): whose edges these are.
+        - value (float): betweeness of every edge.
+    """
+
+    def __init__(self, graph, value: float):
+        self.graph = graph
+        self.value: float = value
+
+    def __getitem__(self, edge: Tuple[Node, Node]) -> float:
+        a, b = edge
+        if (a.graph is self.graph and b.graph is self.graph and a.index < b.index
+                and self.graph.adjacency.has_edge(a.index, b.index)):
+            return self.value
+        raise KeyError(edge)
+
+    def __iter__(self) -> Iterator[Tuple[Node, Node]]:
+        adjacency, nodes = self.graph.adjacency, self.graph.nodes
+        for i in range(adjacency.node_count):
+            for j in adjacency.neighbors(i):
+                if i < j:
+                    yield nodes[i], nodes[j]
+
+    def __len__(self) -> int:
+        return self.graph.adjacency.edge_count
@@ -0,0 +1,48 @@
+from array import array
+from typing import List
+
+
+class UnionFind:
+    """
+    *** Union Find Class ***
+
+    Disjoint sets of node indices, merged edge by edge to find the connected components of a graph.
+    With union by size and path halving every operation is close to constant time, so labelling all
+    components takes about O(n + m).
+
+    Attributes:
+        - parent (array[int]): parent of each node in its set's tree, roots are their own parents.
+        - size (array[int]): number of nodes in the set, valid for roots only.
+        - count (int): number of sets left.
+
+    Methods:
+        - find: root of the set the node is in.
+        - union: merges the sets of two nodes.
+        - labels: component id of every node, numbered in order of their first node.
+    """
+
+    def __init__(self, n: int):
+        self.parent: array = array("i", range(n))
+        self.size: array = array("i", [1]) * n
+        self.count: int = n
+
+    def find(self, i: int) -> int:
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]  # Path halving
+            i = parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        root_i, root_j = self.find(i), self.find(j)
+        if root_i == root_j:
+            return
+        if self.size[root_i] < self.size[root_j]:
+            root_i, root_j = root_j, root_i
+        self.parent[root_j] = root_i
+        self.size[root_i] += self.size[root_j]
+        self.count -= 1
+
+    def labels(self) -> List[int]:
+        ids = {}
+        return [ids.setdefault(self.find(i), len(ids)) for i in range(len(self.parent))]
@@ -0,0 +1,286 @@
+import time
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+from classes.Adjacency import Adjacency
+from classes.Brandes import Brandes
+from classes.BreadthFirstSearch import BreadthFirstSearch
+from classes.UnionFind import UnionFind
+
+
+class VertexOrbits:
+    """
+    *** Vertex Orbits Class ***
+
+    Nodes that the graph can't tell apart, the orbits of its automorphisms. A breadth first search from any node
+    of an orbit sees the same distances as from the others, so one search per orbit is enough.
+
+    Finding them:
+        0. Twins, nodes with the same neighbors (or the same neighbors once they count themselves), can simply
+           swap places. Lonely nodes, the leaves of a star, the sides of Kn,m, no search needed for those.
+        1. Color refinement (Weisfeiler-Lehman): start with one color, give every node a new color by its old one
+           and the colors of its neighbors, repeat until nothing splits. Nodes of different colors are in
+           different orbits, but same colors don't prove anything yet.
+        2. For every node that might be in the orbit of the first node of its color, look for an automorphism
+           that maps one onto the other: pin both down with a color of their own in two copies of the coloring,
+           refine both, pin down more pairs until every color has a single node and check that what came out
+           really keeps all the edges. Backtracks if it doesn't.
+        3. Every automorphism found merges the orbits of all the nodes it maps onto each other, union find keeps
+           track so nodes already known to be together don't need a search.
+
+    Only automorphisms that were checked are used, so the orbits are never too big, at worst too small when
+    the search runs out of time. Those of the group the found automorphisms make are exact, that is all the
+    betweeness folding needs.
+
+    Attributes:
+        - adjacency (Adjacency): connections of the graph.
+        - orbit_of (List[int]): orbit id of every node.
+        - orbits (List[List[int]]): node indices of every orbit, the first one searches for the rest.
+        - generators (List[array]): automorphisms found by searching, as permutations of the node indices.
+        - swaps (List[Tuple[int, int]]): automorphisms that only swap two twins.
+
+    Methods:
+        - find: finds the orbits.
+        - pays_off: if there are few enough orbits to bother.
+        - get_path_summaries: distance summaries of every node from one search per orbit.
+        - get_betweeness: Brandes sums of every node from one search per orbit.
+    """
+
+    max_rounds = 32  # Refinement rounds, more are rarely needed and never wrong to skip
+    time_budget = 2.0  # Seconds to look for automorphisms, nodes not done by then stay in orbits of their own
+    seconds_per_step = 1e-6  # Rough cost of a search step, don't look longer than half of what all searches take
+
+    def __init__(self, adjacency: Adjacency):
+        n = adjacency.node_count
+        self.adjacency: Adjacency = adjacency
+        self.orbit_of: List[int] = list(range(n))
+        self.orbits: List[List[int]] = [[i] for i in range(n)]
+        self.generators: List[array] = []
+        self.swaps: List[Tuple[int, int]] = []
+        self._deadline: Optional[float] = None
+
+    def pays_off(self) -> bool:
+        # Some bookkeeping per orbit on top of the searches, only worth it if it at least halves them
+        return 2 * len(self.orbits) <= self.adjacency.node_count
+
+    def find(self):
+        n = self.adjacency.node_count
+        searches = n * (n + len(self.adjacency.targets)) * self.seconds_per_step
+        self._deadline = time.perf_counter() + min(self.time_budget, max(searches / 2, 0.05))
+        colors = self._refine([0] * n, copies=1, give_up_above=n // 2)
+        if colors is None:  # Too many colors already, few orbits are out of the question
+            return
+
+        cells = {}
+        for i, color in enumerate(colors):
+            cells.setdefault(color, []).append(i)
+
+        union_find = UnionFind(n)
+        self._swap_twins(union_find)
+        for cell in cells.values():
+            for other in cell[1:]:
+                if time.perf_counter() > self._deadline:
+                    break
+                if union_find.find(cell[0]) == union_find.find(other):
+                    continue
+                automorphism = self._find_automorphism(colors, cell[0], other)
+                if automorphism is None:
+                    continue
+                self.generators.append(automorphism)
+                for i in range(n):
+                    union_find.union(i, automorphism[i])
+
+        self.orbit_of = union_find.labels()
+        self.orbits = [[] for _ in range(max(self.orbit_of, default=-1) + 1)]
+        for i, orbit in enumerate(self.orbit_of):
+            self.orbits[orbit].append(i)
+
+    def _swap_twins(self, union_find: UnionFind):
+        for closed in (False, True):
+            twins = {}
+            for i in range(self.adjacency.node_count):
+                neighbors = self.adjacency.neighbors(i)
+                key = tuple(sorted(neighbors.tolist() + [i])) if closed else tuple(neighbors)
+                twins.setdefault(key, []).append(i)
+            for group in twins.values():
+                for other in group[1:]:
+                    self.swaps.append((group[0], other))
+                    union_find.union(group[0], other)
+
+    def _refine(self, colors: List[int], copies: int, give_up_above: Optional[int] = None) -> Optional[List[int]]:
+        """
+        Color refinement of one or more copies of the graph at the same time, colors of all copies one after the
+        other. New colors are ranks of the (color, neighbor colors) signatures over all copies, so the same
+        signature gets the same color in every copy.
+
+        Returns:
+            - List[int]: the refined colors.
+            - None: if the copies end up with different numbers of nodes of some color, or with more colors than
+                    give_up_above.
+        """
+        n = self.adjacency.node_count
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+        color_count = len(set(colors))
+        for _ in range(self.max_rounds):
+            signatures = []
+            for copy in range(copies):
+                base = copy * n
+                for i in range(n):
+                    around = sorted(colors[base + targets[slot]] for slot in range(offsets[i], offsets[i + 1]))
+                    signatures.append((colors[base + i], tuple(around)))
+
+            ranks = {signature: rank for rank, signature in enumerate(sorted(set(signatures)))}
+            colors = [ranks[signature] for signature in signatures]
+            if give_up_above is not None and len(ranks) > give_up_above:
+                return None
+            if len(ranks) == color_count:
+                break
+            color_count = len(ranks)
+
+        if copies > 1:
+            first = sorted(colors[:n])
+            for copy in range(1, copies):
+                if sorted(colors[copy * n:(copy + 1) * n]) != first:
+                    return None
+        return colors
+
+    def _find_automorphism(self, colors: List[int], start: int, image: int) -> Optional[array]:
+        # Automorphism that maps start onto image, if one turns up
+        n = len(colors)
+        pinned = colors + colors
+        new_color = max(colors) + 1
+        pinned[start] = pinned[n + image] = new_color
+        return self._search(pinned)
+
+    def _search(self, colors: List[int]) -> Optional[array]:
+        """
+        Refine, then pin down the first node of the smallest color with more than one node against each node
+        of that color in the other copy, one after the other. A stack of those choices instead of recursion,
+        there can be as many levels as nodes.
+        """
+        n = self.adjacency.node_count
+        stack = [iter([colors])]
+        while stack:
+            if time.perf_counter() > self._deadline:
+                return None
+            pinned = next(stack[-1], None)
+            if pinned is None:
+                stack.pop()
+                continue
+            refined = self._refine(pinned, copies=2)
+            if refined is None:
+                continue
+
+            first, second = {}, {}
+            for i in range(n):
+                first.setdefault(refined[i], []).append(i)
+                second.setdefault(refined[n + i], []).append(i)
+
+            cell = min((color for color in first if len(first[color]) > 1), key=lambda color: len(first[color]),
+                       default=None)
+            if cell is None:  # Every node has a color of its own, that is the mapping
+                automorphism = array("i", [0]) * n
+                for color, nodes in first.items():
+                    automorphism[nodes[0]] = second[color][0]
+                if self._keeps_edges(automorphism):
+                    return automorphism
+                continue
+            stack.append(self._pin_each(refined, first[cell][0], second[cell]))
+        return None
+
+    def _pin_each(self, colors: List[int], node: int, candidates: List[int]) -> Iterator[List[int]]:
+        n = self.adjacency.node_count
+        new_color = max(colors) + 1
+        for candidate in candidates:
+            pinned = colors.copy()
+            pinned[node] = pinned[n + candidate] = new_color
+            yield pinned
+
+    def _keeps_edges(self, permutation: array) -> bool:
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+        for i in range(self.adjacency.node_count):
+            for slot in range(offsets[i], offsets[i + 1]):
+                if not self.adjacency.has_edge(permutation[i], permutation[targets[slot]]):
+                    return False
+        return True
+
+    def get_path_summaries(self, bfs: BreadthFirstSearch):
+        """
+        Returns:
+            - List of (source, distance sum, reachable nodes, eccentricity) tuples, the first node of every orbit
+              searched from and copied to the rest.
+        """
+        summaries = []
+        for orbit in self.orbits:
+            bfs.search(orbit[0])
+            total_distance = sum(bfs.distance[i] for i in bfs.order)
+            eccentricity = bfs.distance[bfs.order[-1]]
+            summaries.extend((i, total_distance, len(bfs.order), eccentricity) for i in orbit)
+        summaries.sort()
+        return summaries
+
+    def get_edge_orbits(self) -> List[int]:
+        """
+        Orbit id of every edge by its adjacency slot from the smaller to the bigger node index, edges the found
+        automorphisms map onto each other are together.
+        """
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+        union_find = UnionFind(len(targets))
+        for a, b in self.swaps:  # Only the edges of the twins move
+            for i, j in ((a, b), (b, a)):
+                for k in self.adjacency.neighbors(i):
+                    k_image = i if k == j else k  # Closed twins are neighbors, their edge stays put
+                    edge = self.adjacency.edge_slot(min(i, k), max(i, k))
+                    image = self.adjacency.edge_slot(min(j, k_image), max(j, k_image))
+                    union_find.union(edge, image)
+        for permutation in self.generators:
+            for i in range(self.adjacency.node_count):
+                for slot in range(offsets[i], offsets[i + 1]):
+                    j = targets[slot]
+                    if i < j:
+                        a, b = permutation[i], permutation[j]
+                        union_find.union(slot, self.adjacency.edge_slot(min(a, b), max(a, b)))
+        return union_find.labels()
+
+    def get_betweeness(self, bfs: BreadthFirstSearch) -> Brandes:
+        """
+        Brandes from the first node r of every orbit O only. For any node v with orbit O(v), the sources of O put
+        |O| / |O(v)| times the dependency of all of O(v) on r into it, the same goes for edges with edge orbits.
+        Summing over the automorphisms on both sides shows it.
+
+        Returns:
+            - Brandes: with the same sums as if it had been accumulated from every node.
+        """
+        n = self.adjacency.node_count
+        edge_orbit_of = self.get_edge_orbits()
+        edge_orbit_size = [0] * len(edge_orbit_of)
+        offsets, targets = self.adjacency.offsets, self.adjacency.targets
+        canonical_slots = [slot for i in range(n) for slot in range(offsets[i], offsets[i + 1]) if i < targets[slot]]
+        for slot in canonical_slots:
+            edge_orbit_size[edge_orbit_of[slot]] += 1
+
+        total = Brandes(self.adjacency)
+        for orbit in self.orbits:
+            bfs.search(orbit[0])
+            brandes = Brandes(self.adjacency)
+            brandes.accumulate(bfs)
+            total.pairs += len(orbit) * brandes.pairs
+            total.total_paths += len(orbit) * brandes.total_paths
+
+            node_sums = [0.0] * len(self.orbits)
+            bridge_sums = [0] * len(self.orbits)
+            for i in bfs.order:
+                node_sums[self.orbit_of[i]] += brandes.node_dependency[i]
+                bridge_sums[self.orbit_of[i]] += brandes.bridge_count[i]
+            for i in range(n):
+                other = self.orbit_of[i]
+                total.node_dependency[i] += len(orbit) * node_sums[other] / len(self.orbits[other])
+                total.bridge_count[i] += len(orbit) * bridge_sums[other] // len(self.orbits[other])
+
+            edge_sums = [0.0] * len(edge_orbit_of)
+            for slot in canonical_slots:
+                edge_sums[edge_orbit_of[slot]] += brandes.edge_dependency[slot]
+            for slot in canonical_slots:
+                other = edge_orbit_of[slot]
+                total.edge_dependency[slot] += len(orbit) * edge_sums[other] / edge_orbit_size[other]
+        return total
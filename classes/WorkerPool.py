@@ -0,0 +1,69 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+from classes.Adjacency import Adjacency
+
+# Adjacency of the worker processes. Forked workers inherit it from the main process as it is, without copying
+# or pickling anything, otherwise it is handed over once when a worker starts.
+_adjacency: Optional[Adjacency] = None
+
+
+def get_worker_adjacency() -> Adjacency:
+    # For the tasks running in a worker
+    return _adjacency
+
+
+def _start_worker(adjacency: Optional[Adjacency], setup: Optional[Callable[[], None]]):
+    global _adjacency
+    if adjacency is not None:
+        _adjacency = adjacency
+    if setup is not None:
+        setup()
+
+
+class WorkerPool:
+    """
+    *** Worker Pool Class ***
+
+    A pool of processes that all work on the same adjacency, for analysis that splits up into tasks which only
+    need a few indices sent over. Used as a context manager, gives the ProcessPoolExecutor to submit them to.
+
+    Where processes can be forked, the workers share the adjacency arrays of the main process, nothing is
+    pickled but the tasks. Elsewhere each worker gets its own copy once, when it starts. Either way tasks get it
+    from get_worker_adjacency.
+
+    Attributes:
+        - adjacency (Adjacency): connections of the graph.
+        - workers (int): number of processes.
+        - setup (Callable): run once in every worker after it has the adjacency, e.g. to make a search of its
+                            own. A module level function, so it can be pickled.
+    """
+
+    def __init__(self, adjacency: Adjacency, workers: int, setup: Optional[Callable[[], None]] = None):
+        self.adjacency: Adjacency = adjacency
+        self.workers: int = workers
+        self.setup: Optional[Callable[[], None]] = setup
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> ProcessPoolExecutor:
+        global _adjacency
+        if "fork" in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context("fork")
+            _adjacency = self.adjacency  # Inherited by the forked workers
+            initargs = (None, self.setup)
+        else:
+            context = multiprocessing.get_context()
+            initargs = (self.adjacency, self.setup)
+
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                         initializer=_start_worker, initargs=initargs)
+        return self._pool
+
+    def __exit__(self, *exception):
+        global _adjacency
+        try:
+            self._pool.shutdown(wait=True)
+        finally:
+            self._pool = None
+            _adjacency = None